@@ -12,8 +12,19 @@ SOLID Principles:
 - SRP: Each service handles one domain concern
 - DIP: Services depend on abstractions (interfaces)
 """
-from .ingest_service import IngestService
-from .chat_service import ChatService
-from .retrieval_service import RetrievalService
+from .ingest_service import IngestService, get_ingest_service
+from .chat_service import ChatService, get_chat_service
+from .retrieval_service import RetrievalService, get_retrieval_service
+from .response_cache import SemanticResponseCache, get_response_cache, save_response_cache
 
-__all__ = ["IngestService", "ChatService", "RetrievalService"]
+__all__ = [
+    "IngestService",
+    "get_ingest_service",
+    "ChatService",
+    "get_chat_service",
+    "RetrievalService",
+    "get_retrieval_service",
+    "SemanticResponseCache",
+    "get_response_cache",
+    "save_response_cache",
+]
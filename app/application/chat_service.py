@@ -3,7 +3,7 @@ Chat Service - Facade Pattern + Builder Pattern Implementation
 
 Design Patterns:
 - Facade: Provides a simplified interface to the RAG chat subsystem
-- Builder: Uses RAGPromptBuilder for flexible prompt construction
+- Builder: Uses RAGPromptBuilder (or its precomputed build_rag_messages fast path)
 
 Orchestrates: Tag Inference, Retrieval, Prompt Building, LLM Generation
 
@@ -12,12 +12,20 @@ SOLID Principles:
 - OCP: New prompt styles via different builders
 - DIP: Depends on abstractions (ILLMProvider, RetrievalService, PromptBuilder)
 """
-from typing import Dict, Any, Optional
+import asyncio
+import threading
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
 
 from app.domain.interfaces import ILLMProvider
-from app.domain.builders import RAGPromptBuilder, PromptBuilder
+from app.domain.builders import (
+    PromptBuilder,
+    ContextInput,
+    build_rag_messages,
+    provider_for_model,
+)
 from app.infrastructure.llm_providers import get_llm_provider
-from app.application.retrieval_service import RetrievalService
+from app.application.retrieval_service import RetrievalService, get_retrieval_service
+from app.application.response_cache import CacheKey, SemanticResponseCache, get_response_cache
 from app.services.tag_inference import infer_tag_from_text
 from app.core.logging import logger
 
@@ -28,31 +36,108 @@ class ChatService:
     
     Orchestrates the complete RAG pipeline:
     1. Infer tag from user message
-    2. Retrieve relevant context
+    2. Retrieve relevant context (in document order, so the same
+       retrieved set always produces a byte-identical prompt prefix)
     3. Build prompt using Builder Pattern
     4. Generate answer using LLM
     """
     
+    # Most messages accepted in one /chat/batch request body
+    MAX_BATCH_SIZE = 32
+    
+    # Messages of one batch in flight at once, bounding concurrent LLM calls
+    BATCH_CONCURRENCY = 8
+    
     def __init__(
         self,
         llm_provider: Optional[ILLMProvider] = None,
         retrieval_service: Optional[RetrievalService] = None,
-        prompt_builder: Optional[PromptBuilder] = None
+        prompt_builder: Optional[PromptBuilder] = None,
+        response_cache: Optional[SemanticResponseCache] = None
     ):
         """
         Initialize with dependencies (Dependency Injection).
         
         Args:
             llm_provider: LLM service (defaults to Singleton OpenRouter)
-            retrieval_service: Retrieval facade (defaults to new instance)
-            prompt_builder: Prompt builder (defaults to RAGPromptBuilder)
+            retrieval_service: Retrieval facade (defaults to the shared
+                instance, whose query embedding cache /retrieve also uses)
+            prompt_builder: Prompt builder (defaults to the precomputed
+                RAG prompt via build_rag_messages)
+            response_cache: Semantic answer cache for chat()/achat()
+                (defaults to the shared cache sized by RESPONSE_CACHE_SIZE;
+                0 disables it)
         """
         self._llm_provider = llm_provider or get_llm_provider()
-        self._retrieval_service = retrieval_service or RetrievalService()
-        self._prompt_builder = prompt_builder or RAGPromptBuilder()
+        self._retrieval_service = retrieval_service or get_retrieval_service()
+        self._prompt_builder = prompt_builder
+        self._response_cache = (
+            response_cache if response_cache is not None
+            else get_response_cache()
+        )
+        
+        # Message format matching the model, so provider prompt caching applies
+        self._prompt_format = provider_for_model(self._llm_provider.model_name)
         
         logger.debug("ChatService initialized with dependencies")
     
+    def _build_messages(
+        self,
+        context: ContextInput,
+        message: str,
+        label: str
+    ) -> List[Dict[str, str]]:
+        """
+        Build chat messages with the injected builder, or the stateless
+        default RAG prompt when none was injected.
+        """
+        if self._prompt_builder is None:
+            return build_rag_messages(context, message, label, self._prompt_format)
+        
+        self._prompt_builder.reset()
+        return (self._prompt_builder
+            .add_context(context, label)
+            .set_query(message)
+            .build_messages(self._prompt_format))
+    
+    def _lookup_cached(self, message: str, chunks: List[str]):
+        """
+        Look up a cached answer. Only an exact-index miss embeds the
+        question, through the retrieval service's query cache (already
+        warm for this message) instead of running the model a second time.
+        """
+        return self._response_cache.lookup(
+            message, chunks, embed=self._retrieval_service.embed_query
+        )
+    
+    def _retrieve_with_cache(
+        self,
+        message: str,
+        tag: Optional[str],
+        top_k: int
+    ) -> Tuple[List[str], Optional[str], Optional[CacheKey]]:
+        """
+        Retrieve context and probe the response cache in one call.
+        
+        achat() runs this as a single worker-thread hop, rather than one
+        hop for retrieval and another for the cache lookup.
+        
+        Returns:
+            (chunks, cached answer or None, cache key or None)
+        """
+        chunks = self._retrieval_service.get_context_chunks(
+            query="*" if "*" in message else message,
+            tag=tag,
+            top_k=top_k,
+            canonical=True
+        )
+        
+        if self._response_cache is None:
+            return chunks, None, None
+        
+        cached, cache_key = self._lookup_cached(message, chunks)
+        return chunks, cached, cache_key
+    
     def chat(
         self,
         message: str,
@@ -65,8 +150,9 @@ class ChatService:
         Facade method that orchestrates:
         1. Tag inference (if not provided)
         2. Context retrieval
-        3. Prompt building (Builder Pattern)
-        4. LLM answer generation
+        3. Response cache lookup (if enabled)
+        4. Prompt building (Builder Pattern)
+        5. LLM answer generation
         
         Args:
             message: User's question/message
@@ -89,32 +175,120 @@ class ChatService:
             query_for_retrieval = message
         
         # 3. Retrieve context using RetrievalService
-        context = self._retrieval_service.get_context(
+        chunks = self._retrieval_service.get_context_chunks(
             query=query_for_retrieval,
             tag=inferred_tag,
-            top_k=top_k
+            top_k=top_k,
+            canonical=True
         )
-        logger.debug(f"Retrieved context: {len(context)} chars")
+        logger.debug(f"Retrieved context: {len(chunks)} chunks")
         
-        # 4. Build prompt using Builder Pattern
-        self._prompt_builder.reset()
-        messages = (self._prompt_builder
-            .add_context(context, "Retrieved Documents")
-            .set_query(message)
-            .build_messages())
+        # 4. Reuse the answer to a similar question over the same context
+        cache_key = None
+        if self._response_cache is not None:
+            cached, cache_key = self._lookup_cached(message, chunks)
+            if cached is not None:
+                return {
+                    "message": message,
+                    "inferred_tag": inferred_tag,
+                    "answer": cached
+                }
+        
+        # 5. Build prompt using Builder Pattern
+        messages = self._build_messages(chunks, message, "Retrieved Documents")
         
         logger.debug(f"Built prompt with {len(messages)} messages")
         
-        # 5. Generate answer using LLM (Adapter Pattern)
+        # 6. Generate answer using LLM (Adapter Pattern)
         answer = self._llm_provider.chat(messages)
         logger.success(f"Generated response for: {message[:30]}...")
         
+        if cache_key is not None:
+            self._response_cache.store(cache_key, answer)
+        
+        return {
+            "message": message,
+            "inferred_tag": inferred_tag,
+            "answer": answer
+        }
+    
+    async def achat(
+        self,
+        message: str,
+        tag: Optional[str] = None,
+        top_k: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Async variant of chat().
+        
+        Retrieval and the response cache probe run in one worker thread
+        and the LLM call is awaited, so concurrent requests overlap their
+        network latency.
+        
+        Args:
+            message: User's question/message
+            tag: Optional explicit tag (otherwise inferred)
+            top_k: Number of context chunks to retrieve
+            
+        Returns:
+            Dict with message, tag, and answer
+        """
+        logger.info(f"Async chat request: {message[:50]}...")
+        
+        # A few substring checks on the message: run inline, not in a thread
+        inferred_tag = tag or infer_tag_from_text(message)
+        
+        chunks, cached, cache_key = await asyncio.to_thread(
+            self._retrieve_with_cache, message, inferred_tag, top_k
+        )
+        if cached is not None:
+            return {
+                "message": message,
+                "inferred_tag": inferred_tag,
+                "answer": cached
+            }
+        
+        messages = self._build_messages(chunks, message, "Retrieved Documents")
+        
+        answer = await self._llm_provider.achat(messages)
+        
+        if cache_key is not None:
+            self._response_cache.store(cache_key, answer)
+        
         return {
             "message": message,
             "inferred_tag": inferred_tag,
             "answer": answer
         }
     
+    async def achat_batch(
+        self,
+        messages: List[str],
+        tag: Optional[str] = None,
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Answer several messages concurrently, at most BATCH_CONCURRENCY
+        at a time.
+        
+        Args:
+            messages: User questions
+            tag: Optional explicit tag applied to every message
+            top_k: Number of context chunks per message
+            
+        Returns:
+            List of chat results in the same order as messages
+        """
+        logger.info(f"Batch chat request: {len(messages)} messages")
+        
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+        
+        async def answer(message: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.achat(message, tag=tag, top_k=top_k)
+        
+        return await asyncio.gather(*(answer(m) for m in messages))
+    
     def chat_with_builder(
         self,
         message: str,
@@ -142,18 +316,19 @@ class ChatService:
         inferred_tag = tag or infer_tag_from_text(message)
         
         # Retrieve context
-        context = self._retrieval_service.get_context(
+        chunks = self._retrieval_service.get_context_chunks(
             query=message if "*" not in message else "*",
             tag=inferred_tag,
-            top_k=top_k
+            top_k=top_k,
+            canonical=True
         )
         
         # Build prompt with custom builder
         builder.reset()
         messages = (builder
-            .add_context(context, "Context")
+            .add_context(chunks, "Context")
             .set_query(message)
-            .build_messages())
+            .build_messages(self._prompt_format))
         
         # Generate answer
         answer = self._llm_provider.chat(messages)
@@ -172,7 +347,7 @@ class ChatService:
         """
         Chat with explicitly provided context (no retrieval).
         
-        Uses Builder Pattern for prompt construction.
+        Uses the same Builder Pattern prompt construction as chat().
         
         Args:
             message: User's question
@@ -183,12 +358,108 @@ class ChatService:
         """
         logger.info(f"Chat with custom context: {message[:50]}...")
         
-        answer = self._llm_provider.generate_with_context(
-            context=context,
-            question=message
-        )
+        messages = self._build_messages(context, message, "Context")
+        
+        answer = self._llm_provider.chat(messages)
         
         return {
             "message": message,
             "answer": answer
         }
+    
+    def stream_chat(
+        self,
+        message: str,
+        tag: Optional[str] = None,
+        top_k: int = 5
+    ) -> Iterator[str]:
+        """
+        Process a chat message with RAG, streaming the answer.
+        
+        Retrieval and prompt building happen eagerly (so their errors
+        surface before streaming starts); the LLM answer is returned as
+        an iterator of text fragments.
+        
+        Args:
+            message: User's question/message
+            tag: Optional explicit tag (otherwise inferred)
+            top_k: Number of context chunks to retrieve
+            
+        Returns:
+            Iterator over answer fragments
+        """
+        logger.info(f"Streaming chat request: {message[:50]}...")
+        
+        inferred_tag = tag or infer_tag_from_text(message)
+        
+        chunks = self._retrieval_service.get_context_chunks(
+            query="*" if "*" in message else message,
+            tag=inferred_tag,
+            top_k=top_k,
+            canonical=True
+        )
+        
+        messages = self._build_messages(chunks, message, "Retrieved Documents")
+        
+        return self._llm_provider.stream_chat(messages)
+    
+    async def astream_chat(
+        self,
+        message: str,
+        tag: Optional[str] = None,
+        top_k: int = 5
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of stream_chat().
+        
+        Retrieval runs in a worker thread and is awaited here, so its
+        errors surface before streaming starts; the returned iterator
+        streams the answer over the provider's async client.
+        
+        Args:
+            message: User's question/message
+            tag: Optional explicit tag (otherwise inferred)
+            top_k: Number of context chunks to retrieve
+            
+        Returns:
+            Async iterator over answer fragments
+        """
+        logger.info(f"Async streaming chat request: {message[:50]}...")
+        
+        inferred_tag = tag or infer_tag_from_text(message)
+        
+        chunks = await self._retrieval_service.aget_context_chunks(
+            query="*" if "*" in message else message,
+            tag=inferred_tag,
+            top_k=top_k,
+            canonical=True
+        )
+        
+        messages = self._build_messages(chunks, message, "Retrieved Documents")
+        
+        return self._llm_provider.astream_chat(messages)
+
+
+# Module-level singleton accessor function
+_chat_service_instance: Optional[ChatService] = None
+_chat_service_lock = threading.Lock()
+
+
+def get_chat_service() -> ChatService:
+    """
+    Get the shared default ChatService (the /chat route dependency).
+    
+    Created on first use rather than at import, so importing the routes
+    does not load the embedding model or the LLM client.
+    
+    Returns:
+        The process-wide ChatService
+    """
+    global _chat_service_instance
+    
+    if _chat_service_instance is None:
+        with _chat_service_lock:
+            if _chat_service_instance is None:
+                _chat_service_instance = ChatService()
+    
+    return _chat_service_instance
@@ -10,16 +10,47 @@ SOLID Principles:
 - OCP: New loaders/chunkers can be added without modifying this service
 - DIP: Depends on abstractions (IDocumentLoader, IChunker, IEmbedder, IVectorStore)
 """
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Iterator, List, Dict, Any, Optional
+
+import numpy as np
 
 from app.domain.interfaces import IEmbedder, IVectorStore, IDocumentLoader, IChunker
-from app.infrastructure.embedders import get_embedder
+from app.infrastructure.embedders import get_cached_embedder
 from app.infrastructure.persistence import PostgresVectorStore
 from app.infrastructure.document_loaders import DocumentLoaderFactory
 from app.infrastructure.chunkers import FixedSizeChunker
 from app.core.logging import logger
 
 
+# Queue markers closing the stream of batches handed to the writer
+_END = object()
+_ABORT = object()
+
+
+def _drain(batches: "queue.Queue") -> Iterator[List[Dict]]:
+    """Yield queued record batches until _END; raise on _ABORT."""
+    while True:
+        item = batches.get()
+        if item is _END:
+            return
+        if item is _ABORT:
+            raise RuntimeError("Ingestion aborted before all batches were embedded")
+        yield item
+
+
+def _put(batches: "queue.Queue", item: Any, writer: Future) -> None:
+    """Hand an item to the writer, giving up if the writer has already stopped."""
+    while not writer.done():
+        try:
+            batches.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
 class IngestService:
     """
     Facade for document ingestion operations.
@@ -29,8 +60,15 @@ class IngestService:
     2. Chunk text (Strategy Pattern for chunking algorithm)
     3. Generate embeddings (Singleton Pattern for model)
     4. Store in vector database (Repository Pattern)
+    
+    Embedding and storage are pipelined: while one batch of chunks is
+    being embedded, the previous batch is written to the vector store.
+    All batches of a document are committed together.
     """
     
+    # Chunks embedded and stored per pipeline stage
+    PIPELINE_BATCH_SIZE = 256
+    
     def __init__(
         self,
         embedder: Optional[IEmbedder] = None,
@@ -41,11 +79,11 @@ class IngestService:
         Initialize with dependencies (Dependency Injection).
         
         Args:
-            embedder: Embedding service (defaults to Singleton MiniLM)
+            embedder: Embedding service (defaults to disk-cached Singleton MiniLM)
             vector_store: Vector storage (defaults to PostgresVectorStore)
             chunker: Chunking strategy (defaults to FixedSizeChunker)
         """
-        self._embedder = embedder or get_embedder()
+        self._embedder = embedder or get_cached_embedder()
         self._vector_store = vector_store or PostgresVectorStore()
         self._chunker = chunker or FixedSizeChunker(chunk_size=500, overlap=50)
         
@@ -87,48 +125,100 @@ class IngestService:
         # 1. Get appropriate loader from factory
         loader = DocumentLoaderFactory.get_loader(filename)
         
-        # 2. Extract pages (pass filename for better error messages)
-        pages = loader.load(file_bytes, filename=filename)
-        logger.info(f"Extracted {len(pages)} pages from document")
-        
-        # 3. Process pages: chunk + embed
-        records = []
-        total_chunks = 0
+        # 2-3. Stream pages (pass filename for better error messages) and
+        # chunk each as it arrives (Strategy Pattern), kept column-wise
+        texts: List[str] = []
+        page_numbers: List[int] = []
+        chunk_ids: List[int] = []
+        page_count = 0
         
-        for page in pages:
-            # Chunk the page text (Strategy Pattern)
-            chunks = self._chunker.chunk(
+        for page in loader.iter_pages(file_bytes, filename=filename):
+            page_count += 1
+            columns = self._chunker.chunk_arrays(
                 text=page["text"],
                 metadata={"page": page["page"]}
             )
+            # chunk_arrays() never returns blank chunks, so whole columns
+            # are appended without a per-chunk loop
+            texts.extend(columns["texts"])
+            chunk_ids.extend(columns["chunk_ids"])
+            page_numbers.extend([page["page"]] * len(columns["texts"]))
+        
+        logger.info(f"Extracted {page_count} pages from document")
+        
+        # Create the tag's partition up front, in its own short transaction
+        self._vector_store.prepare_tags([tag])
+        
+        # 4. Embed in batches, writing each batch while the next one embeds.
+        # The writer stores all batches in one transaction, so a failure
+        # part-way through leaves none of the document behind
+        batches: "queue.Queue" = queue.Queue(maxsize=1)
+        
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            stored = writer.submit(self._vector_store.add_batches, _drain(batches))
+            
+            try:
+                for start in range(0, len(texts), self.PIPELINE_BATCH_SIZE):
+                    # A failed writer has rolled back; its error is raised below
+                    if stored.done():
+                        break
+                    
+                    end = start + self.PIPELINE_BATCH_SIZE
+                    # One contiguous float32 matrix per batch; records hold row views
+                    embeddings = np.asarray(
+                        self._embedder.embed_texts(texts[start:end]),
+                        dtype=np.float32
+                    )
+                    records = self._build_records(
+                        texts[start:end],
+                        page_numbers[start:end],
+                        chunk_ids[start:end],
+                        embeddings,
+                        tag
+                    )
+                    
+                    # 5. Store in vector database (Repository Pattern)
+                    _put(batches, records, stored)
+            except BaseException:
+                # Make the writer roll back everything written so far
+                _put(batches, _ABORT, stored)
+                raise
             
-            # Embed each chunk
-            for chunk in chunks:
-                embedding = self._embedder.embed_text(chunk["text"])
-                
-                records.append({
-                    "text": chunk["text"],
-                    "embedding": embedding,
-                    "metadata": {
-                        "tag": tag,
-                        "page": chunk["page"],
-                        "chunk_id": chunk["chunk_id"]
-                    }
-                })
-                total_chunks += 1
+            _put(batches, _END, stored)
+            total_chunks = stored.result()
         
-        # 4. Store in vector database (Repository Pattern)
-        self._vector_store.add(records)
         logger.success(f"Stored {total_chunks} chunks for {filename}")
         
         return {
             "filename": filename,
             "tag": tag,
-            "pages": len(pages),
+            "pages": page_count,
             "chunks_stored": total_chunks,
             "status": "success"
         }
     
+    @staticmethod
+    def _build_records(
+        texts: List[str],
+        page_numbers: List[int],
+        chunk_ids: List[int],
+        embeddings: np.ndarray,
+        tag: Optional[str]
+    ) -> List[Dict]:
+        """Pair chunk columns with their embeddings in the vector store record format."""
+        return [
+            {
+                "text": text,
+                "embedding": embedding,
+                "metadata": {
+                    "tag": tag,
+                    "page": page,
+                    "chunk_id": chunk_id
+                }
+            }
+            for text, page, chunk_id, embedding in zip(texts, page_numbers, chunk_ids, embeddings)
+        ]
+    
     def delete_by_tag(self, tag: str) -> Dict[str, Any]:
         """
         Delete all documents with a specific tag.
@@ -148,3 +238,28 @@ class IngestService:
             "deleted_count": deleted_count,
             "status": "success"
         }
+
+
+# Module-level singleton accessor function
+_ingest_service_instance: Optional[IngestService] = None
+_ingest_service_lock = threading.Lock()
+
+
+def get_ingest_service() -> IngestService:
+    """
+    Get the shared default IngestService (the /ingest route dependency).
+    
+    Created on first use rather than at import, so importing the routes
+    does not load the embedding model or open a database connection.
+    
+    Returns:
+        The process-wide IngestService
+    """
+    global _ingest_service_instance
+    
+    if _ingest_service_instance is None:
+        with _ingest_service_lock:
+            if _ingest_service_instance is None:
+                _ingest_service_instance = IngestService()
+    
+    return _ingest_service_instance
@@ -0,0 +1,362 @@
+"""
+Semantic Response Cache - Cache-Aside Pattern Implementation
+
+Design Pattern: Cache-Aside
+- ChatService looks up an answer before calling the LLM and stores
+  the answer afterwards; the LLM provider itself is unaware of caching
+
+An entry matches when the retrieved context is identical (same content
+hash) AND the question embedding is within THRESHOLD cosine similarity
+of a cached question, so paraphrases over the same documents reuse the
+earlier answer instead of paying another LLM round trip.
+
+Entries are clusters: storing a question that already matches a cluster
+folds it into that cluster's centroid instead of adding a duplicate row,
+so repeated paraphrases do not grow the matrix scanned on every lookup.
+
+With a TTL, entries older than ttl seconds stop matching and are the
+first slots reused, so answers over since-updated documents age out.
+
+An exact-match index in front of the semantic search maps each stored
+(normalized question, context hash) pair to its cluster, so a verbatim
+repeat hits without embedding the question or scanning the matrix, and
+still hits after centroid merging has drifted away from it.
+
+SOLID Principles:
+- SRP: Only stores and matches answers
+- DIP: Depends on IEmbedder abstraction for question vectors
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.domain.interfaces import IEmbedder
+from app.domain.builders import ContextInput
+from app.infrastructure.embedders import get_embedder
+from app.core.logging import logger
+
+
+class CacheKey(NamedTuple):
+    """Question vector and hashes produced by lookup()."""
+    vector: np.ndarray
+    context_hash: str
+    # Normalized question digest for the exact-match index (empty skips it)
+    question_hash: bytes = b""
+
+
+class SemanticResponseCache:
+    """
+    In-memory LRU of LLM answers keyed by (question centroid, context hash).
+    
+    Centroids live in one preallocated (max_entries, dimension) matrix
+    and context hashes in a parallel string array, so a lookup is one
+    vectorized mask plus a single matrix-vector product.
+    """
+    
+    # Minimum cosine similarity between questions for a cache hit
+    THRESHOLD = 0.86
+    
+    def __init__(
+        self,
+        embedder: IEmbedder,
+        max_entries: int = 1024,
+        threshold: float = THRESHOLD,
+        ttl: Optional[float] = None
+    ):
+        """
+        Args:
+            embedder: Embedder producing normalized question vectors
+            max_entries: Capacity before least-recently-used eviction
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds an answer stays valid (None keeps it until evicted)
+        """
+        self._embedder = embedder
+        self._threshold = threshold
+        self._ttl = ttl
+        self._vectors = np.zeros((max_entries, embedder.dimension), dtype=np.float32)
+        self._counts = np.zeros(max_entries, dtype=np.int64)
+        # Hex BLAKE2b-128 digests; empty string marks an unused slot
+        self._context_hashes = np.zeros(max_entries, dtype="U32")
+        self._answers: List[Optional[str]] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._created = np.zeros(max_entries, dtype=np.float64)
+        # (question hash, context hash) -> slot, and each slot's keys so
+        # they can be dropped when the slot is reused
+        self._exact: Dict[Tuple[bytes, str], int] = {}
+        self._slot_exact: List[List[Tuple[bytes, str]]] = [[] for _ in range(max_entries)]
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def context_hash(context: ContextInput) -> str:
+        """Stable digest of the retrieved context (string or chunk list)."""
+        h = hashlib.blake2b(digest_size=16)
+        for chunk in [context] if isinstance(context, str) else context:
+            h.update(chunk.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+    
+    @staticmethod
+    def question_hash(question: str) -> bytes:
+        """Digest of the question with case and whitespace normalized."""
+        normalized = " ".join(question.lower().split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+    
+    def lookup(
+        self,
+        question: str,
+        context: ContextInput,
+        embed: Optional[Callable[[str], np.ndarray]] = None
+    ) -> Tuple[Optional[str], CacheKey]:
+        """
+        Find a cached answer for a similar question over the same context.
+        
+        A question seen before over the same context is answered from the
+        exact-match index; only other questions are embedded and compared.
+        
+        Args:
+            question: User question
+            context: Retrieved context the answer would be based on
+            embed: Function embedding the question, called only on an
+                exact-index miss (defaults to the cache's embedder)
+        
+        Returns:
+            (answer or None, key to pass to store() on a miss)
+        """
+        question_hash = self.question_hash(question)
+        context_hash = self.context_hash(context)
+        
+        with self._lock:
+            slot = self._exact.get((question_hash, context_hash))
+            if slot is not None and not self._expired()[slot]:
+                self._touch(slot)
+                logger.debug("Response cache exact hit")
+                return self._answers[slot], CacheKey(
+                    self._vectors[slot].copy(), context_hash, question_hash
+                )
+        
+        vector = (embed or self._embedder.embed_text)(question)
+        
+        key = CacheKey(
+            np.asarray(vector, dtype=np.float32),
+            context_hash,
+            question_hash,
+        )
+        
+        with self._lock:
+            slot, similarity = self._nearest(key)
+            if slot is None or similarity < self._threshold:
+                return None, key
+            
+            self._touch(slot)
+            logger.debug(f"Response cache hit (similarity {similarity:.3f})")
+            return self._answers[slot], key
+    
+    def store(self, key: CacheKey, answer: str) -> None:
+        """
+        Cache an answer.
+        
+        A question matching an existing cluster (e.g. two concurrent
+        misses for the same paraphrase) moves that cluster's centroid
+        toward it and keeps the cluster's answer; otherwise a new cluster
+        is opened, reusing an expired slot or else evicting the least
+        recently used one when full.
+        
+        Args:
+            key: Key returned by lookup()
+            answer: LLM answer to cache
+        """
+        with self._lock:
+            slot, similarity = self._nearest(key)
+            if slot is not None and similarity >= self._threshold:
+                n = self._counts[slot]
+                centroid = (self._vectors[slot] * n + key.vector) / (n + 1)
+                self._vectors[slot] = centroid / np.linalg.norm(centroid)
+                self._counts[slot] = n + 1
+                self._index_exact(key, slot)
+                self._touch(slot)
+                return
+            
+            if self._size < len(self._answers):
+                slot = self._size
+                self._size += 1
+            else:
+                expired = np.flatnonzero(self._expired())
+                slot = int(expired[0]) if len(expired) else int(np.argmin(self._last_used))
+            
+            self._created[slot] = time.time()
+            self._vectors[slot] = key.vector
+            self._counts[slot] = 1
+            self._context_hashes[slot] = key.context_hash
+            self._answers[slot] = answer
+            for exact_key in self._slot_exact[slot]:
+                del self._exact[exact_key]
+            self._slot_exact[slot] = []
+            self._index_exact(key, slot)
+            self._touch(slot)
+    
+    def save(self, path: str) -> None:
+        """
+        Persist the cache to a single .npz file.
+        
+        Args:
+            path: Destination file path
+        """
+        with self._lock:
+            n = self._size
+            answers = self._answers[:n]
+            arrays = {
+                "vectors": self._vectors[:n].copy(),
+                "counts": self._counts[:n].copy(),
+                "last_used": self._last_used[:n].copy(),
+                "created": self._created[:n].copy(),
+                "context_hashes": self._context_hashes[:n].copy(),
+            }
+        
+        # Answers as one UTF-8 buffer plus offsets: a fixed-width string
+        # array would pad every answer to the longest at 4 bytes per char
+        encoded = [answer.encode("utf-8") for answer in answers]
+        arrays["answer_bytes"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        arrays["answer_offsets"] = np.cumsum([0] + [len(e) for e in encoded], dtype=np.int64)
+        
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {n} cached responses to {path}")
+    
+    def load(self, path: str) -> None:
+        """
+        Replace the cache contents with those saved at path.
+        
+        If the file holds more entries than max_entries, the most
+        recently used ones are kept.
+        
+        Args:
+            path: File written by save()
+        """
+        with np.load(path, allow_pickle=False) as data:
+            order = np.argsort(data["last_used"])[-len(self._answers):]
+            vectors = data["vectors"][order]
+            counts = data["counts"][order]
+            # Files saved before TTL support have no timestamps
+            created = data["created"][order] if "created" in data.files else np.full(len(order), time.time())
+            context_hashes = data["context_hashes"][order]
+            if "answer_bytes" in data.files:
+                buffer = data["answer_bytes"].tobytes()
+                offsets = data["answer_offsets"]
+                answers = [
+                    buffer[offsets[i]:offsets[i + 1]].decode("utf-8") for i in order
+                ]
+            else:
+                # Files saved before the byte-buffer format
+                answers = data["answers"][order].tolist()
+        
+        with self._lock:
+            n = len(answers)
+            self._vectors[:n] = vectors
+            self._counts[:n] = counts
+            self._created[:n] = created
+            self._context_hashes[:n] = context_hashes
+            self._answers[:n] = answers
+            # The exact-match index is not saved; it refills as questions repeat
+            self._exact.clear()
+            self._slot_exact = [[] for _ in self._answers]
+            self._last_used[:n] = np.arange(1, n + 1)
+            self._size = n
+            self._clock = n
+        logger.info(f"Loaded {n} cached responses from {path}")
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _nearest(self, key: CacheKey) -> Tuple[Optional[int], float]:
+        """Most similar live cluster with the same context hash (lock held)."""
+        live = (self._context_hashes[:self._size] == key.context_hash) & ~self._expired()
+        same_context = np.flatnonzero(live)
+        if not len(same_context):
+            return None, -1.0
+        
+        sims = self._vectors[same_context] @ key.vector
+        best = int(np.argmax(sims))
+        return int(same_context[best]), float(sims[best])
+    
+    def _expired(self) -> np.ndarray:
+        """Boolean mask over the filled slots marking entries past their TTL."""
+        if self._ttl is None:
+            return np.zeros(self._size, dtype=bool)
+        return self._created[:self._size] < time.time() - self._ttl
+    
+    def _index_exact(self, key: CacheKey, slot: int) -> None:
+        """Point the key's exact (question, context) pair at slot (lock held)."""
+        if not key.question_hash:
+            return
+        exact_key = (key.question_hash, key.context_hash)
+        previous = self._exact.get(exact_key)
+        if previous == slot:
+            return
+        if previous is not None:
+            self._slot_exact[previous].remove(exact_key)
+        self._exact[exact_key] = slot
+        self._slot_exact[slot].append(exact_key)
+    
+    def _touch(self, slot: int) -> None:
+        """Mark a slot as most recently used."""
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+
+# Module-level singleton accessor function
+_response_cache_instance: Optional[SemanticResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[SemanticResponseCache]:
+    """
+    Get the singleton response cache configured from the environment.
+    
+    RESPONSE_CACHE_SIZE sets the capacity (0 disables the cache),
+    RESPONSE_CACHE_THRESHOLD the hit similarity, RESPONSE_CACHE_TTL the
+    answer lifetime in seconds (unset or 0 never expires), and
+    RESPONSE_CACHE_PATH, if set, is loaded on first use and written by
+    save_response_cache() on shutdown.
+    
+    Returns:
+        The shared cache, or None when disabled
+    """
+    global _response_cache_instance
+    
+    if int(os.getenv("RESPONSE_CACHE_SIZE", "0")) <= 0:
+        return None
+    
+    if _response_cache_instance is None:
+        with _response_cache_lock:
+            if _response_cache_instance is None:
+                ttl = float(os.getenv("RESPONSE_CACHE_TTL") or 0)
+                cache = SemanticResponseCache(
+                    get_embedder(),
+                    max_entries=int(os.getenv("RESPONSE_CACHE_SIZE")),
+                    threshold=float(
+                        os.getenv("RESPONSE_CACHE_THRESHOLD") or SemanticResponseCache.THRESHOLD
+                    ),
+                    ttl=ttl or None,
+                )
+                path = os.getenv("RESPONSE_CACHE_PATH")
+                if path and os.path.exists(path):
+                    cache.load(path)
+                _response_cache_instance = cache
+    
+    return _response_cache_instance
+
+
+def save_response_cache() -> None:
+    """Persist the shared cache to RESPONSE_CACHE_PATH, if both exist."""
+    path = os.getenv("RESPONSE_CACHE_PATH")
+    if path and _response_cache_instance is not None:
+        _response_cache_instance.save(path)
@@ -9,12 +9,19 @@ SOLID Principles:
 - SRP: Only handles document retrieval
 - DIP: Depends on abstractions (IEmbedder, IVectorStore)
 """
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
 from app.domain.interfaces import IEmbedder, IVectorStore
-from app.infrastructure.embedders import get_embedder
+from app.infrastructure.embedders import get_batching_embedder
 from app.infrastructure.persistence import PostgresVectorStore
 from app.core.logging import logger
+from app.core.exceptions import EmptyQueryError
 
 
 class RetrievalService:
@@ -22,10 +29,13 @@ class RetrievalService:
     Facade for document retrieval operations.
     
     Orchestrates:
-    1. Query embedding generation
+    1. Query embedding generation (with in-process LRU cache)
     2. Vector similarity search
     """
     
+    # Maximum number of query embeddings kept in the LRU cache
+    QUERY_CACHE_SIZE = 1024
+    
     def __init__(
         self,
         embedder: Optional[IEmbedder] = None,
@@ -35,14 +45,64 @@ class RetrievalService:
         Initialize with dependencies (Dependency Injection).
         
         Args:
-            embedder: Embedding service (defaults to Singleton MiniLM)
+            embedder: Embedding service (defaults to Singleton MiniLM behind
+                the micro-batching queue, so concurrent queries share passes)
             vector_store: Vector storage (defaults to PostgresVectorStore)
         """
-        self._embedder = embedder or get_embedder()
+        self._embedder = embedder or get_batching_embedder()
         self._vector_store = vector_store or PostgresVectorStore()
         
+        # Query embedding cache: BLAKE2b-128 of normalized query -> embedding
+        self._query_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        
         logger.debug("RetrievalService initialized with dependencies")
     
+    @staticmethod
+    def _query_key(query: str) -> bytes:
+        """
+        Cache key for a query: case and whitespace are normalized (MiniLM
+        is uncased) and the result hashed, so long queries don't pin
+        their full text in memory.
+        """
+        normalized = " ".join(query.lower().split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a query, reusing cached embeddings for repeated queries.
+        
+        Public so other stages of a request (e.g. the chat response
+        cache) reuse the vector retrieval already computed.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Embedding vector for the query
+        """
+        key = self._query_key(query)
+        
+        with self._query_cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                logger.debug("Query embedding cache hit")
+                return cached
+        
+        embedding = self._embedder.embed_text(query)
+        # Shared with every later caller of this query: make accidental
+        # in-place edits fail instead of corrupting the cache
+        embedding.flags.writeable = False
+        
+        with self._query_cache_lock:
+            self._query_cache[key] = embedding
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        
+        return embedding
+    
     def retrieve(
         self,
         query: str,
@@ -63,27 +123,51 @@ class RetrievalService:
             
         Returns:
             Dict with query and results
+            
+        Raises:
+            EmptyQueryError: If the query is empty or whitespace-only
         """
         logger.info(f"Retrieving for query: {query[:50]}..., tag: {tag}")
         
+        results = self._search(query, tag, top_k)
+        
+        return {
+            "query": query,
+            "tag": tag,
+            "results": results,
+            "result_count": len(results)
+        }
+    
+    def _search(
+        self,
+        query: str,
+        tag: Optional[str],
+        top_k: int
+    ) -> List[Dict]:
+        """
+        Run a wildcard or semantic search and return the raw result rows.
+        
+        Shared by retrieve() and get_context() so neither builds more
+        than it needs. Blank queries are rejected here, before they can
+        reach the embedder.
+        """
+        stripped = query.strip() if query else ""
+        if not stripped:
+            logger.warning("Rejected empty query")
+            raise EmptyQueryError()
+        
         # Handle wildcard query
-        if query.strip() == "*":
+        if stripped == "*":
             results = self._vector_store.search(
                 query_embedding=None,
                 tag=tag,
                 top_k=top_k
             )
             logger.info(f"Wildcard search returned {len(results)} results")
-            
-            return {
-                "query": query,
-                "tag": tag,
-                "results": results,
-                "result_count": len(results)
-            }
+            return results
         
         # Semantic search
-        query_embedding = self._embedder.embed_text(query)
+        query_embedding = self.embed_query(query)
         
         results = self._vector_store.search(
             query_embedding=query_embedding,
@@ -91,13 +175,67 @@ class RetrievalService:
             top_k=top_k
         )
         logger.info(f"Semantic search returned {len(results)} results")
+        return results
+    
+    @staticmethod
+    def _document_order(row: Dict) -> tuple:
+        """
+        Sort key placing chunks in document order (tag, page, chunk id).
         
-        return {
-            "query": query,
-            "tag": tag,
-            "results": results,
-            "result_count": len(results)
-        }
+        Chunk ids come back from the database as strings, so they are
+        compared by length first to keep numeric order ("2" < "10").
+        """
+        chunk_id = str(row.get("chunk_id"))
+        return (row.get("tag") or "", row.get("page") or 0, len(chunk_id), chunk_id, row["content"])
+    
+    def get_context_chunks(
+        self,
+        query: str,
+        tag: Optional[str] = None,
+        top_k: int = 5,
+        canonical: bool = False
+    ) -> List[str]:
+        """
+        Get the retrieved context as individual chunks for RAG.
+        
+        Lets the prompt builder join the chunks straight into the prompt
+        instead of joining them here and copying the result again.
+        
+        Args:
+            query: Search query
+            tag: Optional tag filter
+            top_k: Maximum chunks to include
+            canonical: Return chunks in document order rather than by
+                relevance, so the same retrieved set always yields the
+                same prompt bytes (provider prefix caches, response cache)
+            
+        Returns:
+            List of chunk texts (a single placeholder if nothing matched)
+        """
+        results = self._search(query, tag, top_k)
+        
+        if not results:
+            return ["No relevant context found."]
+        
+        if canonical:
+            results = sorted(results, key=self._document_order)
+        
+        return [r["content"] for r in results]
+    
+    async def aget_context_chunks(
+        self,
+        query: str,
+        tag: Optional[str] = None,
+        top_k: int = 5,
+        canonical: bool = False
+    ) -> List[str]:
+        """
+        Async variant of get_context_chunks.
+        
+        Runs the blocking embedding + database search in a worker thread
+        so the event loop stays free for other requests.
+        """
+        return await asyncio.to_thread(self.get_context_chunks, query, tag, top_k, canonical)
     
     def get_context(
         self,
@@ -108,8 +246,6 @@ class RetrievalService:
         """
         Get concatenated context for RAG.
         
-        Convenience method for chat service.
-        
         Args:
             query: Search query
             tag: Optional tag filter
@@ -118,9 +254,38 @@ class RetrievalService:
         Returns:
             Concatenated context string
         """
-        result = self.retrieve(query, tag, top_k)
-        
-        if not result["results"]:
-            return "No relevant context found."
-        
-        return "\n\n".join([r["content"] for r in result["results"]])
+        return "\n\n".join(self.get_context_chunks(query, tag, top_k))
+    
+    async def aget_context(
+        self,
+        query: str,
+        tag: Optional[str] = None,
+        top_k: int = 5
+    ) -> str:
+        """Async variant of get_context."""
+        return await asyncio.to_thread(self.get_context, query, tag, top_k)
+
+
+# Module-level singleton accessor function
+_retrieval_service_instance: Optional[RetrievalService] = None
+_retrieval_service_lock = threading.Lock()
+
+
+def get_retrieval_service() -> RetrievalService:
+    """
+    Get the shared default RetrievalService.
+    
+    /chat and /retrieve both use it, so a question embedded by one is a
+    query-cache hit for the other instead of a second forward pass.
+    
+    Returns:
+        The process-wide RetrievalService
+    """
+    global _retrieval_service_instance
+    
+    if _retrieval_service_instance is None:
+        with _retrieval_service_lock:
+            if _retrieval_service_instance is None:
+                _retrieval_service_instance = RetrievalService()
+    
+    return _retrieval_service_instance
@@ -0,0 +1,19 @@
+"""
+JSON response class backed by orjson
+
+FastAPI's JSONResponse renders with the stdlib json encoder; orjson is
+a compiled encoder several times faster on the multi-KB answer strings
+the chat routes return. Set as the app's default_response_class, so
+every route that returns a dict inherits it.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson (numpy scalars/arrays included)."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
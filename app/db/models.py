@@ -1,9 +1,17 @@
 import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
 
 def get_connection():
     return psycopg2.connect(
@@ -13,3 +21,56 @@ def get_connection():
         user=os.getenv("DB_USER"),
         password=os.getenv("DB_PASSWORD"),
     )
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    minconn=int(os.getenv("DB_POOL_MIN", "2")),
+                    maxconn=int(os.getenv("DB_POOL_MAX", "16")),
+                    host=os.getenv("DB_HOST"),
+                    port=os.getenv("DB_PORT"),
+                    database=os.getenv("DB_NAME"),
+                    user=os.getenv("DB_USER"),
+                    password=os.getenv("DB_PASSWORD"),
+                )
+
+    return _pool
+
+
+def close_pool() -> None:
+    """Close every pooled connection (called on application shutdown)."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def acquire_connection():
+    """Check a connection out of the pool."""
+    return get_pool().getconn()
+
+
+def release_connection(conn) -> None:
+    """Return a connection to the pool, discarding it if it is broken."""
+    if not conn.closed:
+        # End any transaction left open (e.g. by a SELECT) before reuse
+        conn.rollback()
+    get_pool().putconn(conn, close=bool(conn.closed))
+
+
+@contextmanager
+def get_conn() -> Iterator:
+    """Context manager that checks out a pooled connection and returns it."""
+    conn = acquire_connection()
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
@@ -9,6 +9,24 @@ Design Pattern: Builder
 - Allows step-by-step prompt building
 - Supports multiple prompt formats/styles
 """
-from .prompt_builder import PromptBuilder, RAGPromptBuilder
+from .prompt_builder import (
+    PromptBuilder,
+    RAGPromptBuilder,
+    SummarizationPromptBuilder,
+    ContextInput,
+    PROVIDER_OPENAI,
+    PROVIDER_ANTHROPIC,
+    build_rag_messages,
+    provider_for_model,
+)
 
-__all__ = ["PromptBuilder", "RAGPromptBuilder"]
+__all__ = [
+    "PromptBuilder",
+    "RAGPromptBuilder",
+    "SummarizationPromptBuilder",
+    "ContextInput",
+    "PROVIDER_OPENAI",
+    "PROVIDER_ANTHROPIC",
+    "build_rag_messages",
+    "provider_for_model",
+]
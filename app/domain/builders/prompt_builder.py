@@ -12,17 +12,123 @@ SOLID Principles:
 - DIP: ChatService depends on builder abstraction
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Any, List, Dict, Iterable, Optional, Union
 from dataclasses import dataclass, field
 
 
-@dataclass
+# Context may be passed pre-joined or as retrieved chunks
+ContextInput = Union[str, Iterable[str]]
+
+# Separator placed between retrieved chunks
+CHUNK_SEPARATOR = "\n\n"
+
+# Message formats accepted by build_messages
+PROVIDER_OPENAI = "openai"        # plain string content; prefix caching is automatic
+PROVIDER_ANTHROPIC = "anthropic"  # content blocks with explicit cache breakpoints
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+# Fixed user-prompt fragments around the query, shared by RAGPromptBuilder
+# and build_rag_messages so the two cannot drift apart; the *_SECTION
+# forms include the blank line that separates prompt sections
+_QUESTION_HEADER = "\nQuestion:\n"
+_ANSWER_CUE = "\nAnswer:"
+_QUESTION_SECTION = "\n\n" + _QUESTION_HEADER
+_ANSWER_SECTION = "\n\n" + _ANSWER_CUE
+
+
+def provider_for_model(model: str) -> str:
+    """Pick the message format for an (OpenRouter-style) model identifier."""
+    if model.startswith("anthropic/") or model.startswith("claude"):
+        return PROVIDER_ANTHROPIC
+    return PROVIDER_OPENAI
+
+
+def _system_message(system_prompt: str, provider: str) -> Dict[str, Any]:
+    """System message; cached as a whole since it holds only static rules."""
+    if provider == PROVIDER_ANTHROPIC:
+        return {
+            "role": "system",
+            "content": [{"type": "text", "text": system_prompt, "cache_control": _CACHE_CONTROL}],
+        }
+    return {"role": "system", "content": system_prompt}
+
+
+def _user_message(parts: List[str], context_count: int, provider: str) -> Dict[str, Any]:
+    """
+    User message from prompt parts whose first context_count entries are
+    context sections.
+    
+    For Anthropic, each context section becomes its own content block with
+    a cache breakpoint after the last one; the query tail stays uncached.
+    The concatenated text is identical to the plain string form.
+    """
+    if provider != PROVIDER_ANTHROPIC:
+        return {"role": "user", "content": "\n\n".join(parts)}
+    
+    head, tail = parts[:context_count], parts[context_count:]
+    texts = head + (["\n\n".join(tail)] if tail else [])
+    blocks = [
+        {"type": "text", "text": text + "\n\n" if i < len(texts) - 1 else text}
+        for i, text in enumerate(texts)
+    ]
+    if head:
+        blocks[len(head) - 1]["cache_control"] = _CACHE_CONTROL
+    return {"role": "user", "content": blocks}
+
+
+@lru_cache(maxsize=32)
+def _render_system_prompt(
+    heading: str,
+    instructions: tuple,
+    constraints: tuple,
+    output_format: Optional[str]
+) -> str:
+    """
+    Render a system prompt; cached because builders are reset and
+    rebuilt with the same (class-constant) rules on every request.
+    """
+    parts = []
+    
+    # Add system instructions
+    if instructions:
+        rules = "\n".join(f"- {inst}" for inst in instructions)
+        parts.append(f"{heading}\n{rules}")
+    
+    # Add constraints
+    if constraints:
+        rendered = "\n".join(f"- {c}" for c in constraints)
+        parts.append(f"\nConstraints:\n{rendered}")
+    
+    # Add output format
+    if output_format:
+        parts.append(f"\nOutput Format: {output_format}")
+    
+    return "\n".join(parts)
+
+
+def _join_context(context: ContextInput) -> str:
+    """Join context chunks once; plain strings pass through unchanged."""
+    if isinstance(context, str):
+        return context
+    return CHUNK_SEPARATOR.join(context)
+
+
+@dataclass(slots=True)
 class PromptComponents:
-    """Data class holding all prompt components."""
+    """
+    Data class holding all prompt components.
+    
+    Context sections and examples are stored as parallel lists rather
+    than lists of dicts, so adding one allocates no per-item dict.
+    """
     system_instructions: List[str] = field(default_factory=list)
-    context_sections: List[Dict[str, str]] = field(default_factory=list)
+    context_labels: List[str] = field(default_factory=list)
+    context_contents: List[str] = field(default_factory=list)
     user_query: str = ""
-    examples: List[Dict[str, str]] = field(default_factory=list)
+    example_questions: List[str] = field(default_factory=list)
+    example_answers: List[str] = field(default_factory=list)
     constraints: List[str] = field(default_factory=list)
     output_format: Optional[str] = None
 
@@ -37,20 +143,26 @@ class PromptBuilder(ABC):
     
     def __init__(self):
         self._components = PromptComponents()
+        self._apply_defaults()
     
     def reset(self) -> "PromptBuilder":
-        """Reset builder to initial state."""
+        """Reset builder to initial state (including its default rules)."""
         self._components = PromptComponents()
+        self._apply_defaults()
         return self
     
+    def _apply_defaults(self) -> None:
+        """Populate default instructions/constraints; none by default."""
+        pass
+    
     @abstractmethod
     def add_system_instruction(self, instruction: str) -> "PromptBuilder":
         """Add a system instruction."""
         pass
     
     @abstractmethod
-    def add_context(self, context: str, label: str = "Context") -> "PromptBuilder":
-        """Add context information."""
+    def add_context(self, context: ContextInput, label: str = "Context") -> "PromptBuilder":
+        """Add context information (a string or an iterable of chunks)."""
         pass
     
     @abstractmethod
@@ -84,8 +196,8 @@ class PromptBuilder(ABC):
         pass
     
     @abstractmethod
-    def build_messages(self) -> List[Dict[str, str]]:
-        """Build complete message list for chat API."""
+    def build_messages(self, provider: str = PROVIDER_OPENAI) -> List[Dict[str, Any]]:
+        """Build complete message list for chat API in the provider's format."""
         pass
 
 
@@ -130,29 +242,43 @@ class RAGPromptBuilder(PromptBuilder):
         Args:
             use_defaults: Whether to include default RAG instructions
         """
+        self._use_defaults = use_defaults
         super().__init__()
-        
-        if use_defaults:
+    
+    def _apply_defaults(self) -> None:
+        """
+        Default rules always come first; caller-added instructions and
+        constraints are appended after them, so the system prompt bytes
+        are identical across requests (and survive reset()).
+        """
+        if self._use_defaults:
             self._components.system_instructions = self.DEFAULT_INSTRUCTIONS.copy()
             self._components.constraints = self.DEFAULT_CONSTRAINTS.copy()
+        
+        # True while the system rules are exactly the defaults, letting
+        # build_messages reuse the precomputed default system message
+        self._default_rules = self._use_defaults
     
     def add_system_instruction(self, instruction: str) -> "RAGPromptBuilder":
         """Add a system instruction."""
         self._components.system_instructions.append(instruction)
+        self._default_rules = False
         return self
     
-    def add_context(self, context: str, label: str = "Context") -> "RAGPromptBuilder":
+    def add_context(
+        self,
+        context: ContextInput,
+        label: str = "Context"
+    ) -> "RAGPromptBuilder":
         """
         Add context information from retrieved documents.
         
         Args:
-            context: The retrieved text content
+            context: The retrieved text content, or the retrieved chunks
             label: Label for this context section (e.g., "Document", "Reference")
         """
-        self._components.context_sections.append({
-            "label": label,
-            "content": context
-        })
+        self._components.context_labels.append(label)
+        self._components.context_contents.append(_join_context(context))
         return self
     
     def set_query(self, query: str) -> "RAGPromptBuilder":
@@ -168,15 +294,14 @@ class RAGPromptBuilder(PromptBuilder):
             question: Example question
             answer: Example answer
         """
-        self._components.examples.append({
-            "question": question,
-            "answer": answer
-        })
+        self._components.example_questions.append(question)
+        self._components.example_answers.append(answer)
         return self
     
     def add_constraint(self, constraint: str) -> "RAGPromptBuilder":
         """Add an output constraint."""
         self._components.constraints.append(constraint)
+        self._default_rules = False
         return self
     
     def set_output_format(self, format_desc: str) -> "RAGPromptBuilder":
@@ -187,32 +312,25 @@ class RAGPromptBuilder(PromptBuilder):
             format_desc: Description of expected format (e.g., "JSON", "bullet points")
         """
         self._components.output_format = format_desc
+        self._default_rules = False
         return self
     
     def build_system_prompt(self) -> str:
         """
         Build the system prompt from components.
         
+        Rendering is memoized per distinct set of rules, so repeated
+        builds with the default rules reuse the same string.
+        
         Returns:
             Formatted system prompt string
         """
-        parts = []
-        
-        # Add system instructions
-        if self._components.system_instructions:
-            instructions = "\n".join(f"- {inst}" for inst in self._components.system_instructions)
-            parts.append(f"Rules you MUST follow:\n{instructions}")
-        
-        # Add constraints
-        if self._components.constraints:
-            constraints = "\n".join(f"- {c}" for c in self._components.constraints)
-            parts.append(f"\nConstraints:\n{constraints}")
-        
-        # Add output format
-        if self._components.output_format:
-            parts.append(f"\nOutput Format: {self._components.output_format}")
-        
-        return "\n".join(parts)
+        return _render_system_prompt(
+            "Rules you MUST follow:",
+            tuple(self._components.system_instructions),
+            tuple(self._components.constraints),
+            self._components.output_format,
+        )
     
     def build_user_prompt(self) -> str:
         """
@@ -221,67 +339,156 @@ class RAGPromptBuilder(PromptBuilder):
         Returns:
             Formatted user prompt string
         """
-        parts = []
+        return "\n\n".join(self._user_prompt_parts())
+    
+    def _user_prompt_parts(self) -> List[str]:
+        """User prompt sections: context first, then examples and query."""
+        components = self._components
         
         # Add context sections
-        for ctx in self._components.context_sections:
-            parts.append(f"{ctx['label']}:\n{ctx['content']}")
+        parts = [
+            f"{label}:\n{content}"
+            for label, content in zip(components.context_labels, components.context_contents)
+        ]
         
         # Add examples if any
-        if self._components.examples:
-            examples_text = "\n\nExamples:"
-            for ex in self._components.examples:
-                examples_text += f"\nQ: {ex['question']}\nA: {ex['answer']}"
-            parts.append(examples_text)
+        if components.example_questions:
+            examples = ["\n\nExamples:"]
+            examples.extend(
+                f"\nQ: {question}\nA: {answer}"
+                for question, answer in zip(components.example_questions, components.example_answers)
+            )
+            parts.append("".join(examples))
         
         # Add query
-        if self._components.user_query:
-            parts.append(f"\nQuestion:\n{self._components.user_query}")
-            parts.append("\nAnswer:")
+        if components.user_query:
+            parts.append(_QUESTION_HEADER + components.user_query)
+            parts.append(_ANSWER_CUE)
         
-        return "\n\n".join(parts)
+        return parts
     
-    def build_messages(self) -> List[Dict[str, str]]:
+    def build_messages(self, provider: str = PROVIDER_OPENAI) -> List[Dict[str, Any]]:
         """
         Build complete message list for chat API.
         
+        The static rules always come first and the per-request query last,
+        so provider prompt caches can reuse the longest possible prefix.
+        
+        Args:
+            provider: PROVIDER_OPENAI for plain string content, or
+                PROVIDER_ANTHROPIC for content blocks with cache_control
+                breakpoints after the system rules and the context
+        
         Returns:
             List of message dictionaries with role and content
         """
         messages = []
         
-        # System message
-        system_prompt = self.build_system_prompt()
-        if system_prompt:
-            messages.append({
-                "role": "system",
-                "content": system_prompt
-            })
+        # System message (shared precomputed message for unmodified defaults)
+        if self._default_rules:
+            messages.append(_RAG_SYSTEM_MESSAGES[provider])
+        else:
+            system_prompt = self.build_system_prompt()
+            if system_prompt:
+                messages.append(_system_message(system_prompt, provider))
         
         # User message
-        user_prompt = self.build_user_prompt()
-        if user_prompt:
-            messages.append({
-                "role": "user",
-                "content": user_prompt
-            })
+        parts = self._user_prompt_parts()
+        if parts:
+            messages.append(_user_message(
+                parts, len(self._components.context_labels), provider
+            ))
         
         return messages
     
-    def build(self) -> Dict[str, any]:
+    def build(self) -> Dict[str, Any]:
         """
         Build and return all prompt components.
         
+        Each prompt is rendered once and reused for the messages.
+        
         Returns:
             Dictionary with system_prompt, user_prompt, and messages
         """
+        system_prompt = self.build_system_prompt()
+        parts = self._user_prompt_parts()
+        user_prompt = "\n\n".join(parts)
+        
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        if user_prompt:
+            messages.append({"role": "user", "content": user_prompt})
+        
         return {
-            "system_prompt": self.build_system_prompt(),
-            "user_prompt": self.build_user_prompt(),
-            "messages": self.build_messages()
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "messages": messages,
         }
 
 
+# ============================================================
+# FAST PATH: precomputed default RAG prompt
+# ============================================================
+
+# System messages for the default RAG rules, built once at import.
+# Shared by every call to build_rag_messages - treat as read-only.
+_RAG_SYSTEM_MESSAGES: Dict[str, Dict[str, Any]] = {
+    provider: _system_message(RAGPromptBuilder().build_system_prompt(), provider)
+    for provider in (PROVIDER_OPENAI, PROVIDER_ANTHROPIC)
+}
+
+def build_rag_messages(
+    context: ContextInput,
+    query: str,
+    label: str = "Context",
+    provider: str = PROVIDER_OPENAI
+) -> List[Dict[str, Any]]:
+    """
+    Build default RAG chat messages without a stateful builder.
+    
+    Produces the same messages as a default RAGPromptBuilder with one
+    context section and a query, but reuses the precomputed system
+    message instead of rebuilding it per request. When given the
+    retrieved chunks directly, the user prompt is assembled in a single
+    join rather than joining the chunks and then copying them again.
+    
+    Args:
+        context: The retrieved text content, or the retrieved chunks
+        query: The user's question
+        label: Label for the context section
+        provider: Message format (see RAGPromptBuilder.build_messages)
+        
+    Returns:
+        List of message dictionaries with role and content
+    """
+    # Mirrors RAGPromptBuilder.build_user_prompt for one context section + query
+    parts = [label, ":\n"]
+    if isinstance(context, str):
+        parts.append(context)
+    else:
+        for chunk in context:
+            parts.append(chunk)
+            parts.append(CHUNK_SEPARATOR)
+        if len(parts) > 2:
+            parts.pop()
+    
+    if provider == PROVIDER_ANTHROPIC:
+        parts.append("\n\n")
+        user_content = [
+            {"type": "text", "text": "".join(parts), "cache_control": _CACHE_CONTROL},
+            {"type": "text", "text": "".join((_QUESTION_HEADER, query, _ANSWER_SECTION))},
+        ]
+    else:
+        parts.extend((_QUESTION_SECTION, query, _ANSWER_SECTION))
+        user_content = "".join(parts)
+    
+    return [
+        _RAG_SYSTEM_MESSAGES[provider],
+        {"role": "user", "content": user_content},
+    ]
+
+
 class SummarizationPromptBuilder(PromptBuilder):
     """
     Concrete Builder for summarization prompts.
@@ -297,19 +504,20 @@ class SummarizationPromptBuilder(PromptBuilder):
     ]
     
     def __init__(self, use_defaults: bool = True):
+        self._use_defaults = use_defaults
         super().__init__()
-        if use_defaults:
+    
+    def _apply_defaults(self) -> None:
+        if self._use_defaults:
             self._components.system_instructions = self.DEFAULT_INSTRUCTIONS.copy()
     
     def add_system_instruction(self, instruction: str) -> "SummarizationPromptBuilder":
         self._components.system_instructions.append(instruction)
         return self
     
-    def add_context(self, context: str, label: str = "Document") -> "SummarizationPromptBuilder":
-        self._components.context_sections.append({
-            "label": label,
-            "content": context
-        })
+    def add_context(self, context: ContextInput, label: str = "Document") -> "SummarizationPromptBuilder":
+        self._components.context_labels.append(label)
+        self._components.context_contents.append(_join_context(context))
         return self
     
     def set_query(self, query: str) -> "SummarizationPromptBuilder":
@@ -317,10 +525,8 @@ class SummarizationPromptBuilder(PromptBuilder):
         return self
     
     def add_example(self, question: str, answer: str) -> "SummarizationPromptBuilder":
-        self._components.examples.append({
-            "question": question,
-            "answer": answer
-        })
+        self._components.example_questions.append(question)
+        self._components.example_answers.append(answer)
         return self
     
     def add_constraint(self, constraint: str) -> "SummarizationPromptBuilder":
@@ -337,36 +543,34 @@ class SummarizationPromptBuilder(PromptBuilder):
         return self
     
     def build_system_prompt(self) -> str:
-        parts = []
-        
-        if self._components.system_instructions:
-            instructions = "\n".join(f"- {inst}" for inst in self._components.system_instructions)
-            parts.append(f"Instructions:\n{instructions}")
-        
-        if self._components.constraints:
-            constraints = "\n".join(f"- {c}" for c in self._components.constraints)
-            parts.append(f"\nConstraints:\n{constraints}")
-        
-        if self._components.output_format:
-            parts.append(f"\nOutput Format: {self._components.output_format}")
-        
-        return "\n".join(parts)
+        return _render_system_prompt(
+            "Instructions:",
+            tuple(self._components.system_instructions),
+            tuple(self._components.constraints),
+            self._components.output_format,
+        )
     
     def build_user_prompt(self) -> str:
-        parts = []
-        
-        for ctx in self._components.context_sections:
-            parts.append(f"{ctx['label']} to summarize:\n{ctx['content']}")
+        return "\n\n".join(self._user_prompt_parts())
+    
+    def _user_prompt_parts(self) -> List[str]:
+        components = self._components
+        parts = [
+            f"{label} to summarize:\n{content}"
+            for label, content in zip(components.context_labels, components.context_contents)
+        ]
         
-        if self._components.user_query:
-            parts.append(f"\nSpecific focus: {self._components.user_query}")
+        if components.user_query:
+            parts.append(f"\nSpecific focus: {components.user_query}")
         
         parts.append("\nSummary:")
         
-        return "\n\n".join(parts)
+        return parts
     
-    def build_messages(self) -> List[Dict[str, str]]:
+    def build_messages(self, provider: str = PROVIDER_OPENAI) -> List[Dict[str, Any]]:
         return [
-            {"role": "system", "content": self.build_system_prompt()},
-            {"role": "user", "content": self.build_user_prompt()}
+            _system_message(self.build_system_prompt(), provider),
+            _user_message(
+                self._user_prompt_parts(), len(self._components.context_labels), provider
+            ),
         ]
@@ -1,6 +1,6 @@
 """Interface for text chunking - Strategy Pattern"""
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Any, List, Dict
 
 
 class IChunker(ABC):
@@ -28,6 +28,31 @@ class IChunker(ABC):
         """
         pass
     
+    def chunk_arrays(self, text: str, metadata: Dict = None) -> Dict[str, Any]:
+        """
+        Split text into chunks, returned column-wise.
+        
+        Default implementation converts the output of chunk(), dropping
+        whitespace-only chunks; strategies can override it to skip
+        building per-chunk dicts, but must not return blank chunks.
+        
+        Args:
+            text: Input text to chunk
+            metadata: Metadata shared by every chunk
+            
+        Returns:
+            Dict with:
+                - texts: List of chunk contents
+                - chunk_ids: List of chunk identifiers (aligned with texts)
+                - metadata: The shared metadata dict (not copied)
+        """
+        chunks = [c for c in self.chunk(text, metadata) if c["text"].strip()]
+        return {
+            "texts": [c["text"] for c in chunks],
+            "chunk_ids": [c["chunk_id"] for c in chunks],
+            "metadata": metadata or {},
+        }
+    
     @property
     @abstractmethod
     def chunk_size(self) -> int:
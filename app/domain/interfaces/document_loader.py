@@ -1,6 +1,6 @@
 """Interface for document loaders - Factory Pattern"""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 
 
 class IDocumentLoader(ABC):
@@ -31,6 +31,22 @@ class IDocumentLoader(ABC):
         """
         pass
     
+    def iter_pages(self, file_bytes: bytes, filename: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream pages one at a time so callers need not hold the whole document.
+        
+        Default implementation yields from load(); loaders that can
+        extract incrementally should override this.
+        
+        Args:
+            file_bytes: Raw bytes of the document
+            filename: Original filename (for error messages)
+            
+        Yields:
+            Page dicts with the same keys as load()
+        """
+        yield from self.load(file_bytes, filename=filename)
+    
     @property
     @abstractmethod
     def supported_extensions(self) -> List[str]:
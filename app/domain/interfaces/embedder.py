@@ -2,6 +2,8 @@
 from abc import ABC, abstractmethod
 from typing import List
 
+import numpy as np
+
 
 class IEmbedder(ABC):
     """
@@ -9,10 +11,15 @@ class IEmbedder(ABC):
     
     Implements: Interface Segregation Principle (ISP)
     Enables: Strategy Pattern - swap embedding models at runtime
+    
+    Vectors are returned as float32 numpy arrays rather than Python
+    lists, so consumers (vector store, similarity math) use them as-is.
+    They are L2-normalized by the model's encode pass, so cosine
+    similarity is a plain dot product (one BLAS call against a matrix).
     """
     
     @abstractmethod
-    def embed_text(self, text: str) -> List[float]:
+    def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding vector for a single text.
         
@@ -20,12 +27,12 @@ class IEmbedder(ABC):
             text: Input text to embed
             
         Returns:
-            List of floats representing the embedding vector
+            float32 array of shape (dimension,)
         """
         pass
     
     @abstractmethod
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
         """
         Generate embedding vectors for multiple texts.
         
@@ -33,7 +40,7 @@ class IEmbedder(ABC):
             texts: List of input texts to embed
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dimension), one row per text
         """
         pass
     
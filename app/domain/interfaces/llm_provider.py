@@ -1,6 +1,7 @@
 """Interface for LLM providers - Adapter Pattern"""
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Iterator, List, Dict, Optional
 
 
 class ILLMProvider(ABC):
@@ -53,6 +54,72 @@ class ILLMProvider(ABC):
         """
         pass
     
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Async multi-turn chat completion.
+        
+        Default implementation runs chat() in a worker thread; providers
+        with a native async client should override this.
+        
+        Args:
+            messages: List of {"role": "user/assistant/system", "content": "..."}
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Returns:
+            Generated response
+        """
+        return await asyncio.to_thread(self.chat, messages, temperature, max_tokens)
+    
+    def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Streaming multi-turn chat completion.
+        
+        Default implementation yields the full chat() response at once;
+        providers that support streaming should override this.
+        
+        Args:
+            messages: List of {"role": "user/assistant/system", "content": "..."}
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Yields:
+            Response text fragments
+        """
+        yield self.chat(messages, temperature, max_tokens)
+    
+    async def astream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Async streaming multi-turn chat completion.
+        
+        Default implementation yields the full achat() response at once;
+        providers with a native async streaming client should override this.
+        
+        Args:
+            messages: List of {"role": "user/assistant/system", "content": "..."}
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Yields:
+            Response text fragments
+        """
+        yield await self.achat(messages, temperature, max_tokens)
+    
     @property
     @abstractmethod
     def model_name(self) -> str:
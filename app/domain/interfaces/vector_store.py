@@ -1,6 +1,8 @@
 """Interface for vector store - Repository Pattern"""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
+
+import numpy as np
 
 
 class IVectorStore(ABC):
@@ -24,10 +26,42 @@ class IVectorStore(ABC):
         """
         pass
     
+    def prepare_tags(self, tags: Iterable[Optional[str]]) -> None:
+        """
+        Prepare storage for tags about to be written (e.g. create their
+        partitions), outside any write transaction.
+        
+        The default does nothing.
+        
+        Args:
+            tags: Tags of the records that will be added
+        """
+        pass
+    
+    def add_batches(self, batches: Iterable[List[Dict]]) -> int:
+        """
+        Store batches of chunks atomically: either every batch is stored
+        or, if any batch fails or the iterable raises, none is.
+        
+        The default collects all batches and stores them with one add();
+        implementations with transactions can write each batch as it
+        arrives and commit once at the end.
+        
+        Args:
+            batches: Iterable of record lists, as accepted by add()
+            
+        Returns:
+            Number of records stored
+        """
+        records = [record for batch in batches for record in batch]
+        if records:
+            self.add(records)
+        return len(records)
+    
     @abstractmethod
     def search(
         self,
-        query_embedding: Optional[List[float]] = None,
+        query_embedding: Optional[np.ndarray] = None,
         tag: Optional[str] = None,
         top_k: int = 5,
     ) -> List[Dict]:
@@ -35,9 +69,9 @@ class IVectorStore(ABC):
         Search for similar documents.
         
         Args:
-            query_embedding: Vector to search for (None for wildcard)
+            query_embedding: float32 vector to search for (None for wildcard)
             tag: Optional tag filter
-            top_k: Number of results to return
+            top_k: Number of results to return (also caps wildcard results)
             
         Returns:
             List of matching documents with content and metadata
@@ -13,9 +13,15 @@ SOLID Principles:
 
 Exception Handling:
     - Empty/whitespace text → EmptyTextError
+
+Performance:
+    - Window starts come from a single range(); slicing past the end of
+      the text is clamped by Python, so no per-window bounds logic runs
+    - Cleaned text has no whitespace runs and ends on a non-space, so no
+      window of 2+ characters is blank and callers need no per-chunk
+      filtering
 """
-import re
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 
 from app.domain.interfaces.chunker import IChunker
 from app.core.logging import logger
@@ -41,7 +47,17 @@ class FixedSizeChunker(IChunker):
         Args:
             chunk_size: Target size of each chunk in characters
             overlap: Number of characters to overlap between chunks
+            
+        Raises:
+            ValueError: If chunk_size is below 2 or overlap is not
+                smaller than chunk_size
         """
+        # One-character windows could be a lone space between words
+        if chunk_size < 2:
+            raise ValueError("chunk_size must be at least 2")
+        if overlap >= chunk_size:
+            raise ValueError("overlap must be smaller than chunk_size")
+        
         self._chunk_size = chunk_size
         self._overlap = overlap
         logger.debug(f"FixedSizeChunker initialized: size={chunk_size}, overlap={overlap}")
@@ -60,8 +76,35 @@ class FixedSizeChunker(IChunker):
         Raises:
             EmptyTextError: If text is empty or whitespace-only
         """
-        metadata = metadata or {}
+        columns = self.chunk_arrays(text, metadata)
+        metadata = columns["metadata"]
+        
+        return [
+            {
+                "text": chunk_text,
+                "chunk_id": chunk_id,
+                **metadata  # Include any passed metadata (page, etc.)
+            }
+            for chunk_id, chunk_text in enumerate(columns["texts"])
+        ]
+    
+    def chunk_arrays(self, text: str, metadata: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Split text into fixed-size chunks, returned column-wise.
         
+        Avoids building a dict per chunk for callers (like ingestion)
+        that only need the texts and ids alongside shared metadata.
+        
+        Args:
+            text: Input text to chunk
+            metadata: Metadata shared by every chunk (not copied)
+            
+        Returns:
+            Dict with texts, chunk_ids (aligned lists) and metadata
+            
+        Raises:
+            EmptyTextError: If text is empty or whitespace-only
+        """
         # Edge case: None or empty text
         if text is None:
             logger.warning("Received None text for chunking")
@@ -75,29 +118,22 @@ class FixedSizeChunker(IChunker):
             logger.warning("Text is empty or whitespace-only after cleaning")
             raise EmptyTextError()
         
-        chunks = []
-        start = 0
         length = len(cleaned_text)
-        chunk_id = 0
+        size = self._chunk_size
+        stride = size - self._overlap
         
-        while start < length:
-            end = start + self._chunk_size
-            chunk_text = cleaned_text[start:end]
-            
-            # Build chunk with metadata
-            chunk_data = {
-                "text": chunk_text,
-                "chunk_id": chunk_id,
-                **metadata  # Include any passed metadata (page, etc.)
-            }
-            
-            chunks.append(chunk_data)
-            
-            chunk_id += 1
-            start = end - self._overlap
+        # Short text yields a single window: no range or slicing needed
+        if length <= stride:
+            texts = [cleaned_text]
+        else:
+            texts = [cleaned_text[start:start + size] for start in range(0, length, stride)]
         
-        logger.debug(f"Created {len(chunks)} chunks from text of length {length}")
-        return chunks
+        logger.debug(f"Created {len(texts)} chunks from text of length {length}")
+        return {
+            "texts": texts,
+            "chunk_ids": list(range(len(texts))),
+            "metadata": metadata or {},
+        }
     
     @property
     def chunk_size(self) -> int:
@@ -114,11 +150,14 @@ class FixedSizeChunker(IChunker):
         """
         Normalize whitespace in text.
         
+        str.split() with no arguments splits on runs of any whitespace and
+        drops leading/trailing runs, giving the same result as a regex
+        collapse plus strip() while running entirely in C.
+        
         Args:
             text: Raw input text
             
         Returns:
             Text with normalized whitespace
         """
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        return " ".join(text.split())
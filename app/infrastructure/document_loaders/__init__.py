@@ -1,5 +1,6 @@
 """Document loader implementations - Factory Pattern"""
 from app.infrastructure.document_loaders.loader_factory import DocumentLoaderFactory
 from app.infrastructure.document_loaders.pdf_loader import PDFLoader
+from app.infrastructure.document_loaders.cached_loader import CachedDocumentLoader
 
-__all__ = ["DocumentLoaderFactory", "PDFLoader"]
+__all__ = ["DocumentLoaderFactory", "PDFLoader", "CachedDocumentLoader"]
@@ -0,0 +1,132 @@
+"""
+Cached Document Loader - Decorator Pattern Implementation
+
+Wraps any IDocumentLoader with a persistent cache of extraction results
+keyed by the file's content hash, so uploading the same document twice
+skips parsing entirely.
+
+Design Pattern: Decorator
+SOLID Principles:
+    - Open/Closed (adds caching without modifying the wrapped loader)
+    - Liskov Substitution (usable anywhere an IDocumentLoader is expected)
+
+Storage:
+    SQLite file keyed by BLAKE2b(namespace || file bytes), where namespace
+    is the wrapped loader's class name; pages are stored as zlib-compressed
+    JSON. Loader errors are never cached.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional
+
+from app.domain.interfaces.document_loader import IDocumentLoader
+from app.core.logging import logger
+
+
+class CachedDocumentLoader(IDocumentLoader):
+    """
+    Persistent extraction cache in front of another document loader.
+    
+    Usage:
+        loader = CachedDocumentLoader(PDFLoader(), "cache/documents.sqlite3")
+        pages = loader.load(file_bytes)  # parsed only on first sight
+    """
+    
+    def __init__(self, loader: IDocumentLoader, path: str):
+        """
+        Args:
+            loader: Loader used for cache misses
+            path: SQLite file holding cached pages
+        """
+        self._loader = loader
+        self._namespace = type(loader).__name__.encode()
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents (key BLOB PRIMARY KEY, pages BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        logger.debug(f"Document cache opened at {path}")
+    
+    def _key(self, file_bytes: bytes) -> bytes:
+        """Content hash of the file, namespaced by loader type."""
+        h = hashlib.blake2b(self._namespace + b"\0", digest_size=32)
+        h.update(file_bytes)
+        return h.digest()
+    
+    def load(self, file_bytes: bytes, filename: Optional[str] = None) -> List[Dict]:
+        """
+        Load a document, reusing a previous extraction of identical bytes.
+        
+        Args:
+            file_bytes: Raw bytes of the document
+            filename: Original filename (for error messages)
+        
+        Returns:
+            List of page dicts, as returned by the wrapped loader
+        
+        Raises:
+            Whatever the wrapped loader raises on a cache miss
+        """
+        return list(self.iter_pages(file_bytes, filename))
+    
+    def iter_pages(self, file_bytes: bytes, filename: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream pages from the cache, or from the wrapped loader while
+        recording them (stored once the document is fully read).
+        
+        Args:
+            file_bytes: Raw bytes of the document
+            filename: Original filename (for error messages)
+        
+        Yields:
+            Page dicts, as yielded by the wrapped loader
+        """
+        # Empty input: let the wrapped loader raise its usual error
+        if not file_bytes:
+            yield from self._iter_uncached(file_bytes, filename)
+            return
+        
+        key = self._key(file_bytes)
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pages FROM documents WHERE key = ?", (key,)
+            ).fetchone()
+        
+        if row is not None:
+            logger.info(f"Document cache hit: {filename}")
+            yield from json.loads(zlib.decompress(row[0]))
+            return
+        
+        pages = []
+        for page in self._iter_uncached(file_bytes, filename):
+            pages.append(page)
+            yield page
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (key, pages) VALUES (?, ?)",
+                (key, zlib.compress(json.dumps(pages).encode())),
+            )
+            self._conn.commit()
+    
+    def _iter_uncached(self, file_bytes: bytes, filename: Optional[str]) -> Iterator[Dict]:
+        """Stream from the wrapped loader, keeping its own default filename."""
+        if filename is None:
+            return self._loader.iter_pages(file_bytes)
+        return self._loader.iter_pages(file_bytes, filename=filename)
+    
+    @property
+    def supported_extensions(self) -> List[str]:
+        """Return the extensions of the wrapped loader"""
+        return self._loader.supported_extensions
@@ -13,10 +13,12 @@ SOLID Principles:
     - Open/Closed (extend without modifying existing code)
     - Dependency Inversion (returns interface, not concrete class)
 """
+import os
 from typing import Dict, Type, Optional
 
 from app.domain.interfaces.document_loader import IDocumentLoader
 from app.infrastructure.document_loaders.pdf_loader import PDFLoader
+from app.infrastructure.document_loaders.cached_loader import CachedDocumentLoader
 from app.core.logging import logger
 
 
@@ -31,16 +33,19 @@ class DocumentLoaderFactory:
     To add new document type:
         1. Create new loader class implementing IDocumentLoader
         2. Register: DocumentLoaderFactory.register(".docx", DocxLoader)
+    
+    Loaders are instantiated once per extension and shared across
+    requests, so they MUST be thread-safe (stateless or internally locked).
+    When DOCUMENT_CACHE_PATH is set, each loader is wrapped in a
+    CachedDocumentLoader so re-uploaded files skip extraction.
     """
     
-    # Registry mapping extensions to loader classes
-    _loaders: Dict[str, Type[IDocumentLoader]] = {}
+    # Registry mapping extensions to loader classes (defaults registered
+    # here so lookups never need a lazy-initialization check)
+    _loaders: Dict[str, Type[IDocumentLoader]] = {".pdf": PDFLoader}
     
-    @classmethod
-    def _initialize_default_loaders(cls) -> None:
-        """Register default loaders if registry is empty"""
-        if not cls._loaders:
-            cls.register(".pdf", PDFLoader)
+    # Shared loader instance per extension, created on first use
+    _instances: Dict[str, IDocumentLoader] = {}
     
     @classmethod
     def register(cls, extension: str, loader_class: Type[IDocumentLoader]) -> None:
@@ -50,9 +55,16 @@ class DocumentLoaderFactory:
         Args:
             extension: File extension (e.g., ".pdf", ".docx")
             loader_class: Class implementing IDocumentLoader
+            
+        Raises:
+            TypeError: If loader_class does not implement IDocumentLoader
         """
+        if not (isinstance(loader_class, type) and issubclass(loader_class, IDocumentLoader)):
+            raise TypeError(f"{loader_class!r} does not implement IDocumentLoader")
+        
         ext = extension.lower()
         cls._loaders[ext] = loader_class
+        cls._instances.pop(ext, None)
         logger.debug(f"Registered loader for {ext}: {loader_class.__name__}")
     
     @classmethod
@@ -64,43 +76,61 @@ class DocumentLoaderFactory:
             filename: Name of the file to load
             
         Returns:
-            IDocumentLoader instance for the file type
+            Shared IDocumentLoader instance for the file type
             
         Raises:
             ValueError: If no loader exists for the file type
         """
-        cls._initialize_default_loaders()
-        
         # Extract extension
         ext = cls._get_extension(filename)
         
-        loader_class = cls._loaders.get(ext)
-        if loader_class is None:
-            supported = list(cls._loaders.keys())
-            raise ValueError(
-                f"Unsupported file type: {ext}. "
-                f"Supported types: {supported}"
-            )
+        loader = cls._instances.get(ext)
+        if loader is None:
+            loader_class = cls._loaders.get(ext)
+            if loader_class is None:
+                supported = list(cls._loaders.keys())
+                raise ValueError(
+                    f"Unsupported file type: {ext}. "
+                    f"Supported types: {supported}"
+                )
+            # Concurrent first calls may each build one; the last wins, harmlessly
+            loader = cls._instances.setdefault(ext, cls._create(loader_class))
         
-        logger.debug(f"Using {loader_class.__name__} for {filename}")
-        return loader_class()
+        logger.debug(f"Using {type(loader).__name__} for {filename}")
+        return loader
+    
+    @staticmethod
+    def _create(loader_class: Type[IDocumentLoader]) -> IDocumentLoader:
+        """Instantiate a loader, behind the extraction cache if configured"""
+        loader = loader_class()
+        cache_path = os.getenv("DOCUMENT_CACHE_PATH")
+        if cache_path:
+            loader = CachedDocumentLoader(loader, cache_path)
+        return loader
+    
+    @classmethod
+    def reset_instances(cls) -> None:
+        """Drop cached loader instances (used by tests)"""
+        cls._instances.clear()
     
     @classmethod
     def get_supported_extensions(cls) -> list:
         """Return list of all supported file extensions"""
-        cls._initialize_default_loaders()
         return list(cls._loaders.keys())
     
     @classmethod
     def is_supported(cls, filename: str) -> bool:
         """Check if a file type is supported"""
-        cls._initialize_default_loaders()
         ext = cls._get_extension(filename)
         return ext in cls._loaders
     
-    @staticmethod
-    def _get_extension(filename: str) -> str:
+    @classmethod
+    def _get_extension(cls, filename: str) -> str:
         """Extract lowercase extension from filename"""
-        if "." not in filename:
-            return ""
-        return "." + filename.rsplit(".", 1)[-1].lower()
+        ext = os.path.splitext(filename)[1]
+        
+        # Registered extensions are stored lowercase, so the common case
+        # needs no lower() copy
+        if ext in cls._loaders:
+            return ext
+        return ext.lower()
@@ -1,4 +1,13 @@
 """Embedder implementations"""
 from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder, get_embedder
+from app.infrastructure.embedders.cached_embedder import CachedEmbedder, get_cached_embedder
+from app.infrastructure.embedders.batching_embedder import BatchingEmbedder, get_batching_embedder
 
-__all__ = ["MiniLMEmbedder", "get_embedder"]
+__all__ = [
+    "MiniLMEmbedder",
+    "get_embedder",
+    "CachedEmbedder",
+    "get_cached_embedder",
+    "BatchingEmbedder",
+    "get_batching_embedder",
+]
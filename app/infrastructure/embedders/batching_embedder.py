@@ -0,0 +1,176 @@
+"""
+Batching Embedder - Decorator Pattern Implementation
+
+Coalesces concurrent single-text embed_text() calls into one batched
+embed_texts() call on the wrapped embedder. A forward pass over 32 short
+queries costs about the same wall-clock time as one, so under concurrent
+load each request stops paying for a full pass of its own.
+
+Design Pattern: Decorator
+SOLID Principles:
+    - Open/Closed (adds batching without modifying the wrapped embedder)
+    - Liskov Substitution (usable anywhere an IEmbedder is expected)
+
+Mechanism:
+    Callers (request threads, or asyncio.to_thread workers) enqueue
+    (text, Future) pairs and block on the Future. One background thread
+    takes the first queued item, keeps collecting for up to max_wait_ms
+    or until max_batch items, encodes them together and resolves each
+    Future with its own vector (or the shared exception).
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.domain.interfaces.embedder import IEmbedder
+from app.infrastructure.embedders.minilm_embedder import get_embedder
+from app.core.logging import logger
+from app.core.exceptions import EmbeddingError
+
+
+class BatchingEmbedder(IEmbedder):
+    """
+    Dynamic micro-batching in front of another embedder.
+    
+    Usage:
+        embedder = BatchingEmbedder(get_embedder(), max_batch=32, max_wait_ms=2)
+        vector = embedder.embed_text(query)  # batched with concurrent callers
+    """
+    
+    # Upper bound on texts coalesced into one forward pass
+    MAX_BATCH = 32
+    
+    # How long the worker waits for more requests after the first one
+    MAX_WAIT_MS = 2.0
+    
+    def __init__(
+        self,
+        embedder: IEmbedder,
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS
+    ):
+        """
+        Args:
+            embedder: Embedder used for the batched forward passes
+            max_batch: Maximum texts per batch
+            max_wait_ms: Maximum time to wait for a batch to fill
+        """
+        self._embedder = embedder
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+    
+    def embed_text(self, text: str) -> np.ndarray:
+        """
+        Embed a single text, batched with other concurrent callers.
+        
+        Args:
+            text: Input text to embed
+        
+        Returns:
+            Embedding vector
+        
+        Raises:
+            EmbeddingError: If text is empty or embedding fails
+        """
+        # Reject empty text here so batch outputs stay aligned with inputs
+        if not text or not text.strip():
+            logger.warning("Received empty text for embedding")
+            raise EmbeddingError("Cannot embed empty text", "Empty text provided")
+        
+        self._ensure_worker()
+        
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+    
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed a list of texts directly (already a batch)."""
+        return self._embedder.embed_texts(texts)
+    
+    def _ensure_worker(self) -> None:
+        """Start the background batching thread on first use."""
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+    
+    def _collect(self) -> List[Tuple[str, Future]]:
+        """Block for one request, then gather more until full or timed out."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._max_wait
+        
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def _run(self) -> None:
+        """Worker loop: encode each collected batch and resolve its futures."""
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            
+            try:
+                vectors = self._embedder.embed_texts(texts)
+            except Exception as e:
+                logger.error(f"Batched embedding failed for {len(batch)} texts: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            logger.debug(f"Embedded micro-batch of {len(batch)} texts")
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+    
+    @property
+    def dimension(self) -> int:
+        """Return the dimension of the wrapped embedder"""
+        return self._embedder.dimension
+
+
+# Module-level singleton accessor function
+_batching_embedder_instance = None
+_batching_embedder_lock = threading.Lock()
+
+
+def get_batching_embedder() -> IEmbedder:
+    """
+    Get the singleton micro-batching embedder wrapping the MiniLM singleton.
+    
+    EMBEDDING_MICROBATCH_WAIT_MS sets how long a request may wait for
+    others to join its batch.
+    
+    Returns:
+        IEmbedder: The singleton batching embedder instance
+    """
+    global _batching_embedder_instance
+    
+    if _batching_embedder_instance is None:
+        with _batching_embedder_lock:
+            if _batching_embedder_instance is None:
+                _batching_embedder_instance = BatchingEmbedder(
+                    get_embedder(),
+                    max_wait_ms=float(
+                        os.getenv("EMBEDDING_MICROBATCH_WAIT_MS") or BatchingEmbedder.MAX_WAIT_MS
+                    ),
+                )
+    
+    return _batching_embedder_instance
@@ -0,0 +1,198 @@
+"""
+Cached Embedder - Decorator Pattern Implementation
+
+Wraps any IEmbedder with a persistent, content-addressed embedding cache
+so re-ingesting a document (or documents sharing chunks) skips the model
+for text it has already embedded.
+
+Design Pattern: Decorator
+SOLID Principles:
+    - Open/Closed (adds caching without modifying the wrapped embedder)
+    - Liskov Substitution (usable anywhere an IEmbedder is expected)
+
+Storage:
+    SQLite file keyed by SHA-256(namespace || text), where namespace
+    identifies the model variant (model, precision or backend, token cap)
+    so different variants never share vectors.
+    
+    With max_entries set, the oldest-written vectors are evicted first
+    (FIFO by rowid); a hit does not refresh an entry, so reads never
+    write. Without it the file grows with every distinct chunk.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from app.domain.interfaces.embedder import IEmbedder
+from app.infrastructure.embedders.minilm_embedder import get_embedder
+from app.core.logging import logger
+from app.core.exceptions import EmbeddingError
+
+
+class CachedEmbedder(IEmbedder):
+    """
+    Persistent embedding cache in front of another embedder.
+    
+    Usage:
+        embedder = CachedEmbedder(get_embedder(), "cache/embeddings.sqlite3")
+        vectors = embedder.embed_texts(chunks)  # only cache misses hit the model
+    """
+    
+    def __init__(
+        self,
+        embedder: IEmbedder,
+        path: str,
+        namespace: str = "",
+        max_entries: Optional[int] = None
+    ):
+        """
+        Args:
+            embedder: Embedder used for cache misses
+            path: SQLite file holding cached vectors
+            namespace: Model variant identifier mixed into every cache key
+            max_entries: Vectors kept before the oldest are evicted
+                (None keeps every vector)
+        """
+        self._embedder = embedder
+        self._namespace = namespace.encode()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        logger.debug(f"Embedding cache opened at {path} ({self._size} vectors)")
+    
+    def _key(self, text: str) -> bytes:
+        """Content hash of the text, namespaced by model."""
+        return hashlib.sha256(self._namespace + b"\0" + text.encode()).digest()
+    
+    def _get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Look up cached vectors for the given keys."""
+        found = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def _put_many(self, items: Dict[bytes, np.ndarray]) -> None:
+        """Store vectors for the given keys, evicting the oldest past max_entries."""
+        with self._lock:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes())
+                    for key, vector in items.items()
+                ],
+            )
+            self._size += cursor.rowcount
+            
+            if self._max_entries is not None and self._size > self._max_entries:
+                excess = self._size - self._max_entries
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                    (excess,),
+                )
+                self._size -= excess
+                logger.debug(f"Embedding cache evicted {excess} oldest vectors")
+            
+            self._conn.commit()
+    
+    def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single text, using the cache when possible."""
+        return self.embed_texts([text])[0]
+    
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, running the wrapped model only on cache misses.
+        
+        Args:
+            texts: List of input texts to embed
+            
+        Returns:
+            float32 array with one row per non-empty input
+            
+        Raises:
+            EmbeddingError: If texts list is empty or embedding fails
+        """
+        # Same filtering as the wrapped embedder keeps outputs aligned
+        valid_texts = [t for t in texts if t and t.strip()]
+        if not valid_texts:
+            logger.warning("Received no non-empty texts for embedding")
+            raise EmbeddingError("Cannot embed empty text list", "No valid texts")
+        
+        keys = [self._key(t) for t in valid_texts]
+        cached = self._get_many(keys)
+        
+        # Embed each distinct missing text once
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, valid_texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            vectors = self._embedder.embed_texts(list(missing.values()))
+            new_items = dict(zip(missing.keys(), vectors))
+            self._put_many(new_items)
+            cached.update(new_items)
+        
+        logger.debug(
+            f"Embedding cache: {len(valid_texts) - len(missing)} hits, {len(missing)} misses"
+        )
+        return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+    
+    @property
+    def dimension(self) -> int:
+        """Return the dimension of the wrapped embedder"""
+        return self._embedder.dimension
+
+
+# Module-level singleton accessor function
+_cached_embedder_instance = None
+_cached_embedder_lock = threading.Lock()
+
+
+def get_cached_embedder() -> IEmbedder:
+    """
+    Get the singleton cached embedder wrapping the MiniLM singleton.
+    
+    The cache file location is read from EMBEDDING_CACHE_PATH and its
+    capacity from EMBEDDING_CACHE_MAX_ENTRIES (unset or 0: unbounded).
+    
+    Returns:
+        IEmbedder: The singleton cached embedder instance
+    """
+    global _cached_embedder_instance
+    
+    if _cached_embedder_instance is None:
+        with _cached_embedder_lock:
+            if _cached_embedder_instance is None:
+                embedder = get_embedder()
+                _cached_embedder_instance = CachedEmbedder(
+                    embedder,
+                    os.getenv("EMBEDDING_CACHE_PATH", "cache/embeddings.sqlite3"),
+                    namespace=getattr(embedder, "model_name", type(embedder).__name__),
+                    max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES") or 0) or None,
+                )
+    
+    return _cached_embedder_instance
@@ -1,9 +1,11 @@
 """
 MiniLM Embedder - Singleton Pattern Implementation
 
-This module implements the Singleton pattern to ensure only ONE instance
-of the heavy ML model is loaded into memory, regardless of how many
-times it's requested across the application.
+The get_embedder() accessor implements the Singleton pattern to ensure
+only ONE instance of the heavy ML model is loaded into memory, regardless
+of how many times it's requested across the application. The class
+itself carries no locking, so the only synchronization is a single
+double-checked lock taken on first use.
 
 Design Pattern: Singleton
 SOLID Principle: Single Responsibility (only handles embedding)
@@ -12,9 +14,14 @@ Exception Handling:
     - Model loading failure → EmbeddingModelError
     - Empty text → EmbeddingError
 """
+import os
 import threading
 from typing import List
+import numpy as np
+import torch
+from torch.ao.quantization import quantize_dynamic
 from sentence_transformers import SentenceTransformer
+from transformers import AutoTokenizer
 
 from app.domain.interfaces.embedder import IEmbedder
 from app.core.logging import logger
@@ -23,46 +30,176 @@ from app.core.exceptions import EmbeddingModelError, EmbeddingError
 
 class MiniLMEmbedder(IEmbedder):
     """
-    Singleton implementation of MiniLM embedding model.
+    MiniLM embedding model.
     
-    Thread-safe singleton ensures the ~100MB model loads only once,
-    saving memory when multiple routes need embeddings.
+    Shared through the get_embedder() singleton accessor, which ensures
+    the ~100MB model loads only once, saving memory when multiple routes
+    need embeddings.
     """
     
-    _instance = None
-    _lock = threading.Lock()
-    _initialized = False
+    # Texts per forward pass for ~128-token inputs (EMBEDDING_BATCH_SIZE
+    # overrides); CPUs saturate at much smaller batches than GPUs
+    BATCH_SIZE = 64
+    CPU_BATCH_SIZE = 16
     
-    def __new__(cls):
-        """Thread-safe singleton instantiation"""
-        if cls._instance is None:
-            with cls._lock:
-                # Double-check locking pattern
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
+    # Token-length bucket caps for embed_texts; shorter buckets get
+    # proportionally larger batches so each forward pass covers roughly
+    # batch_size * BATCH_REFERENCE_TOKENS tokens
+    LENGTH_BUCKETS = (16, 32, 64, 128, 256)
+    BATCH_REFERENCE_TOKENS = 128
+    
+    # Default ONNX graph for EMBEDDING_BACKEND=onnx (AVX-512 VNNI INT8)
+    ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
     
     def __init__(self):
-        """Initialize the model only once"""
-        # Prevent re-initialization on subsequent calls
-        if MiniLMEmbedder._initialized:
-            return
+        """
+        Load the model.
+        
+        Construct through get_embedder() so the ~100MB model is loaded
+        once per process.
+        """
+        try:
+            logger.info("Loading MiniLM embedding model (Singleton)...")
             
-        with MiniLMEmbedder._lock:
-            if MiniLMEmbedder._initialized:
-                return
+            # Identifies the model variant: precision or backend and any
+            # token cap, since each changes the vectors (namespaces caches)
+            self._model_name = "all-MiniLM-L6-v2"
             
-            try:
-                logger.info("Loading MiniLM embedding model (Singleton)...")
+            if torch.cuda.is_available():
+                # FP16 on GPU halves memory bandwidth per forward pass;
+                # loading directly in fp16 skips the fp32 copy
+                self._model = SentenceTransformer(
+                    "all-MiniLM-L6-v2",
+                    device="cuda",
+                    model_kwargs={"torch_dtype": torch.float16},
+                )
+                self._model_name += "-fp16"
+            elif os.getenv("EMBEDDING_BACKEND", "torch").lower() == "onnx":
+                # ONNX Runtime with a pre-quantized INT8 graph (CPU only);
+                # imported here because it is an optional dependency
+                import onnxruntime
+                
+                onnx_file = os.getenv("EMBEDDING_ONNX_FILE", self.ONNX_FILE)
+                
+                # Same thread budget as the torch CPU path, instead of ORT's
+                # default of one thread per core competing with the web workers
+                session_options = onnxruntime.SessionOptions()
+                session_options.intra_op_num_threads = self._cpu_threads()
+                session_options.graph_optimization_level = (
+                    onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+                )
+                
+                self._model = SentenceTransformer(
+                    "all-MiniLM-L6-v2",
+                    backend="onnx",
+                    model_kwargs={
+                        "file_name": onnx_file,
+                        "provider": "CPUExecutionProvider",
+                        "session_options": session_options,
+                    },
+                )
+                self._model_name += "-" + os.path.splitext(os.path.basename(onnx_file))[0]
+                logger.info(f"MiniLM loaded with ONNX Runtime backend: {onnx_file}")
+            elif (
+                os.getenv("EMBEDDING_BF16", "false").lower() == "true"
+                and self._cpu_supports_bf16()
+            ):
+                # BF16 on CPUs with native support (AVX512-BF16 / AMX)
+                torch.set_num_threads(self._cpu_threads())
+                self._model = SentenceTransformer(
+                    "all-MiniLM-L6-v2",
+                    model_kwargs={"torch_dtype": torch.bfloat16},
+                )
+                self._model_name += "-bf16"
+                logger.info("MiniLM loaded in bfloat16")
+            else:
+                torch.set_num_threads(self._cpu_threads())
                 self._model = SentenceTransformer("all-MiniLM-L6-v2")
-                self._dimension = 384
-                MiniLMEmbedder._initialized = True
-                logger.success("MiniLM model loaded successfully")
-            except Exception as e:
-                logger.error(f"Failed to load embedding model: {e}")
-                raise EmbeddingModelError(str(e))
-    
-    def embed_text(self, text: str) -> List[float]:
+                
+                if os.getenv("EMBEDDING_INT8", "false").lower() == "true":
+                    # INT8 dynamic quantization of Linear layers (CPU only)
+                    self._model = quantize_dynamic(
+                        self._model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    self._model_name += "-int8"
+                    logger.info("MiniLM Linear layers quantized to INT8")
+            
+            self._batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE") or 0) or (
+                self.BATCH_SIZE if torch.cuda.is_available() else self.CPU_BATCH_SIZE
+            )
+            
+            self._prepare_tokenizer()
+            
+            if (
+                torch.cuda.is_available()
+                and os.getenv("EMBEDDING_COMPILE", "false").lower() == "true"
+            ):
+                self._compile()
+            
+            self._dimension = 384
+            logger.success("MiniLM model loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load embedding model: {e}")
+            raise EmbeddingModelError(str(e))
+    
+    def _prepare_tokenizer(self) -> None:
+        """
+        Make sure the Rust fast tokenizer is used, apply the optional
+        EMBEDDING_MAX_SEQ_LENGTH cap and run one encode so the first real
+        request does not pay tokenizer/kernel initialisation.
+        """
+        if not getattr(self._model.tokenizer, "is_fast", False):
+            logger.warning("Slow tokenizer loaded; switching to the fast tokenizer")
+            self._model.tokenizer = AutoTokenizer.from_pretrained(
+                "sentence-transformers/all-MiniLM-L6-v2", use_fast=True
+            )
+        
+        max_seq_length = os.getenv("EMBEDDING_MAX_SEQ_LENGTH")
+        if max_seq_length:
+            self._model.max_seq_length = int(max_seq_length)
+            self._model_name += f"-seq{int(max_seq_length)}"
+        
+        self._model.encode(["warmup"], convert_to_numpy=True)
+    
+    def _compile(self) -> None:
+        """
+        Compile the transformer with CUDA graphs (mode="reduce-overhead")
+        and warm one full batch per length bucket, so later requests with
+        those shapes replay captured graphs instead of launching kernels
+        one by one from Python.
+        """
+        transformer = self._model[0]
+        transformer.auto_model = torch.compile(
+            transformer.auto_model, mode="reduce-overhead"
+        )
+        
+        for cap in self.LENGTH_BUCKETS:
+            # cap - 2 single-token words + [CLS]/[SEP] fill the bucket exactly
+            batch_size = self._bucket_batch_size(cap)
+            self._model.encode(["x " * (cap - 2)] * batch_size, batch_size=batch_size)
+        
+        logger.info("MiniLM compiled with torch.compile (reduce-overhead)")
+    
+    def _bucket_batch_size(self, cap: int) -> int:
+        """Batch size for a length bucket, keeping tokens per pass constant."""
+        return max(self._batch_size, self._batch_size * self.BATCH_REFERENCE_TOKENS // cap)
+    
+    @staticmethod
+    def _cpu_threads() -> int:
+        """
+        Intra-op threads for CPU inference: EMBEDDING_THREADS if set (e.g.
+        cores / uvicorn workers, so workers don't oversubscribe the CPU),
+        else half the cores, leaving the rest to request handling.
+        """
+        return int(os.getenv("EMBEDDING_THREADS") or 0) or max(1, (os.cpu_count() or 2) // 2)
+    
+    @staticmethod
+    def _cpu_supports_bf16() -> bool:
+        """Whether this CPU has native bfloat16 matmul support."""
+        check = getattr(torch.cpu, "_is_avx512_bf16_supported", None)
+        return bool(check and check())
+    
+    def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding vector for a single text.
         
@@ -70,7 +207,7 @@ class MiniLMEmbedder(IEmbedder):
             text: Input text to embed
             
         Returns:
-            384-dimensional embedding vector
+            384-dimensional float32 embedding vector (unit L2 norm)
             
         Raises:
             EmbeddingError: If text is empty or embedding fails
@@ -81,13 +218,16 @@ class MiniLMEmbedder(IEmbedder):
             raise EmbeddingError("Cannot embed empty text", "Empty text provided")
         
         try:
-            embedding = self._model.encode(text)
-            return embedding.tolist()
+            embedding = self._model.encode(
+                text, convert_to_numpy=True, normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            return embedding.astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             raise EmbeddingModelError(str(e))
     
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
         """
         Generate embedding vectors for multiple texts (batch processing).
         
@@ -95,7 +235,7 @@ class MiniLMEmbedder(IEmbedder):
             texts: List of input texts to embed
             
         Returns:
-            List of 384-dimensional embedding vectors
+            float32 array of shape (len(texts), 384), rows of unit L2 norm
             
         Raises:
             EmbeddingError: If texts list is empty or embedding fails
@@ -112,16 +252,67 @@ class MiniLMEmbedder(IEmbedder):
             raise EmbeddingError("All provided texts are empty", "No valid texts")
         
         try:
-            embeddings = self._model.encode(valid_texts)
-            return embeddings.tolist()
+            return self._encode_bucketed(valid_texts).astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"Batch embedding generation failed: {e}")
             raise EmbeddingModelError(str(e))
     
+    def _encode_bucketed(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts grouped by token length to avoid padding short inputs
+        up to the longest one in a mixed batch.
+        
+        Args:
+            texts: Non-empty texts to embed
+            
+        Returns:
+            Array of shape (len(texts), dimension) in input order
+        """
+        # A lone text (common for micro-batched queries) has no padding to
+        # save, so skip the extra tokenizer pass
+        if len(texts) == 1:
+            return self._model.encode(
+                texts,
+                batch_size=1,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        
+        lengths = self._model.tokenizer(
+            texts, truncation=True, return_length=True
+        )["length"]
+        buckets = np.minimum(
+            np.searchsorted(self.LENGTH_BUCKETS, lengths),
+            len(self.LENGTH_BUCKETS) - 1,
+        )
+        
+        out = None
+        for bucket in np.unique(buckets):
+            indices = np.flatnonzero(buckets == bucket)
+            batch_size = self._bucket_batch_size(self.LENGTH_BUCKETS[bucket])
+            embeddings = self._model.encode(
+                [texts[i] for i in indices],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                # Otherwise tqdm is set up per call whenever logging is at INFO
+                show_progress_bar=False
+            )
+            if out is None:
+                out = np.empty((len(texts), embeddings.shape[1]), dtype=embeddings.dtype)
+            out[indices] = embeddings
+        return out
+    
     @property
     def dimension(self) -> int:
         """Return the dimension of embedding vectors (384 for MiniLM)"""
         return self._dimension
+    
+    @property
+    def model_name(self) -> str:
+        """Return the model variant identifier (e.g. all-MiniLM-L6-v2-int8)"""
+        return self._model_name
 
 
 # Module-level singleton accessor function
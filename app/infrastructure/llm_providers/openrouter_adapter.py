@@ -17,11 +17,34 @@ Exception Handling:
 - Rate limit (429) → LLMRateLimitError  
 - Auth error (401/403) → LLMAuthenticationError
 - Empty response → LLMResponseError
+
+Retries:
+- 429/5xx responses are retried with capped exponential backoff and
+  full jitter (honoring Retry-After); connection failures are retried twice.
+  The mapped exception above is raised once the budget is spent.
+
+Serialization:
+- Request bodies are pre-encoded with orjson and sent as raw bytes;
+  responses and stream events are decoded with orjson as well
+
+Caching:
+- chat()/achat() answers are kept in a small TTL'd LRU keyed by a
+  BLAKE2b hash of the serialized request body (model, messages,
+  temperature, max_tokens), so byte-identical retries (reload, back
+  button) skip the API call
 """
+import asyncio
+import hashlib
+import importlib.util
 import os
+import random
 import threading
+import time
+from collections import OrderedDict
+import httpx
+import orjson
 import requests
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 from app.domain.interfaces import ILLMProvider
@@ -40,36 +63,31 @@ class OpenRouterAdapter(ILLMProvider):
     """
     Adapter for OpenRouter API.
     
-    Implements Singleton pattern for resource efficiency.
+    Shared through the get_llm_provider() singleton accessor, so one
+    set of pooled HTTP clients and caches serves the whole process.
     Adapts OpenRouter's API to our ILLMProvider interface.
     """
     
-    _instance: Optional["OpenRouterAdapter"] = None
-    _lock: threading.Lock = threading.Lock()
-    
-    # Default system prompt for RAG
-    DEFAULT_SYSTEM_PROMPT = (
-        "You are a document-grounded assistant.\n\n"
-        "Rules you MUST follow:\n"
-        "- Use ONLY the information present in the provided context.\n"
-        "- Do NOT use any external knowledge.\n"
-        "- Do NOT make assumptions or guesses.\n"
-        "- If the answer is not present in the context, say:\n"
-        "  \"The document does not contain this information.\"\n"
-        "- Be concise and clear.\n"
-        "- Summarize information instead of copying raw text.\n"
-        "- Do NOT include IDs, reference numbers, GSTIN, CIN, signatures, "
-        "or contact details unless explicitly asked.\n"
-    )
-    
-    def __new__(cls, *args, **kwargs) -> "OpenRouterAdapter":
-        """Singleton pattern with double-check locking"""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    instance = super().__new__(cls)
-                    cls._instance = instance
-        return cls._instance
+    # Total attempts for rate-limited (429) or server-error (5xx) responses
+    MAX_ATTEMPTS = 4
+    
+    # Retries after a failed connection
+    MAX_CONNECTION_RETRIES = 2
+    
+    # Upper bound in seconds on any single backoff sleep
+    MAX_BACKOFF = 15.0
+    
+    # Statuses worth retrying
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    # Exact-match answer cache capacity (LLM_EXACT_CACHE_SIZE overrides;
+    # 0 disables) and entry lifetime in seconds
+    EXACT_CACHE_SIZE = 1024
+    EXACT_CACHE_TTL = 3600.0
+    
+    # Async requests are multiplexed over HTTP/2 connections when the
+    # optional h2 package (httpx[http2]) is installed
+    HTTP2 = importlib.util.find_spec("h2") is not None
     
     def __init__(
         self,
@@ -85,14 +103,19 @@ class OpenRouterAdapter(ILLMProvider):
             model: Model identifier
             base_url: API endpoint URL
         """
-        # Prevent re-initialization in Singleton
-        if hasattr(self, "_initialized") and self._initialized:
-            return
-            
         self._api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         self._model = model
         self._base_url = base_url
-        self._initialized = True
+        self._session: Optional[requests.Session] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._client_lock = threading.Lock()
+        
+        # Exact-match cache: request hash -> (stored at, answer)
+        self._exact_cache: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
+        self._exact_cache_size = int(
+            os.getenv("LLM_EXACT_CACHE_SIZE") or self.EXACT_CACHE_SIZE
+        )
         
         logger.info(f"OpenRouterAdapter initialized with model: {model}")
     
@@ -152,61 +175,20 @@ class OpenRouterAdapter(ILLMProvider):
             LLMConnectionError: If API is unreachable or timeout
             LLMResponseError: If response is empty or malformed
         """
-        # Edge case: No API key
-        if not self._api_key:
-            logger.error("OpenRouter API key not configured")
-            raise LLMAuthenticationError()
+        self._check_api_key()
         
         logger.debug(f"Calling OpenRouter with {len(messages)} messages...")
         
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
-        
-        payload = {
-            "model": self._model,
-            "messages": messages,
-            "temperature": temperature,
-        }
-        
-        if max_tokens:
-            payload["max_tokens"] = max_tokens
+        body = orjson.dumps(self._build_payload(messages, temperature, max_tokens))
+        key = self._cache_key(body)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.post(
-                self._base_url,
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            
-            # Handle specific HTTP errors
-            if response.status_code == 401 or response.status_code == 403:
-                logger.error(f"OpenRouter authentication failed: {response.status_code}")
-                raise LLMAuthenticationError()
-            
-            if response.status_code == 429:
-                logger.warning("OpenRouter rate limit exceeded")
-                raise LLMRateLimitError()
-            
-            response.raise_for_status()
-            
-            # Parse response
-            data = response.json()
-            
-            # Edge case: Empty or malformed response
-            if not data.get("choices"):
-                logger.error(f"OpenRouter returned empty choices: {data}")
-                raise LLMResponseError("No choices in response")
-            
-            answer = data["choices"][0].get("message", {}).get("content", "")
-            
-            if not answer or not answer.strip():
-                logger.error("OpenRouter returned empty content")
-                raise LLMResponseError("Empty content in response")
-            
-            logger.info(f"OpenRouter response received ({len(answer)} chars)")
+            response = self._post_with_retry(body)
+            answer = self._parse_response(response)
+            self._cache_put(key, answer)
             return answer
             
         except (LLMAuthenticationError, LLMRateLimitError, LLMResponseError):
@@ -228,32 +210,453 @@ class OpenRouterAdapter(ILLMProvider):
             logger.error(f"Unexpected OpenRouter error: {e}")
             raise LLMConnectionError(str(e))
     
-    def generate_with_context(
+    async def achat(
         self,
-        context: str,
-        question: str,
-        system_prompt: Optional[str] = None
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
     ) -> str:
         """
-        Convenience method for RAG: Generate answer given context and question.
+        Async multi-turn chat completion using a pooled httpx client.
+        
+        Concurrent calls share keep-alive connections, so many requests
+        can wait on OpenRouter at once without blocking worker threads.
         
         Args:
-            context: Retrieved document context
-            question: User question
-            system_prompt: Optional custom system prompt
+            messages: List of {"role": "user/assistant/system", "content": "..."}
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
             
         Returns:
-            Generated answer
+            Generated response
+            
+        Raises:
+            Same exceptions as chat()
         """
-        system = system_prompt or self.DEFAULT_SYSTEM_PROMPT
+        self._check_api_key()
         
-        prompt = (
-            f"Context:\n{context}\n\n"
-            f"Question:\n{question}\n\n"
-            "Answer:"
-        )
+        logger.debug(f"Calling OpenRouter (async) with {len(messages)} messages...")
+        
+        body = orjson.dumps(self._build_payload(messages, temperature, max_tokens))
+        key = self._cache_key(body)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self._apost_with_retry(body)
+            answer = self._parse_response(response)
+            self._cache_put(key, answer)
+            return answer
+            
+        except (LLMAuthenticationError, LLMRateLimitError, LLMResponseError):
+            raise
+        except httpx.TimeoutException:
+            logger.error("OpenRouter request timed out")
+            raise LLMConnectionError("Request timed out after 60 seconds")
+        except httpx.TransportError as e:
+            logger.error(f"OpenRouter connection failed: {e}")
+            raise LLMConnectionError(str(e))
+        except httpx.HTTPStatusError as e:
+            logger.error(f"OpenRouter HTTP error: {e}")
+            raise LLMConnectionError(str(e))
+        except KeyError as e:
+            logger.error(f"Malformed OpenRouter response: {e}")
+            raise LLMResponseError(f"Missing key in response: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected OpenRouter error: {e}")
+            raise LLMConnectionError(str(e))
+    
+    def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion token-by-token from OpenRouter.
+        
+        Parses OpenRouter's server-sent events and yields each content
+        delta as soon as it arrives.
+        
+        Args:
+            messages: List of {"role": "user/assistant/system", "content": "..."}
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Yields:
+            Response text fragments
+            
+        Raises:
+            Same exceptions as chat()
+        """
+        self._check_api_key()
         
-        return self.generate(prompt, system_prompt=system)
+        logger.debug(f"Streaming OpenRouter response for {len(messages)} messages...")
+        
+        payload = self._build_payload(messages, temperature, max_tokens)
+        payload["stream"] = True
+        
+        try:
+            with self._get_session().post(
+                self._base_url,
+                data=orjson.dumps(payload),
+                timeout=60,
+                stream=True
+            ) as response:
+                self._check_status(response)
+                
+                for line in response.iter_lines(decode_unicode=True):
+                    done, delta = self._parse_stream_line(line)
+                    if done:
+                        break
+                    if delta:
+                        yield delta
+            
+        except (LLMAuthenticationError, LLMRateLimitError, LLMResponseError):
+            raise
+        except requests.exceptions.Timeout:
+            logger.error("OpenRouter stream timed out")
+            raise LLMConnectionError("Request timed out after 60 seconds")
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"OpenRouter connection failed: {e}")
+            raise LLMConnectionError(str(e))
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"OpenRouter HTTP error: {e}")
+            raise LLMConnectionError(str(e))
+        except ValueError as e:
+            logger.error(f"Malformed OpenRouter stream event: {e}")
+            raise LLMResponseError(f"Malformed stream event: {e}")
+    
+    @staticmethod
+    def _cache_key(body: bytes) -> bytes:
+        """Hash of a serialized request body."""
+        return hashlib.blake2b(body, digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Return a live cached answer for key, dropping it if expired."""
+        with self._exact_cache_lock:
+            entry = self._exact_cache.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, answer = entry
+            if time.monotonic() - stored_at > self.EXACT_CACHE_TTL:
+                del self._exact_cache[key]
+                return None
+            
+            self._exact_cache.move_to_end(key)
+        
+        logger.debug("Exact-match LLM cache hit")
+        return answer
+    
+    def _cache_put(self, key: bytes, answer: str) -> None:
+        """Cache an answer, evicting the least recently used entry when full."""
+        if self._exact_cache_size <= 0:
+            return
+        
+        with self._exact_cache_lock:
+            self._exact_cache[key] = (time.monotonic(), answer)
+            self._exact_cache.move_to_end(key)
+            if len(self._exact_cache) > self._exact_cache_size:
+                self._exact_cache.popitem(last=False)
+    
+    def _post_with_retry(self, body: bytes) -> requests.Response:
+        """
+        POST a serialized request, retrying transient failures.
+        
+        Args:
+            body: JSON request body
+            
+        Returns:
+            The final response (possibly still a 429/5xx once attempts run out)
+            
+        Raises:
+            requests.exceptions.ConnectionError: If retries are exhausted
+        """
+        connection_failures = 0
+        
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                response = self._get_session().post(
+                    self._base_url,
+                    data=body,
+                    timeout=60
+                )
+            except requests.exceptions.ConnectionError as e:
+                if connection_failures >= self.MAX_CONNECTION_RETRIES:
+                    raise
+                connection_failures += 1
+                delay = self._backoff(attempt)
+                logger.warning(f"OpenRouter connection failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_ATTEMPTS - 1:
+                return response
+            
+            delay = self._retry_delay(response, attempt)
+            logger.warning(f"OpenRouter returned {response.status_code}, retrying in {delay:.2f}s")
+            time.sleep(delay)
+        
+        return response
+    
+    async def _apost_with_retry(self, body: bytes) -> httpx.Response:
+        """Async counterpart of _post_with_retry() that sleeps without blocking the loop."""
+        connection_failures = 0
+        
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                response = await self._get_async_client().post(
+                    self._base_url,
+                    content=body,
+                )
+            except httpx.ConnectError as e:
+                if connection_failures >= self.MAX_CONNECTION_RETRIES:
+                    raise
+                connection_failures += 1
+                delay = self._backoff(attempt)
+                logger.warning(f"OpenRouter connection failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_ATTEMPTS - 1:
+                return response
+            
+            delay = self._retry_delay(response, attempt)
+            logger.warning(f"OpenRouter returned {response.status_code}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        
+        return response
+    
+    def _backoff(self, attempt: int) -> float:
+        """
+        Full-jitter backoff for the given attempt number: uniform between 0
+        and the capped exponential delay, so concurrent clients rate limited
+        together spread their retries instead of retrying in lockstep.
+        """
+        return random.uniform(0, min(2 ** attempt, self.MAX_BACKOFF))
+    
+    def _retry_delay(self, response, attempt: int) -> float:
+        """Honor a numeric Retry-After header, otherwise back off exponentially."""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return min(max(float(retry_after), 0.0), self.MAX_BACKOFF)
+        except (TypeError, ValueError):
+            # Missing, or an HTTP-date we don't parse
+            return self._backoff(attempt)
+    
+    async def astream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from OpenRouter over the pooled async client.
+        
+        Same server-sent event handling as stream_chat(), but waiting on
+        the network never blocks a worker thread.
+        
+        Args:
+            messages: List of {"role": "user/assistant/system", "content": "..."}
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Yields:
+            Response text fragments
+            
+        Raises:
+            Same exceptions as chat()
+        """
+        self._check_api_key()
+        
+        logger.debug(f"Streaming OpenRouter response (async) for {len(messages)} messages...")
+        
+        payload = self._build_payload(messages, temperature, max_tokens)
+        payload["stream"] = True
+        
+        try:
+            async with self._get_async_client().stream(
+                "POST",
+                self._base_url,
+                content=orjson.dumps(payload),
+            ) as response:
+                self._check_status(response)
+                
+                async for line in response.aiter_lines():
+                    done, delta = self._parse_stream_line(line)
+                    if done:
+                        break
+                    if delta:
+                        yield delta
+            
+        except (LLMAuthenticationError, LLMRateLimitError, LLMResponseError):
+            raise
+        except httpx.TimeoutException:
+            logger.error("OpenRouter stream timed out")
+            raise LLMConnectionError("Request timed out after 60 seconds")
+        except httpx.TransportError as e:
+            logger.error(f"OpenRouter connection failed: {e}")
+            raise LLMConnectionError(str(e))
+        except httpx.HTTPStatusError as e:
+            logger.error(f"OpenRouter HTTP error: {e}")
+            raise LLMConnectionError(str(e))
+        except ValueError as e:
+            logger.error(f"Malformed OpenRouter stream event: {e}")
+            raise LLMResponseError(f"Malformed stream event: {e}")
+    
+    @staticmethod
+    def _parse_stream_line(line: str) -> Tuple[bool, Optional[str]]:
+        """
+        Parse one server-sent event line.
+        
+        Returns:
+            (True, None) at the [DONE] sentinel, otherwise (False, content
+            delta or None for keep-alives, blank separators and empty deltas)
+            
+        Raises:
+            ValueError: If a data event is not valid JSON
+        """
+        # Skip keep-alive comments and blank separators
+        if not line or not line.startswith("data:"):
+            return False, None
+        
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return True, None
+        
+        choices = orjson.loads(data).get("choices") or [{}]
+        return False, choices[0].get("delta", {}).get("content")
+    
+    def _get_session(self) -> requests.Session:
+        """
+        Lazily create the shared sync HTTP session (keep-alive pool).
+        
+        Auth and content-type headers are set once on the session rather
+        than rebuilt and merged on every request. Creation is locked so
+        concurrent first requests from worker threads share one pool.
+        """
+        if self._session is None:
+            with self._client_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.headers.update(self._build_headers())
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=20)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Lazily create the shared async HTTP client (connection pool,
+        default headers, HTTP/2 when available so concurrent completions
+        share one TLS connection instead of opening one each).
+        """
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                http2=self.HTTP2,
+                headers=self._build_headers(),
+                timeout=httpx.Timeout(60, connect=5),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._async_client
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections (called on application shutdown)."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _check_api_key(self) -> None:
+        """
+        Ensure an API key is configured before calling OpenRouter.
+        
+        Raises:
+            LLMAuthenticationError: If no API key is configured
+        """
+        # Edge case: No API key
+        if not self._api_key:
+            logger.error("OpenRouter API key not configured")
+            raise LLMAuthenticationError()
+    
+    def _build_headers(self) -> Dict[str, str]:
+        """Build the default request headers for OpenRouter's HTTP clients."""
+        return {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+    
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> Dict:
+        """Build the chat completion request body."""
+        payload = {
+            "model": self._model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        
+        return payload
+    
+    def _check_status(self, response) -> None:
+        """
+        Map HTTP error statuses to our exceptions.
+        
+        Raises:
+            LLMAuthenticationError: On 401/403
+            LLMRateLimitError: On 429
+        """
+        # Handle specific HTTP errors
+        if response.status_code == 401 or response.status_code == 403:
+            logger.error(f"OpenRouter authentication failed: {response.status_code}")
+            raise LLMAuthenticationError()
+        
+        if response.status_code == 429:
+            logger.warning("OpenRouter rate limit exceeded")
+            raise LLMRateLimitError()
+        
+        response.raise_for_status()
+    
+    def _parse_response(self, response) -> str:
+        """
+        Validate an HTTP response and extract the answer text.
+        
+        Works with both requests and httpx responses.
+        
+        Raises:
+            LLMAuthenticationError: On 401/403
+            LLMRateLimitError: On 429
+            LLMResponseError: If response is empty or malformed
+        """
+        self._check_status(response)
+        
+        # Parse response
+        data = orjson.loads(response.content)
+        
+        # Edge case: Empty or malformed response
+        if not data.get("choices"):
+            logger.error(f"OpenRouter returned empty choices: {data}")
+            raise LLMResponseError("No choices in response")
+        
+        answer = data["choices"][0].get("message", {}).get("content", "")
+        
+        if not answer or not answer.strip():
+            logger.error("OpenRouter returned empty content")
+            raise LLMResponseError("Empty content in response")
+        
+        logger.info(f"OpenRouter response received ({len(answer)} chars)")
+        return answer
 
 
 # Singleton accessor function
@@ -265,6 +668,10 @@ def get_llm_provider() -> OpenRouterAdapter:
     """
     Get the singleton LLM provider instance.
     
+    The lock is only taken until the instance exists; later calls return
+    after one unlocked check. ChatService keeps the returned instance, so
+    this is not called per request.
+    
     Returns:
         OpenRouterAdapter singleton instance
     """
@@ -2,8 +2,9 @@
 RAG FastAPI Application - Main Entry Point
 
 This is the main application file that:
-1. Creates the FastAPI app
-2. Registers global exception handlers
+1. Creates the FastAPI app (with start-up warm-up and shutdown hooks)
+2. Registers the global exception handlers (one table-driven handler
+   for all RAG exceptions)
 3. Mounts static files
 4. Includes all route modules
 
@@ -12,16 +13,28 @@ Exception Handling:
 - Return user-friendly JSON error responses
 - Log technical details for debugging
 """
-from fastapi import FastAPI, Request
+import hashlib
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
 from pathlib import Path
 
 from app.routes.ingest import router as ingest_router
 from app.routes.retrieve import router as retrieve_router
 from app.routes.chat import router as chat_router
 from app.routes.health import router as health_router
+from app.infrastructure.embedders import get_embedder
+from app.infrastructure.llm_providers import get_llm_provider
+from app.application import (
+    get_chat_service,
+    get_ingest_service,
+    get_retrieval_service,
+    save_response_cache,
+)
+from app.db.models import get_pool, close_pool
 from app.core.logging import logger
+from app.core.responses import OrjsonResponse
 from app.core.exceptions import (
     RAGBaseException,
     DocumentProcessingError,
@@ -33,7 +46,38 @@ from app.core.exceptions import (
     RetrievalError,
 )
 
-app = FastAPI(title="RAG FastAPI")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up heavy singletons so the first request doesn't pay for them,
+    and persist the response cache and release pooled LLM and database
+    connections on shutdown.
+    
+    The route services are the same singletons the routes receive via
+    Depends, so the model and clients are built once, here.
+    """
+    try:
+        get_embedder().embed_text("warmup")
+        get_llm_provider()
+        get_retrieval_service()
+        get_chat_service()
+        get_ingest_service()
+        logger.info("Embedder, LLM provider and services warmed up")
+    except RAGBaseException as e:
+        logger.warning(f"Warm-up failed: {e.details}")
+    try:
+        # Opens DB_POOL_MIN connections now instead of on the first query
+        get_pool()
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e}")
+    yield
+    save_response_cache()
+    await get_llm_provider().aclose()
+    close_pool()
+
+
+app = FastAPI(title="RAG FastAPI", lifespan=lifespan, default_response_class=OrjsonResponse)
 
 logger.info("Starting RAG FastAPI application")
 
@@ -42,112 +86,34 @@ logger.info("Starting RAG FastAPI application")
 # GLOBAL EXCEPTION HANDLERS
 # ============================================================
 
-@app.exception_handler(ValidationError)
-async def validation_error_handler(request: Request, exc: ValidationError):
-    """Handle input validation errors - return 400 Bad Request"""
-    logger.warning(f"Validation error: {exc.details}")
-    return JSONResponse(
-        status_code=400,
-        content={
-            "error": "validation_error",
-            "message": exc.message,
-            "status": "error"
-        }
-    )
-
+# Exception class -> (HTTP status, error code, log label, log level).
+# Looked up along the exception's MRO, so subclasses (e.g. EmptyQueryError)
+# map to their family; anything else is a 500 "internal_error".
+ERROR_RESPONSES = {
+    ValidationError: (400, "validation_error", "Validation error", "WARNING"),
+    DocumentProcessingError: (422, "document_processing_error", "Document processing error", "WARNING"),
+    ChunkingError: (422, "chunking_error", "Chunking error", "WARNING"),
+    EmbeddingError: (503, "embedding_error", "Embedding error", "ERROR"),
+    VectorStoreError: (503, "database_error", "Vector store error", "ERROR"),
+    LLMProviderError: (503, "llm_error", "LLM provider error", "ERROR"),
+    RetrievalError: (404, "retrieval_error", "Retrieval error", "WARNING"),
+}
 
-@app.exception_handler(DocumentProcessingError)
-async def document_error_handler(request: Request, exc: DocumentProcessingError):
-    """Handle document processing errors - return 422 Unprocessable Entity"""
-    logger.warning(f"Document processing error: {exc.details}")
-    return JSONResponse(
-        status_code=422,
-        content={
-            "error": "document_processing_error",
-            "message": exc.message,
-            "status": "error"
-        }
-    )
-
-
-@app.exception_handler(ChunkingError)
-async def chunking_error_handler(request: Request, exc: ChunkingError):
-    """Handle chunking errors - return 422 Unprocessable Entity"""
-    logger.warning(f"Chunking error: {exc.details}")
-    return JSONResponse(
-        status_code=422,
-        content={
-            "error": "chunking_error",
-            "message": exc.message,
-            "status": "error"
-        }
-    )
-
-
-@app.exception_handler(EmbeddingError)
-async def embedding_error_handler(request: Request, exc: EmbeddingError):
-    """Handle embedding errors - return 503 Service Unavailable"""
-    logger.error(f"Embedding error: {exc.details}")
-    return JSONResponse(
-        status_code=503,
-        content={
-            "error": "embedding_error",
-            "message": exc.message,
-            "status": "error"
-        }
-    )
-
-
-@app.exception_handler(VectorStoreError)
-async def vector_store_error_handler(request: Request, exc: VectorStoreError):
-    """Handle database errors - return 503 Service Unavailable"""
-    logger.error(f"Vector store error: {exc.details}")
-    return JSONResponse(
-        status_code=503,
-        content={
-            "error": "database_error",
-            "message": exc.message,
-            "status": "error"
-        }
-    )
-
-
-@app.exception_handler(LLMProviderError)
-async def llm_error_handler(request: Request, exc: LLMProviderError):
-    """Handle LLM API errors - return 503 Service Unavailable"""
-    logger.error(f"LLM provider error: {exc.details}")
-    return JSONResponse(
-        status_code=503,
-        content={
-            "error": "llm_error",
-            "message": exc.message,
-            "status": "error"
-        }
-    )
-
-
-@app.exception_handler(RetrievalError)
-async def retrieval_error_handler(request: Request, exc: RetrievalError):
-    """Handle retrieval errors - return 404 Not Found"""
-    logger.warning(f"Retrieval error: {exc.details}")
-    return JSONResponse(
-        status_code=404,
-        content={
-            "error": "retrieval_error",
-            "message": exc.message,
-            "status": "error"
-        }
-    )
+_INTERNAL_ERROR = (500, "internal_error", "Unhandled RAG exception", "ERROR")
 
 
 @app.exception_handler(RAGBaseException)
-async def rag_base_error_handler(request: Request, exc: RAGBaseException):
-    """Catch-all for any other RAG exceptions - return 500"""
-    logger.error(f"Unhandled RAG exception: {exc.details}")
-    return JSONResponse(
-        status_code=500,
+async def rag_error_handler(request: Request, exc: RAGBaseException):
+    """Map any RAG exception to its status code and error code via ERROR_RESPONSES"""
+    status_code, error, label, level = next(
+        (ERROR_RESPONSES[cls] for cls in type(exc).__mro__ if cls in ERROR_RESPONSES),
+        _INTERNAL_ERROR,
+    )
+    logger.log(level, f"{label}: {exc.details}")
+    return OrjsonResponse(
+        status_code=status_code,
         content={
-            "error": "internal_error",
+            "error": error,
             "message": exc.message,
             "status": "error"
         }
@@ -158,7 +124,7 @@ async def rag_base_error_handler(request: Request, exc: RAGBaseException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Catch-all for unexpected exceptions - return 500"""
     logger.error(f"Unexpected error: {type(exc).__name__}: {exc}")
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=500,
         content={
             "error": "internal_error",
@@ -178,10 +144,19 @@ BASE_DIR = Path(__file__).resolve().parent
 # Mount static files
 app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
 
+# The chat frontend is a single static page: read it once at import
+# instead of a stat + open per request, and let browsers revalidate it
+# by ETag
+INDEX_HTML = (BASE_DIR / "static" / "index.html").read_bytes()
+INDEX_ETAG = '"' + hashlib.blake2b(INDEX_HTML, digest_size=16).hexdigest() + '"'
+INDEX_HEADERS = {"ETag": INDEX_ETAG, "Cache-Control": "public, max-age=300"}
+
 # Serve the chat frontend at root
 @app.get("/", include_in_schema=False)
-async def serve_frontend():
-    return FileResponse(BASE_DIR / "static" / "index.html")
+async def serve_frontend(request: Request):
+    if request.headers.get("if-none-match") == INDEX_ETAG:
+        return Response(status_code=304, headers=INDEX_HEADERS)
+    return Response(INDEX_HTML, media_type="text/html", headers=INDEX_HEADERS)
 
 app.include_router(ingest_router, prefix="/ingest", tags=["ingest"])
 app.include_router(retrieve_router, prefix="/retrieve", tags=["retrieve"])
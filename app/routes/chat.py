@@ -3,29 +3,31 @@ Chat Route - Thin Controller using Service Layer
 
 Design Pattern: Facade (via ChatService)
 - Route is now a thin controller that delegates to ChatService
+- The shared ChatService is injected with Depends, created on first use
 - All RAG orchestration logic is in the service layer
 
 SOLID Principles:
 - SRP: Route only handles HTTP concerns
 - DIP: Depends on ChatService abstraction
 """
-from fastapi import APIRouter
-from typing import Optional
+import orjson
+from fastapi import APIRouter, Body, Depends
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional
 
-from app.application import ChatService
+from app.application import ChatService, get_chat_service
+from app.core.exceptions import RAGBaseException
 from app.core.logging import logger
 
 router = APIRouter()
 
-# Service instance (Facade Pattern)
-chat_service = ChatService()
-
 
 @router.post("/")
-def chat(
+async def chat(
     message: str,
     tag: Optional[str] = None,
-    top_k: int = 5
+    top_k: int = 5,
+    chat_service: ChatService = Depends(get_chat_service)
 ):
     """
     Process a chat message with RAG.
@@ -34,14 +36,76 @@ def chat(
     - Receives request parameters
     - Delegates to ChatService (Facade)
     - Returns response
+    
+    Uses the async pipeline, so a request waiting on the LLM holds no
+    worker thread.
     """
     logger.info(f"Chat request: {message[:50]}...")
     
     # Delegate to service (Facade Pattern)
-    result = chat_service.chat(
+    result = await chat_service.achat(
         message=message,
         tag=tag,
         top_k=top_k
     )
     
     return result
+
+
+@router.post("/batch")
+async def chat_batch(
+    messages: List[str] = Body(..., max_length=ChatService.MAX_BATCH_SIZE),
+    tag: Optional[str] = None,
+    top_k: int = 5,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Process several chat messages concurrently.
+    
+    Delegates to ChatService.achat_batch, which overlaps the LLM
+    round-trips of up to BATCH_CONCURRENCY messages at a time. Bodies
+    with more than MAX_BATCH_SIZE messages are rejected with 422.
+    """
+    logger.info(f"Batch chat request: {len(messages)} messages")
+    
+    return await chat_service.achat_batch(
+        messages=messages,
+        tag=tag,
+        top_k=top_k
+    )
+
+
+@router.post("/stream")
+async def chat_stream(
+    message: str,
+    tag: Optional[str] = None,
+    top_k: int = 5,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Process a chat message with RAG, streaming the answer as SSE.
+    
+    Each event carries a JSON-encoded text fragment; the stream ends
+    with a "[DONE]" event. Errors raised mid-stream are sent as an
+    "error" event because the HTTP status has already been sent.
+    """
+    logger.info(f"Streaming chat request: {message[:50]}...")
+    
+    # Retrieval errors raise here and go through the global handlers
+    fragments = await chat_service.astream_chat(
+        message=message,
+        tag=tag,
+        top_k=top_k
+    )
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for fragment in fragments:
+                yield f"data: {orjson.dumps(fragment).decode()}\n\n"
+        except RAGBaseException as e:
+            logger.error(f"Streaming chat failed: {e.details}")
+            yield f"event: error\ndata: {orjson.dumps(e.message).decode()}\n\n"
+            return
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
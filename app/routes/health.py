@@ -1,15 +1,62 @@
 """Health check endpoints for API status monitoring"""
+import functools
 import os
+import threading
+import time
 import requests
 from fastapi import APIRouter
 from app.core.logging import logger
-from app.db.models import get_connection
+from app.db.models import get_conn
 
 router = APIRouter()
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
+# Seconds a check result is reused, so frequent probes don't hit
+# OpenRouter's rate limit or tie up pooled DB connections
+HEALTH_CHECK_TTL = float(os.getenv("HEALTH_CHECK_TTL", "30"))
 
+# Seconds a failed check is reused; shorter, so recovery shows up quickly
+HEALTH_CHECK_FAILURE_TTL = float(os.getenv("HEALTH_CHECK_FAILURE_TTL", "5"))
+
+
+def _ttl_cached(check):
+    """
+    Reuse a check's result for HEALTH_CHECK_TTL seconds, or
+    HEALTH_CHECK_FAILURE_TTL seconds when the check failed.
+    
+    An expired result is refreshed by one probe at a time, outside the
+    lock: concurrent probes get the stale result instead of waiting on a
+    slow check. Until the first result exists, every probe runs the check.
+    """
+    lock = threading.Lock()
+    cached = {}
+    
+    @functools.wraps(check)
+    def wrapper() -> bool:
+        with lock:
+            now = time.monotonic()
+            if "value" in cached and (now < cached["expires"] or cached["refreshing"]):
+                return cached["value"]
+            cached["refreshing"] = True
+        
+        try:
+            value = check()
+        except Exception:
+            with lock:
+                cached["refreshing"] = False
+            raise
+        
+        ttl = HEALTH_CHECK_TTL if value else HEALTH_CHECK_FAILURE_TTL
+        with lock:
+            cached.update(value=value, expires=now + ttl, refreshing=False)
+        return value
+    
+    wrapper.cache_clear = cached.clear
+    return wrapper
+
+
+@_ttl_cached
 def check_api_key() -> bool:
     """Check if OpenRouter API key is valid by making a test request"""
     if not OPENROUTER_API_KEY:
@@ -34,14 +81,13 @@ def check_api_key() -> bool:
         return False
 
 
+@_ttl_cached
 def check_database() -> bool:
     """Check if database connection is working"""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT 1")
-        cur.close()
-        conn.close()
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
         logger.info("Database connection successful")
         return True
     except Exception as e:
@@ -55,6 +101,9 @@ def health_check():
     Health check endpoint that verifies:
     - OpenRouter API key is valid
     - Database connection is working
+    
+    Results are cached for HEALTH_CHECK_TTL seconds (failures for
+    HEALTH_CHECK_FAILURE_TTL).
     """
     api_status = "active" if check_api_key() else "inactive"
     db_status = "connected" if check_database() else "disconnected"
@@ -3,28 +3,28 @@ Ingest Route - Thin Controller using Service Layer
 
 Design Pattern: Facade (via IngestService)
 - Route is now a thin controller that delegates to IngestService
+- The shared IngestService is injected with Depends, created on first use
 - All business logic is encapsulated in the service layer
 
 SOLID Principles:
 - SRP: Route only handles HTTP concerns (request/response)
 - DIP: Depends on IngestService abstraction
 """
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from typing import Optional
 
-from app.application import IngestService
+from app.application import IngestService, get_ingest_service
 from app.core.logging import logger
 
 router = APIRouter()
 
-# Service instance (Facade Pattern)
-ingest_service = IngestService()
-
 
 @router.post("/")
 async def ingest_document(
     file: UploadFile = File(...),
-    tag: Optional[str] = Form(None)
+    tag: Optional[str] = Form(None),
+    ingest_service: IngestService = Depends(get_ingest_service)
 ):
     """
     Ingest a document (PDF, and future: DOCX, TXT, etc.)
@@ -33,6 +33,9 @@ async def ingest_document(
     - Validates input
     - Delegates to IngestService (Facade)
     - Returns response
+    
+    Extraction, embedding and storage run in a worker thread, so a
+    large upload does not stall every other request on the event loop.
     """
     logger.info(f"Ingest request: {file.filename}, tag: {tag}")
     
@@ -48,7 +51,8 @@ async def ingest_document(
     file_bytes = await file.read()
     
     # 3. Delegate to service (Facade Pattern)
-    result = ingest_service.ingest(
+    result = await asyncio.to_thread(
+        ingest_service.ingest,
         file_bytes=file_bytes,
         filename=file.filename,
         tag=tag
@@ -58,10 +62,13 @@ async def ingest_document(
 
 
 @router.delete("/{tag}")
-async def delete_by_tag(tag: str):
+async def delete_by_tag(
+    tag: str,
+    ingest_service: IngestService = Depends(get_ingest_service)
+):
     """Delete all documents with a specific tag."""
     logger.info(f"Delete request for tag: {tag}")
     
-    result = ingest_service.delete_by_tag(tag)
+    result = await asyncio.to_thread(ingest_service.delete_by_tag, tag)
     return result
 
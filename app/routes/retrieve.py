@@ -3,29 +3,29 @@ Retrieve Route - Thin Controller using Service Layer
 
 Design Pattern: Facade (via RetrievalService)
 - Route is now a thin controller that delegates to RetrievalService
+- The shared RetrievalService is injected with Depends, created on first use
 - All business logic is encapsulated in the service layer
 
 SOLID Principles:
 - SRP: Route only handles HTTP concerns
 - DIP: Depends on RetrievalService abstraction
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from typing import Optional
 
-from app.application import RetrievalService
+from app.application import RetrievalService, get_retrieval_service
 from app.core.logging import logger
 
 router = APIRouter()
 
-# Service instance (Facade Pattern)
-retrieval_service = RetrievalService()
-
 
 @router.post("/")
 def retrieve(
     query: str,
     tag: Optional[str] = None,
-    top_k: int = 5
+    top_k: int = 5,
+    # Shared with ChatService, so their query embedding caches are one
+    retrieval_service: RetrievalService = Depends(get_retrieval_service)
 ):
     """
     Retrieve relevant documents for a query.
@@ -1,16 +1,47 @@
 -- Enable pgvector extension
 CREATE EXTENSION IF NOT EXISTS vector;
 
--- Create document_chunks table
+-- Create document_chunks table, LIST-partitioned by tag: the app creates
+-- one partition per tag on ingest, so deleting a document drops its
+-- partition instead of deleting (and WAL-logging) every row.
+-- id used to be the PRIMARY KEY. That key was dropped for partitioning:
+-- a partitioned table's primary key must include the partition column,
+-- and tag is nullable, so id is now a plain sequence column with no
+-- uniqueness guarantee enforced by the database.
 CREATE TABLE IF NOT EXISTS document_chunks (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     content TEXT NOT NULL,
     embedding vector(384),
     tag VARCHAR(255),
     page_number INTEGER,
     chunk_id VARCHAR(255)
-);
+) PARTITION BY LIST (tag);
 
--- Create index for faster similarity search
-CREATE INDEX IF NOT EXISTS embedding_idx ON document_chunks 
-USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+-- Untagged chunks, and tags whose partition could not be created
+CREATE TABLE IF NOT EXISTS document_chunks_default
+PARTITION OF document_chunks DEFAULT;
+
+-- Create HNSW index for cosine similarity search (matches the <=> operator);
+-- indexes on the partitioned table are created on every partition.
+-- The index stores half-precision copies (pgvector 0.7+), half the size of
+-- float32, so graph traversal reads half the memory; the app re-ranks the
+-- candidates exactly against the float32 column
+DROP INDEX IF EXISTS embedding_idx;
+DROP INDEX IF EXISTS embedding_hnsw_idx;
+CREATE INDEX IF NOT EXISTS embedding_halfvec_idx ON document_chunks
+USING hnsw ((embedding::halfvec(384)) halfvec_cosine_ops) WITH (m = 16, ef_construction = 200);
+
+-- B-tree index for tag filters (tagged wildcard listing, delete by tag);
+-- trailing columns match the wildcard ORDER BY so it can skip the sort.
+-- chunk_id is a VARCHAR holding an integer, so the index is on
+-- chunk_id::int: ordering the text sorts '10' before '2'
+DROP INDEX IF EXISTS document_chunks_tag_idx;
+CREATE INDEX IF NOT EXISTS document_chunks_tag_order_idx ON document_chunks
+(tag, page_number, (chunk_id::int));
+
+-- B-tree index for untagged wildcard listing, so
+-- ORDER BY page_number, chunk_id::int is read in index order instead of
+-- sorting the whole table
+DROP INDEX IF EXISTS document_chunks_page_idx;
+CREATE INDEX IF NOT EXISTS document_chunks_page_order_idx ON document_chunks
+(page_number, (chunk_id::int));
@@ -4,6 +4,7 @@ Pytest Configuration and Fixtures
 This file contains shared fixtures used across all test files.
 Fixtures provide reusable test data and mock objects.
 """
+import numpy as np
 import pytest
 from io import BytesIO
 from unittest.mock import MagicMock, patch
@@ -13,7 +14,7 @@ from unittest.mock import MagicMock, patch
 # PDF TEST FIXTURES
 # ============================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_pdf_bytes():
     """
     Create minimal valid PDF bytes for testing.
@@ -56,31 +57,31 @@ startxref
     return pdf_content
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_bytes():
     """Empty file bytes for edge case testing."""
     return b""
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def non_pdf_bytes():
     """Non-PDF file disguised as PDF."""
     return b"This is not a PDF file content"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def large_text():
     """Large text for chunking tests."""
     return "Lorem ipsum dolor sit amet. " * 1000  # ~30,000 characters
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_text():
     """Empty text for edge case testing."""
     return ""
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def whitespace_text():
     """Whitespace-only text for edge case testing."""
     return "   \n\t\n   "
@@ -94,12 +95,29 @@ def whitespace_text():
 def mock_embedder():
     """Mock embedder that returns fake 384-dim vectors."""
     mock = MagicMock()
-    mock.embed_text.return_value = [0.1] * 384
-    mock.embed_texts.return_value = [[0.1] * 384]
+    mock.embed_text.return_value = np.full(384, 0.1, dtype=np.float32)
+    mock.embed_texts.return_value = np.full((1, 384), 0.1, dtype=np.float32)
     mock.dimension = 384
     return mock
 
 
+@pytest.fixture(scope="session")
+def make_length_embedder():
+    """
+    Factory for fake embedders whose 4-dim vectors encode the text length.
+    
+    Each call returns a fresh mock, so call counts are never shared.
+    """
+    def make():
+        mock = MagicMock()
+        mock.embed_texts.side_effect = lambda texts: np.array(
+            [[float(len(t))] * 4 for t in texts], dtype=np.float32
+        )
+        mock.dimension = 4
+        return mock
+    return make
+
+
 @pytest.fixture
 def mock_vector_store():
     """Mock vector store for testing without database."""
@@ -118,7 +136,6 @@ def mock_llm_provider():
     mock = MagicMock()
     mock.generate.return_value = "This is a mock LLM response."
     mock.chat.return_value = "This is a mock chat response."
-    mock.generate_with_context.return_value = "This is a mock context response."
     mock.model_name = "mock-model"
     return mock
 
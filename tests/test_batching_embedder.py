@@ -0,0 +1,126 @@
+"""
+Batching Embedder Tests
+
+Tests for:
+- Concurrent embed_text calls share one forward pass
+- Results are routed back to the right caller
+- Errors reach every waiting caller
+- Empty input handling
+"""
+import threading
+
+import pytest
+
+from app.core.exceptions import EmbeddingError, EmbeddingModelError
+from app.infrastructure.embedders.batching_embedder import BatchingEmbedder
+
+
+def _embed_concurrently(embedder, texts):
+    """Call embed_text from one thread per text; return results by text."""
+    results = {}
+    errors = []
+    barrier = threading.Barrier(len(texts))
+    
+    def call(text):
+        barrier.wait()
+        try:
+            results[text] = embedder.embed_text(text)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=call, args=(t,)) for t in texts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    return results, errors
+
+
+class TestBatchingEmbedder:
+    """Test suite for the micro-batching embedder."""
+    
+    # ========================================
+    # HAPPY PATH TESTS
+    # ========================================
+    
+    def test_single_call_returns_vector(self, make_length_embedder):
+        """
+        Happy Path: A lone request is embedded after the wait window
+        """
+        inner = make_length_embedder()
+        embedder = BatchingEmbedder(inner, max_wait_ms=1)
+        
+        assert embedder.embed_text("abc").tolist() == [3.0] * 4
+        inner.embed_texts.assert_called_once_with(["abc"])
+    
+    def test_concurrent_calls_are_coalesced(self, make_length_embedder):
+        """
+        Happy Path: Simultaneous requests share forward passes and each
+        caller gets its own vector
+        """
+        inner = make_length_embedder()
+        embedder = BatchingEmbedder(inner, max_wait_ms=200)
+        texts = ["a" * n for n in range(1, 9)]
+        
+        results, errors = _embed_concurrently(embedder, texts)
+        
+        assert not errors
+        assert all(results[t].tolist() == [float(len(t))] * 4 for t in texts)
+        assert inner.embed_texts.call_count < len(texts)
+    
+    def test_embed_texts_bypasses_queue(self, make_length_embedder):
+        """
+        Happy Path: Batch calls go straight to the wrapped embedder
+        """
+        inner = make_length_embedder()
+        embedder = BatchingEmbedder(inner)
+        
+        assert embedder.embed_texts(["ab", "c"]).tolist() == [[2.0] * 4, [1.0] * 4]
+        assert embedder.dimension == 4
+    
+    # ========================================
+    # EDGE CASE TESTS
+    # ========================================
+    
+    def test_empty_text_raises_error(self, make_length_embedder):
+        """
+        Edge Case: Whitespace-only text
+        Expected: EmbeddingError without reaching the model
+        """
+        inner = make_length_embedder()
+        embedder = BatchingEmbedder(inner)
+        
+        with pytest.raises(EmbeddingError):
+            embedder.embed_text("   ")
+        inner.embed_texts.assert_not_called()
+    
+    def test_model_error_reaches_every_caller(self, make_length_embedder):
+        """
+        Edge Case: The batched forward pass fails
+        Expected: Each waiting caller sees the error
+        """
+        inner = make_length_embedder()
+        inner.embed_texts.side_effect = EmbeddingModelError("boom")
+        embedder = BatchingEmbedder(inner, max_wait_ms=100)
+        
+        results, errors = _embed_concurrently(embedder, ["x", "yy", "zzz"])
+        
+        assert not results
+        assert len(errors) == 3
+        assert all(isinstance(e, EmbeddingModelError) for e in errors)
+    
+    # ========================================
+    # BOUNDARY TESTS
+    # ========================================
+    
+    def test_batch_never_exceeds_max_batch(self, make_length_embedder):
+        """
+        Boundary: No forward pass receives more than max_batch texts
+        """
+        inner = make_length_embedder()
+        embedder = BatchingEmbedder(inner, max_batch=3, max_wait_ms=100)
+        
+        results, errors = _embed_concurrently(embedder, ["a" * n for n in range(1, 8)])
+        
+        assert not errors and len(results) == 7
+        assert max(len(c[0][0]) for c in inner.embed_texts.call_args_list) <= 3
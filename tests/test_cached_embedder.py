@@ -0,0 +1,115 @@
+"""
+Cached Embedder Tests
+
+Tests for:
+- Only cache misses reach the wrapped embedder
+- Cache survives reopening the same file
+- Namespaces isolate different models
+- Oldest vectors evicted past max_entries
+- Empty input handling
+"""
+import numpy as np
+import pytest
+
+from app.core.exceptions import EmbeddingError
+from app.infrastructure.embedders.cached_embedder import CachedEmbedder
+
+
+class TestCachedEmbedder:
+    """Test suite for the persistent embedding cache."""
+    
+    # ========================================
+    # HAPPY PATH TESTS
+    # ========================================
+    
+    def test_repeat_texts_skip_model(self, make_length_embedder, tmp_path):
+        """
+        Happy Path: Re-embedding the same texts
+        Expected: Wrapped embedder only sees new texts
+        """
+        inner = make_length_embedder()
+        embedder = CachedEmbedder(inner, str(tmp_path / "cache.sqlite3"), namespace="m")
+        
+        first = embedder.embed_texts(["a", "bb"])
+        second = embedder.embed_texts(["bb", "ccc", "a"])
+        
+        assert first.tolist() == [[1.0] * 4, [2.0] * 4]
+        assert second.tolist() == [[2.0] * 4, [3.0] * 4, [1.0] * 4]
+        assert second.dtype == np.float32
+        assert inner.embed_texts.call_args_list[1].args[0] == ["ccc"]
+    
+    def test_cache_persists_across_instances(self, make_length_embedder, tmp_path):
+        """
+        Happy Path: Re-ingest after restart
+        Expected: Vectors come from disk, model not called
+        """
+        path = str(tmp_path / "cache.sqlite3")
+        CachedEmbedder(make_length_embedder(), path, namespace="m").embed_texts(["hello"])
+        
+        inner = make_length_embedder()
+        result = CachedEmbedder(inner, path, namespace="m").embed_texts(["hello"])
+        
+        assert result.tolist() == [[5.0] * 4]
+        inner.embed_texts.assert_not_called()
+    
+    def test_namespaces_do_not_share_vectors(self, make_length_embedder, tmp_path):
+        """
+        Happy Path: Different model variants on one cache file
+        Expected: Each namespace embeds independently
+        """
+        path = str(tmp_path / "cache.sqlite3")
+        CachedEmbedder(make_length_embedder(), path, namespace="a").embed_texts(["hello"])
+        
+        inner = make_length_embedder()
+        CachedEmbedder(inner, path, namespace="b").embed_texts(["hello"])
+        
+        inner.embed_texts.assert_called_once_with(["hello"])
+    
+    # ========================================
+    # EDGE CASE TESTS
+    # ========================================
+    
+    def test_duplicates_embedded_once(self, make_length_embedder, tmp_path):
+        """
+        Edge Case: Same chunk repeated in one batch
+        Expected: Model called once per distinct text
+        """
+        inner = make_length_embedder()
+        embedder = CachedEmbedder(inner, str(tmp_path / "cache.sqlite3"))
+        
+        result = embedder.embed_texts(["x", "x", "", "x"])
+        
+        assert len(result) == 3
+        inner.embed_texts.assert_called_once_with(["x"])
+    
+    def test_empty_list_raises_error(self, make_length_embedder, tmp_path):
+        """
+        Edge Case: No non-empty texts
+        Expected: EmbeddingError
+        """
+        embedder = CachedEmbedder(make_length_embedder(), str(tmp_path / "cache.sqlite3"))
+        
+        with pytest.raises(EmbeddingError):
+            embedder.embed_texts(["", "   "])
+    
+    # ========================================
+    # BOUNDARY TESTS
+    # ========================================
+    
+    def test_oldest_vectors_evicted_past_max_entries(self, make_length_embedder, tmp_path):
+        """
+        Boundary: One more distinct text than max_entries
+        Expected: The first-written vector is evicted, the rest still hit
+        """
+        path = str(tmp_path / "cache.sqlite3")
+        embedder = CachedEmbedder(make_length_embedder(), path, max_entries=2)
+        for text in ("a", "bb", "ccc"):
+            embedder.embed_texts([text])
+        
+        inner = make_length_embedder()
+        reopened = CachedEmbedder(inner, path, max_entries=2)
+        reopened.embed_texts(["bb", "ccc"])
+        inner.embed_texts.assert_not_called()
+        
+        reopened.embed_texts(["a"])
+        inner.embed_texts.assert_called_once_with(["a"])
@@ -0,0 +1,141 @@
+"""
+Chat Service Tests
+
+Tests for:
+- Async chat pipeline
+- Concurrent batch chat
+- Semantic response cache
+- Async streaming
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+from app.application.chat_service import ChatService
+from app.application.retrieval_service import RetrievalService
+from app.application.response_cache import SemanticResponseCache
+
+
+class TestChatService:
+    """Test suite for the chat facade."""
+    
+    def _make_service(self, mock_llm_provider, mock_embedder, mock_vector_store):
+        """Build a service wired entirely to mocks."""
+        retrieval = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        return ChatService(llm_provider=mock_llm_provider, retrieval_service=retrieval)
+    
+    def test_achat_batch_preserves_order(
+        self, mock_llm_provider, mock_embedder, mock_vector_store
+    ):
+        """
+        Happy Path: Batch results come back in request order
+        """
+        mock_llm_provider.achat = AsyncMock(side_effect=lambda messages: messages[-1]["content"])
+        service = self._make_service(mock_llm_provider, mock_embedder, mock_vector_store)
+        
+        results = asyncio.run(service.achat_batch(["first question", "second question"]))
+        
+        assert [r["message"] for r in results] == ["first question", "second question"]
+        assert "first question" in results[0]["answer"]
+        assert mock_llm_provider.achat.await_count == 2
+    
+    def test_achat_batch_bounds_concurrency(
+        self, mock_llm_provider, mock_embedder, mock_vector_store, monkeypatch
+    ):
+        """
+        Boundary: No more than BATCH_CONCURRENCY messages reach the LLM at once
+        """
+        monkeypatch.setattr(ChatService, "BATCH_CONCURRENCY", 2)
+        in_flight, peak = 0, 0
+        
+        async def achat(messages):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "answer"
+        
+        mock_llm_provider.achat = achat
+        service = self._make_service(mock_llm_provider, mock_embedder, mock_vector_store)
+        
+        results = asyncio.run(service.achat_batch([f"question {i}" for i in range(5)]))
+        
+        assert len(results) == 5
+        assert peak == 2
+    
+    def test_repeated_question_served_from_cache(
+        self, mock_llm_provider, mock_embedder, mock_vector_store
+    ):
+        """
+        Happy Path: A repeated question over the same context skips the LLM
+        """
+        retrieval = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        service = ChatService(
+            llm_provider=mock_llm_provider,
+            retrieval_service=retrieval,
+            response_cache=SemanticResponseCache(mock_embedder),
+        )
+        
+        first = service.chat("What is RAG?", tag="test")
+        second = service.chat("What is RAG?", tag="test")
+        
+        assert first["answer"] == second["answer"] == "This is a mock chat response."
+        assert mock_llm_provider.chat.call_count == 1
+        # Retrieval and the cache lookup share one embedding of the question
+        assert mock_embedder.embed_text.call_count == 1
+    
+    def test_achat_repeated_question_served_from_cache(
+        self, mock_llm_provider, mock_embedder, mock_vector_store
+    ):
+        """
+        Happy Path: The async pipeline probes the cache in the same worker
+        hop as retrieval and skips the LLM on a repeat
+        """
+        mock_llm_provider.achat = AsyncMock(return_value="async answer")
+        retrieval = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        service = ChatService(
+            llm_provider=mock_llm_provider,
+            retrieval_service=retrieval,
+            response_cache=SemanticResponseCache(mock_embedder),
+        )
+        
+        first = asyncio.run(service.achat("What is RAG?", tag="test"))
+        second = asyncio.run(service.achat("What is RAG?", tag="test"))
+        
+        assert first["answer"] == second["answer"] == "async answer"
+        assert mock_llm_provider.achat.await_count == 1
+    
+    def test_response_cache_disabled_by_default(
+        self, mock_llm_provider, mock_embedder, mock_vector_store, monkeypatch
+    ):
+        """
+        Edge Case: Without RESPONSE_CACHE_SIZE every question reaches the LLM
+        """
+        monkeypatch.delenv("RESPONSE_CACHE_SIZE", raising=False)
+        service = self._make_service(mock_llm_provider, mock_embedder, mock_vector_store)
+        
+        service.chat("What is RAG?", tag="test")
+        service.chat("What is RAG?", tag="test")
+        
+        assert mock_llm_provider.chat.call_count == 2
+    
+    def test_astream_chat_streams_provider_fragments(
+        self, mock_llm_provider, mock_embedder, mock_vector_store
+    ):
+        """
+        Happy Path: Retrieval is awaited first, then provider fragments
+        are streamed through unchanged
+        """
+        async def fake_stream(messages):
+            for fragment in ("Hel", "lo"):
+                yield fragment
+        
+        mock_llm_provider.astream_chat = fake_stream
+        service = self._make_service(mock_llm_provider, mock_embedder, mock_vector_store)
+        
+        async def collect():
+            fragments = await service.astream_chat("What is RAG?", tag="test")
+            mock_vector_store.search.assert_called_once()
+            return [f async for f in fragments]
+        
+        assert asyncio.run(collect()) == ["Hel", "lo"]
@@ -92,6 +92,30 @@ class TestFixedSizeChunker:
         
         assert len(chunks) == 2
     
+    def test_text_fitting_one_chunk(self):
+        """
+        Boundary: Text no longer than the window stride
+        Expected: Single chunk holding the cleaned text itself
+        """
+        chunker = FixedSizeChunker(chunk_size=20, overlap=5)
+        
+        chunks = chunker.chunk("x" * 15)
+        
+        assert len(chunks) == 1
+        assert chunks[0]["text"] == "x" * 15
+        assert chunks[0]["chunk_id"] == 0
+    
+    def test_text_just_over_stride_keeps_tail_chunk(self):
+        """
+        Boundary: Text longer than the stride but within chunk_size
+        Expected: Same windows as the general path (overlapping tail chunk)
+        """
+        chunker = FixedSizeChunker(chunk_size=20, overlap=5)
+        
+        chunks = chunker.chunk("x" * 20)
+        
+        assert [c["text"] for c in chunks] == ["x" * 20, "x" * 5]
+    
     def test_single_character(self):
         """
         Boundary: Single non-whitespace character
@@ -123,6 +147,27 @@ class TestFixedSizeChunker:
         for chunk in chunks:
             assert len(chunk["text"]) > 0
     
+    def test_whitespace_is_collapsed(self):
+        """
+        Happy Path: Runs of mixed whitespace become single spaces
+        """
+        chunks = self.chunker.chunk("  Hello,\t\n  world\r\n\u00a0again  ")
+        
+        assert chunks[0]["text"] == "Hello, world again"
+    
+    def test_chunk_arrays_match_chunk(self, large_text):
+        """
+        Happy Path: Column-wise output carries the same chunks as chunk()
+        """
+        metadata = {"page": 3}
+        
+        columns = self.chunker.chunk_arrays(large_text, metadata=metadata)
+        chunks = self.chunker.chunk(large_text, metadata=metadata)
+        
+        assert columns["texts"] == [c["text"] for c in chunks]
+        assert columns["chunk_ids"] == [c["chunk_id"] for c in chunks]
+        assert columns["metadata"] is metadata
+    
     def test_metadata_preserved(self):
         """
         Happy Path: Metadata is attached to each chunk
@@ -191,3 +236,31 @@ class TestFixedSizeChunker:
     def test_chunk_overlap_property(self):
         """Test chunk_overlap property returns correct value."""
         assert self.chunker.chunk_overlap == 20
+    
+    def test_overlap_not_smaller_than_size_raises_error(self):
+        """
+        Edge Case: overlap >= chunk_size would never advance the window
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            FixedSizeChunker(chunk_size=10, overlap=10)
+    
+    def test_single_character_chunks_rejected(self):
+        """
+        Edge Case: chunk_size=1 could emit a lone-space chunk
+        Expected: ValueError
+        """
+        with pytest.raises(ValueError):
+            FixedSizeChunker(chunk_size=1, overlap=0)
+    
+    def test_chunks_are_never_blank(self):
+        """
+        Boundary: Windows that start on a space still contain text, so
+        ingestion can append chunk columns without filtering
+        """
+        chunker = FixedSizeChunker(chunk_size=2, overlap=0)
+        
+        texts = chunker.chunk_arrays("a b  c \n d")["texts"]
+        
+        assert texts == ["a ", "b ", "c ", "d"]
+        assert all(t.strip() for t in texts)
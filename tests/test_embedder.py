@@ -8,193 +8,366 @@ Tests for:
 - Batch embedding with empty list
 - Normal embedding behavior
 """
+import numpy as np
 import pytest
+import torch
 from unittest.mock import patch, MagicMock
+from sentence_transformers import SentenceTransformer
 
 from app.core.exceptions import EmbeddingError, EmbeddingModelError
+from app.infrastructure.embedders import minilm_embedder as minilm_module
+from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
+
+
+# Fake model outputs, built once (float32, like sentence-transformers)
+_FAKE_EMBEDDING = np.full(384, 0.1, dtype=np.float32)
+_FAKE_BATCH = np.full((2, 384), 0.1, dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def minilm_embedder():
+    """
+    One MiniLMEmbedder over a mocked model, shared by the tests that only
+    check input validation and output shapes.
+    
+    encode() returns one vector per input text. Tests that inspect model
+    calls or loading options build their own embedder.
+    """
+    def fake_encode(texts, **kwargs):
+        if isinstance(texts, str):
+            return _FAKE_EMBEDDING
+        return np.tile(_FAKE_EMBEDDING, (len(texts), 1))
+    
+    with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
+        mock_model = MagicMock(spec=SentenceTransformer)
+        mock_model.encode.side_effect = fake_encode
+        mock_model.tokenizer.side_effect = lambda texts, **kw: {"length": [3] * len(texts)}
+        mock_st.return_value = mock_model
+        
+        yield MiniLMEmbedder()
 
 
 class TestMiniLMEmbedder:
     """Test suite for MiniLM embedder."""
     
+    @pytest.fixture(autouse=True)
+    def _reset_singleton(self, monkeypatch):
+        """Start each test without a shared get_embedder() instance."""
+        monkeypatch.setattr(minilm_module, "_embedder_instance", None)
+    
     # ========================================
     # EDGE CASE TESTS
     # ========================================
     
-    def test_empty_string_raises_error(self):
+    @pytest.mark.parametrize("text", ["", "   \n\t  ", None], ids=["empty", "whitespace", "none"])
+    def test_invalid_text_raises_error(self, minilm_embedder, text):
         """
-        Edge Case: Empty string
+        Edge Case: Empty, whitespace-only or None text
         Expected: EmbeddingError
         """
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'):
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
-            
-            # Reset singleton for testing
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
-            
-            embedder = MiniLMEmbedder()
-            
-            with pytest.raises(EmbeddingError):
-                embedder.embed_text("")
+        with pytest.raises(EmbeddingError):
+            minilm_embedder.embed_text(text)
     
-    def test_whitespace_only_raises_error(self):
+    @pytest.mark.parametrize("texts", [[], ["", "   ", "\n"]], ids=["empty_list", "all_blank"])
+    def test_invalid_batch_raises_error(self, minilm_embedder, texts):
         """
-        Edge Case: Whitespace-only string
+        Edge Case: Empty list, or a list with only empty strings
         Expected: EmbeddingError
         """
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'):
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
-            
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
-            
-            embedder = MiniLMEmbedder()
-            
-            with pytest.raises(EmbeddingError):
-                embedder.embed_text("   \n\t  ")
+        with pytest.raises(EmbeddingError):
+            minilm_embedder.embed_texts(texts)
     
-    def test_none_input_raises_error(self):
+    def test_model_loading_failure(self):
         """
-        Edge Case: None input
-        Expected: EmbeddingError
+        Edge Case: Model fails to load
+        Expected: EmbeddingModelError
         """
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'):
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
+            mock_st.side_effect = Exception("Model download failed")
             
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
+            with pytest.raises(EmbeddingModelError):
+                MiniLMEmbedder()
+    
+    # ========================================
+    # HAPPY PATH TESTS (with mocked model)
+    # ========================================
+    
+    def test_valid_text_returns_embedding(self, minilm_embedder):
+        """
+        Happy Path: Valid text returns 384-dim embedding
+        """
+        embedding = minilm_embedder.embed_text("Hello world")
+        
+        assert embedding.shape == (384,)
+        assert embedding.dtype == np.float32
+    
+    def test_encode_normalizes_on_device(self):
+        """
+        Happy Path: Single and batch paths ask encode() for unit-norm
+        numpy output instead of normalizing afterwards
+        """
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
+            mock_model = MagicMock(spec=SentenceTransformer)
+            mock_model.encode.return_value = np.array([[0.6, 0.8]])
+            mock_model.tokenizer.return_value = {"length": [3]}
+            mock_st.return_value = mock_model
             
             embedder = MiniLMEmbedder()
+            mock_model.encode.reset_mock()
+            embedder.embed_text("Hello")
+            embedder.embed_texts(["Hello"])
             
-            with pytest.raises(EmbeddingError):
-                embedder.embed_text(None)
+            for call in mock_model.encode.call_args_list:
+                assert call.kwargs["normalize_embeddings"] is True
+                assert call.kwargs["convert_to_numpy"] is True
     
-    def test_empty_list_raises_error(self):
+    def test_batch_embedding_returns_list(self, minilm_embedder):
         """
-        Edge Case: Empty list for batch embedding
-        Expected: EmbeddingError
+        Happy Path: Batch embedding returns list of vectors
         """
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'):
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
-            
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
+        embeddings = minilm_embedder.embed_texts(["Hello", "World"])
+        
+        assert embeddings.shape == (2, 384)
+        assert embeddings.dtype == np.float32
+    
+    def test_batch_embedding_buckets_by_length(self, monkeypatch):
+        """
+        Happy Path: Mixed-length texts are encoded per length bucket and
+        returned in the original order
+        """
+        monkeypatch.delenv("EMBEDDING_BATCH_SIZE", raising=False)
+        lengths = {"short": 5, "long": 200, "mid": 40}
+        
+        def fake_encode(batch, **kwargs):
+            return np.array([[float(lengths[t])] * 384 for t in batch])
+        
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
+            mock_model = MagicMock(spec=SentenceTransformer)
+            mock_model.tokenizer.side_effect = lambda texts, **kw: {
+                "length": [lengths[t] for t in texts]
+            }
+            mock_st.return_value = mock_model
             
             embedder = MiniLMEmbedder()
-            
-            with pytest.raises(EmbeddingError):
-                embedder.embed_texts([])
+            mock_model.encode.reset_mock()
+            mock_model.encode.side_effect = fake_encode
+            embeddings = embedder.embed_texts(["long", "short", "mid", "short"])
+            
+            assert [e[0] for e in embeddings] == [200.0, 5.0, 40.0, 5.0]
+            assert mock_model.encode.call_count == 3
+            batch_sizes = {
+                tuple(c.args[0]): c.kwargs["batch_size"]
+                for c in mock_model.encode.call_args_list
+            }
+            assert batch_sizes[("short", "short")] == MiniLMEmbedder.CPU_BATCH_SIZE * 8
+            assert batch_sizes[("long",)] == MiniLMEmbedder.CPU_BATCH_SIZE
     
-    def test_list_of_empty_strings_raises_error(self):
+    def test_single_text_batch_skips_length_bucketing(self):
         """
-        Edge Case: List with only empty strings
-        Expected: EmbeddingError
+        Edge Case: One-text batch
+        Expected: Encoded directly, without tokenizing for bucket lengths
         """
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'):
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
-            
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
+            mock_model = MagicMock(spec=SentenceTransformer)
+            mock_model.encode.return_value = _FAKE_BATCH[:1]
+            mock_st.return_value = mock_model
             
             embedder = MiniLMEmbedder()
+            embeddings = embedder.embed_texts(["Hello"])
             
-            with pytest.raises(EmbeddingError):
-                embedder.embed_texts(["", "   ", "\n"])
+            assert embeddings.shape == (1, 384)
+            mock_model.tokenizer.assert_not_called()
     
-    def test_model_loading_failure(self):
+    def test_dimension_property(self, minilm_embedder):
         """
-        Edge Case: Model fails to load
-        Expected: EmbeddingModelError
+        Test dimension property returns 384
+        """
+        assert minilm_embedder.dimension == 384
+    
+    # ========================================
+    # SINGLETON TESTS
+    # ========================================
+    
+    def test_singleton_returns_same_instance(self):
+        """
+        Test that get_embedder() loads the model once and shares it
         """
         with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
-            mock_st.side_effect = Exception("Model download failed")
-            
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
+            embedder1 = minilm_module.get_embedder()
+            embedder2 = minilm_module.get_embedder()
             
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
-            
-            with pytest.raises(EmbeddingModelError):
-                MiniLMEmbedder()
+            assert embedder1 is embedder2
+            assert mock_st.call_count == 1
     
     # ========================================
-    # HAPPY PATH TESTS (with mocked model)
+    # QUANTIZATION TESTS
     # ========================================
     
-    def test_valid_text_returns_embedding(self):
+    def test_int8_quantization_when_enabled(self, monkeypatch):
         """
-        Happy Path: Valid text returns 384-dim embedding
+        Test that EMBEDDING_INT8=true quantizes the model on CPU
         """
-        import numpy as np
+        monkeypatch.setenv("EMBEDDING_INT8", "true")
         
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
-            mock_model = MagicMock()
-            mock_model.encode.return_value = np.array([0.1] * 384)
-            mock_st.return_value = mock_model
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'), \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.cuda.is_available', return_value=False), \
+             patch('app.infrastructure.embedders.minilm_embedder.quantize_dynamic') as mock_quantize:
+            embedder = MiniLMEmbedder()
             
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
+            mock_quantize.assert_called_once()
+            assert embedder._model is mock_quantize.return_value
+    
+    def test_onnx_backend_when_selected(self, monkeypatch):
+        """
+        Test that EMBEDDING_BACKEND=onnx loads the quantized ONNX graph
+        """
+        monkeypatch.setenv("EMBEDDING_BACKEND", "onnx")
+        monkeypatch.delenv("EMBEDDING_ONNX_FILE", raising=False)
+        
+        mock_ort = MagicMock()
+        
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st, \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.cuda.is_available', return_value=False), \
+             patch('app.infrastructure.embedders.minilm_embedder.quantize_dynamic') as mock_quantize, \
+             patch.dict('sys.modules', {'onnxruntime': mock_ort}), \
+             patch('os.cpu_count', return_value=8):
+            embedder = MiniLMEmbedder()
             
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
+            kwargs = mock_st.call_args.kwargs
+            assert kwargs["backend"] == "onnx"
+            assert kwargs["model_kwargs"]["file_name"] == MiniLMEmbedder.ONNX_FILE
+            assert kwargs["model_kwargs"]["provider"] == "CPUExecutionProvider"
+            session_options = kwargs["model_kwargs"]["session_options"]
+            assert session_options is mock_ort.SessionOptions.return_value
+            assert session_options.intra_op_num_threads == 4
+            mock_quantize.assert_not_called()
+            assert embedder.model_name == "all-MiniLM-L6-v2-model_qint8_avx512_vnni"
+    
+    def test_fp16_on_cuda(self):
+        """
+        Test that the model is loaded directly in float16 on GPU
+        """
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st, \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.cuda.is_available', return_value=True):
+            embedder = MiniLMEmbedder()
             
+            kwargs = mock_st.call_args.kwargs
+            assert kwargs["device"] == "cuda"
+            assert kwargs["model_kwargs"] == {"torch_dtype": torch.float16}
+            assert embedder.model_name.endswith("-fp16")
+    
+    def test_bf16_on_supported_cpu_when_enabled(self, monkeypatch):
+        """
+        Test that EMBEDDING_BF16=true loads bfloat16 weights on BF16 CPUs
+        """
+        monkeypatch.setenv("EMBEDDING_BF16", "true")
+        monkeypatch.delenv("EMBEDDING_BACKEND", raising=False)
+        
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st, \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.cuda.is_available', return_value=False), \
+             patch('app.infrastructure.embedders.minilm_embedder.MiniLMEmbedder._cpu_supports_bf16', return_value=True):
             embedder = MiniLMEmbedder()
-            embedding = embedder.embed_text("Hello world")
             
-            assert len(embedding) == 384
-            assert isinstance(embedding, list)
+            assert mock_st.call_args.kwargs["model_kwargs"] == {"torch_dtype": torch.bfloat16}
+            assert embedder.model_name.endswith("-bf16")
     
-    def test_batch_embedding_returns_list(self):
+    def test_tokenizer_warmed_and_capped_on_load(self, monkeypatch):
         """
-        Happy Path: Batch embedding returns list of vectors
+        Happy Path: Loading runs a warm-up encode and applies
+        EMBEDDING_MAX_SEQ_LENGTH
         """
-        import numpy as np
+        monkeypatch.setenv("EMBEDDING_MAX_SEQ_LENGTH", "128")
         
         with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
-            mock_model = MagicMock()
-            mock_model.encode.return_value = np.array([[0.1] * 384, [0.2] * 384])
+            mock_model = MagicMock(spec=SentenceTransformer)
+            mock_model.tokenizer.is_fast = True
             mock_st.return_value = mock_model
             
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
-            
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
-            
             embedder = MiniLMEmbedder()
-            embeddings = embedder.embed_texts(["Hello", "World"])
             
-            assert len(embeddings) == 2
-            assert len(embeddings[0]) == 384
+            assert mock_model.max_seq_length == 128
+            # Truncated vectors must not share cache entries with full-length ones
+            assert embedder.model_name.endswith("-seq128")
+            assert mock_model.encode.call_args.args[0] == ["warmup"]
     
-    def test_dimension_property(self):
+    def test_slow_tokenizer_replaced_with_fast(self):
         """
-        Test dimension property returns 384
+        Edge Case: A slow (pure-Python) tokenizer is swapped for the fast one
         """
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'):
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st, \
+             patch('app.infrastructure.embedders.minilm_embedder.AutoTokenizer') as mock_auto:
+            mock_model = MagicMock(spec=SentenceTransformer)
+            mock_model.tokenizer.is_fast = False
+            mock_st.return_value = mock_model
             
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
+            MiniLMEmbedder()
             
-            embedder = MiniLMEmbedder()
+            assert mock_auto.from_pretrained.call_args.kwargs["use_fast"] is True
+            assert mock_model.tokenizer is mock_auto.from_pretrained.return_value
+    
+    def test_batch_size_configurable_via_env(self, monkeypatch):
+        """
+        Happy Path: EMBEDDING_BATCH_SIZE overrides the device default
+        """
+        monkeypatch.setenv("EMBEDDING_BATCH_SIZE", "8")
+        
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st:
+            mock_model = MagicMock(spec=SentenceTransformer)
+            mock_model.tokenizer.return_value = {"length": [200, 200]}
+            mock_model.encode.return_value = _FAKE_BATCH
+            mock_st.return_value = mock_model
+            
+            MiniLMEmbedder().embed_texts(["long text", "other long text"])
             
-            assert embedder.dimension == 384
+            assert mock_model.encode.call_args.kwargs["batch_size"] == 8
     
-    # ========================================
-    # SINGLETON TESTS
-    # ========================================
+    def test_cpu_threads_configurable_via_env(self, monkeypatch):
+        """
+        Happy Path: EMBEDDING_THREADS overrides the half-the-cores default
+        """
+        monkeypatch.setenv("EMBEDDING_THREADS", "3")
+        
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'), \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.cuda.is_available', return_value=False), \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.set_num_threads') as mock_set_threads, \
+             patch('os.cpu_count', return_value=8):
+            MiniLMEmbedder()
+            
+            mock_set_threads.assert_called_once_with(3)
     
-    def test_singleton_returns_same_instance(self):
+    def test_compile_on_cuda_when_enabled(self, monkeypatch):
         """
-        Test that singleton pattern works correctly
+        Happy Path: EMBEDDING_COMPILE=true compiles the transformer on GPU
+        and warms every length bucket
         """
-        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'):
-            from app.infrastructure.embedders.minilm_embedder import MiniLMEmbedder
+        monkeypatch.setenv("EMBEDDING_COMPILE", "true")
+        
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer') as mock_st, \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.cuda.is_available', return_value=True), \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.compile') as mock_compile:
+            mock_model = MagicMock(spec=SentenceTransformer)
+            transformer = MagicMock()
+            mock_model.__getitem__.return_value = transformer
+            original = transformer.auto_model
+            mock_st.return_value = mock_model
             
-            MiniLMEmbedder._instance = None
-            MiniLMEmbedder._initialized = False
+            embedder = MiniLMEmbedder()
             
-            embedder1 = MiniLMEmbedder()
-            embedder2 = MiniLMEmbedder()
+            mock_compile.assert_called_once_with(original, mode="reduce-overhead")
+            assert transformer.auto_model is mock_compile.return_value
+            # warm-up encode + one per bucket
+            assert mock_model.encode.call_count == 1 + len(MiniLMEmbedder.LENGTH_BUCKETS)
+            assert embedder.model_name.endswith("-fp16")
+    
+    def test_no_compile_on_cpu(self, monkeypatch):
+        """
+        Edge Case: EMBEDDING_COMPILE is ignored without a GPU
+        """
+        monkeypatch.setenv("EMBEDDING_COMPILE", "true")
+        
+        with patch('app.infrastructure.embedders.minilm_embedder.SentenceTransformer'), \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.cuda.is_available', return_value=False), \
+             patch('app.infrastructure.embedders.minilm_embedder.torch.compile') as mock_compile:
+            MiniLMEmbedder()
             
-            assert embedder1 is embedder2
+            mock_compile.assert_not_called()
@@ -0,0 +1,202 @@
+"""
+Ingest Service Tests
+
+Tests for:
+- Batched embedding of all chunks in a document
+- Record construction passed to the vector store
+- A failure part-way through leaves no rows behind
+- Concurrent ingests never run PDFium calls at the same time
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.application.ingest_service import IngestService
+from app.core.exceptions import EmbeddingError
+from app.infrastructure.document_loaders.pdf_loader import PDFLoader
+from app.infrastructure.chunkers.fixed_size_chunker import FixedSizeChunker
+from app.infrastructure.persistence.postgres_vector_store import PostgresVectorStore
+
+
+class TestIngestService:
+    """Test suite for the ingestion facade."""
+    
+    def _make_service(self, mock_embedder, mock_vector_store):
+        """Build a service with mocked embedder/store and a small chunker."""
+        return IngestService(
+            embedder=mock_embedder,
+            vector_store=mock_vector_store,
+            chunker=FixedSizeChunker(chunk_size=10, overlap=0)
+        )
+    
+    @staticmethod
+    def _collect_batches(mock_vector_store):
+        """Make add_batches consume its iterable; return the list it fills."""
+        batches = []
+        
+        def add_batches(iterable):
+            batches.extend(iterable)
+            return sum(len(batch) for batch in batches)
+        
+        mock_vector_store.add_batches.side_effect = add_batches
+        return batches
+    
+    def test_embeds_all_chunks_in_one_batch(
+        self, mock_embedder, mock_vector_store, monkeypatch
+    ):
+        """
+        Happy Path: Chunks from every page are embedded with one embed_texts call
+        """
+        pages = [
+            {"page": 1, "text": "a" * 25},
+            {"page": 2, "text": "b" * 15},
+        ]
+        loader = MagicMock()
+        loader.iter_pages.return_value = pages
+        monkeypatch.setattr(
+            "app.application.ingest_service.DocumentLoaderFactory.get_loader",
+            lambda filename: loader
+        )
+        mock_embedder.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        
+        batches = self._collect_batches(mock_vector_store)
+        service = self._make_service(mock_embedder, mock_vector_store)
+        result = service.ingest(b"%PDF", "doc.pdf", tag="HR")
+        
+        mock_embedder.embed_texts.assert_called_once()
+        mock_embedder.embed_text.assert_not_called()
+        texts = mock_embedder.embed_texts.call_args[0][0]
+        assert texts == ["a" * 10, "a" * 10, "a" * 5, "b" * 10, "b" * 5]
+        
+        assert len(batches) == 1
+        records = batches[0]
+        assert len(records) == 5
+        assert records[3]["metadata"] == {"tag": "HR", "page": 2, "chunk_id": 0}
+        assert records[3]["embedding"].dtype == np.float32
+        assert result["chunks_stored"] == 5
+        assert result["pages"] == 2
+    
+    def test_large_documents_are_embedded_and_stored_in_batches(
+        self, mock_embedder, mock_vector_store, monkeypatch
+    ):
+        """
+        Boundary: More chunks than PIPELINE_BATCH_SIZE are split into batches
+        """
+        loader = MagicMock()
+        loader.iter_pages.return_value = [{"page": 1, "text": "x" * 50}]
+        monkeypatch.setattr(
+            "app.application.ingest_service.DocumentLoaderFactory.get_loader",
+            lambda filename: loader
+        )
+        mock_embedder.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        
+        batches = self._collect_batches(mock_vector_store)
+        service = self._make_service(mock_embedder, mock_vector_store)
+        service.PIPELINE_BATCH_SIZE = 2
+        result = service.ingest(b"%PDF", "doc.pdf")
+        
+        assert mock_embedder.embed_texts.call_count == 3
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        mock_vector_store.add_batches.assert_called_once()
+        assert result["chunks_stored"] == 5
+    
+    def test_failed_later_batch_rolls_back_earlier_batches(
+        self, mock_embedder, mock_db_connection, monkeypatch
+    ):
+        """
+        Edge Case: Embedding fails after the first batch was written
+        Expected: The error propagates and the transaction holding the
+        earlier batch is rolled back, never committed
+        """
+        loader = MagicMock()
+        loader.iter_pages.return_value = [{"page": 1, "text": "x" * 50}]
+        monkeypatch.setattr(
+            "app.application.ingest_service.DocumentLoaderFactory.get_loader",
+            lambda filename: loader
+        )
+        mock_embedder.embed_texts.side_effect = [
+            [[0.1] * 384] * 2,
+            EmbeddingError("Batch embedding failed", "model crashed"),
+        ]
+        module = "app.infrastructure.persistence.postgres_vector_store"
+        
+        with patch(f"{module}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{module}.release_connection"), \
+             patch(f"{module}.execute_values") as mock_execute_values:
+            service = self._make_service(mock_embedder, PostgresVectorStore())
+            service.PIPELINE_BATCH_SIZE = 2
+            
+            with pytest.raises(EmbeddingError):
+                service.ingest(b"%PDF", "doc.pdf")
+        
+        assert mock_execute_values.call_count == 1
+        mock_db_connection.commit.assert_not_called()
+        mock_db_connection.rollback.assert_called_once()
+    
+    def test_concurrent_ingests_serialize_pdfium_calls(
+        self, mock_embedder, mock_vector_store, monkeypatch
+    ):
+        """
+        Boundary: Two uploads ingested at once (as /ingest does from
+        threadpool workers) never have PDFium calls in flight together
+        """
+        active = 0
+        overlaps = []
+        guard = threading.Lock()
+        
+        def pdfium_call(result=None):
+            """Record overlapping calls while holding the 'native' code briefly."""
+            nonlocal active
+            with guard:
+                active += 1
+                overlaps.append(active > 1)
+            time.sleep(0.005)
+            with guard:
+                active -= 1
+            return result
+        
+        class FakeDocument:
+            def __init__(self, file_bytes):
+                pdfium_call()
+            
+            def __len__(self):
+                return pdfium_call(3)
+            
+            def __getitem__(self, idx):
+                textpage = MagicMock()
+                textpage.get_text_range.side_effect = lambda: pdfium_call(f"page {idx} text")
+                page = MagicMock()
+                page.get_textpage.side_effect = lambda: pdfium_call(textpage)
+                return pdfium_call(page)
+            
+            def close(self):
+                pdfium_call()
+        
+        monkeypatch.setattr(
+            "app.infrastructure.document_loaders.pdf_loader.pdfium.PdfDocument", FakeDocument
+        )
+        monkeypatch.setattr(
+            "app.application.ingest_service.DocumentLoaderFactory.get_loader",
+            lambda filename: PDFLoader()
+        )
+        mock_embedder.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        service = self._make_service(mock_embedder, mock_vector_store)
+        barrier = threading.Barrier(2)
+        results = []
+        
+        def ingest(name):
+            barrier.wait()
+            results.append(service.ingest(b"%PDF-1.4 content", name))
+        
+        threads = [threading.Thread(target=ingest, args=(f"doc{i}.pdf",)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(results) == 2
+        assert all(r["pages"] == 3 for r in results)
+        assert overlaps and not any(overlaps)
@@ -9,9 +9,14 @@ Tests for:
 - Empty response
 - Malformed response
 - Connection error
+- Retries with backoff on 429/5xx and connection failures
+- Exact-match answer cache
 """
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+import httpx
+import orjson
 import requests
 
 from app.core.exceptions import (
@@ -20,216 +25,434 @@ from app.core.exceptions import (
     LLMAuthenticationError,
     LLMResponseError,
 )
+from app.infrastructure.llm_providers import openrouter_adapter
+from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
+
+
+# Single-turn conversation sent by most tests; never mutated
+_HELLO = [{"role": "user", "content": "Hello"}]
+
+
+def _response(status, payload=None, headers=None):
+    """Mock requests response with a status, an orjson-encoded payload and headers."""
+    response = MagicMock(spec=requests.Response)
+    response.status_code = status
+    response.headers = headers or {}
+    if payload is not None:
+        response.content = orjson.dumps(payload)
+    return response
+
+
+def _ok_response(content):
+    """Mock 200 response carrying a single chat completion with the given content."""
+    return _response(200, {"choices": [{"message": {"content": content}}]})
 
 
 class TestOpenRouterAdapter:
     """Test suite for OpenRouter LLM adapter."""
     
-    def setup_method(self):
-        """Reset singleton before each test."""
-        from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-        OpenRouterAdapter._instance = None
+    @pytest.fixture(autouse=True)
+    def _no_backoff_sleep(self):
+        """Skip real retry sleeps; tests inspect the recorded delays instead."""
+        module = 'app.infrastructure.llm_providers.openrouter_adapter'
+        with patch(f'{module}.time.sleep') as sleep, \
+                patch(f'{module}.asyncio.sleep', new_callable=AsyncMock) as asleep:
+            self.sleep = sleep
+            self.asleep = asleep
+            yield
+    
+    @pytest.fixture(autouse=True)
+    def _reset_singleton(self, monkeypatch):
+        """Start each test without a shared get_llm_provider() adapter."""
+        monkeypatch.setattr(openrouter_adapter, "_llm_provider", None)
+    
+    @pytest.fixture
+    def mock_post(self, monkeypatch):
+        """Stand-in for the pooled session's POST; tests set its return value or side effect."""
+        mock = MagicMock()
+        monkeypatch.setattr(
+            'app.infrastructure.llm_providers.openrouter_adapter.requests.Session.post', mock
+        )
+        return mock
     
     # ========================================
     # EDGE CASE TESTS
     # ========================================
     
-    def test_missing_api_key_raises_error(self):
+    def test_missing_api_key_raises_error(self, monkeypatch):
         """
         Edge Case: No API key configured
         Expected: LLMAuthenticationError
         """
-        with patch.dict('os.environ', {}, clear=True):
-            with patch('app.infrastructure.llm_providers.openrouter_adapter.os.getenv', return_value=None):
-                from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-                OpenRouterAdapter._instance = None
-                
-                adapter = OpenRouterAdapter(api_key=None)
-                
-                with pytest.raises(LLMAuthenticationError):
-                    adapter.chat([{"role": "user", "content": "Hello"}])
+        monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+        adapter = OpenRouterAdapter(api_key=None)
+        
+        with pytest.raises(LLMAuthenticationError):
+            adapter.chat(_HELLO)
     
-    def test_api_timeout_raises_error(self):
+    def test_api_timeout_raises_error(self, mock_post):
         """
         Edge Case: API request times out
         Expected: LLMConnectionError
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_post.side_effect = requests.exceptions.Timeout("Connection timed out")
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            
-            with pytest.raises(LLMConnectionError):
-                adapter.chat([{"role": "user", "content": "Hello"}])
+        mock_post.side_effect = requests.exceptions.Timeout("Connection timed out")
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        with pytest.raises(LLMConnectionError):
+            adapter.chat(_HELLO)
     
-    def test_rate_limit_raises_error(self):
+    @pytest.mark.parametrize("status, error", [
+        (429, LLMRateLimitError),       # rate limit exceeded
+        (401, LLMAuthenticationError),  # invalid API key
+        (403, LLMAuthenticationError),  # forbidden
+    ])
+    def test_error_status_raises_mapped_error(self, mock_post, status, error):
         """
-        Edge Case: Rate limit exceeded (429)
-        Expected: LLMRateLimitError
+        Edge Case: API answers with a non-retryable or exhausted error status
+        Expected: The status's mapped exception
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 429
-            mock_post.return_value = mock_response
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            
-            with pytest.raises(LLMRateLimitError):
-                adapter.chat([{"role": "user", "content": "Hello"}])
+        mock_post.return_value = _response(status)
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        with pytest.raises(error):
+            adapter.chat(_HELLO)
     
-    def test_auth_error_401_raises_error(self):
+    @pytest.mark.parametrize("payload", [
+        {"choices": []},
+        {"choices": [{"message": {"content": ""}}]},
+    ], ids=["no_choices", "empty_content"])
+    def test_empty_response_raises_error(self, mock_post, payload):
         """
-        Edge Case: Invalid API key (401)
-        Expected: LLMAuthenticationError
+        Edge Case: Response has no choices, or an empty message
+        Expected: LLMResponseError
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 401
-            mock_post.return_value = mock_response
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="invalid-key")
-            
-            with pytest.raises(LLMAuthenticationError):
-                adapter.chat([{"role": "user", "content": "Hello"}])
+        mock_post.return_value = _response(200, payload)
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        with pytest.raises(LLMResponseError):
+            adapter.chat(_HELLO)
     
-    def test_auth_error_403_raises_error(self):
+    def test_connection_error_raises_error(self, mock_post):
         """
-        Edge Case: Forbidden (403)
-        Expected: LLMAuthenticationError
+        Edge Case: Network connection fails
+        Expected: LLMConnectionError
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 403
-            mock_post.return_value = mock_response
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            
-            with pytest.raises(LLMAuthenticationError):
-                adapter.chat([{"role": "user", "content": "Hello"}])
+        mock_post.side_effect = requests.exceptions.ConnectionError("Network unreachable")
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        with pytest.raises(LLMConnectionError):
+            adapter.chat(_HELLO)
     
-    def test_empty_choices_raises_error(self):
+    def test_rate_limit_retries_until_budget_exhausted(self, mock_post):
         """
-        Edge Case: Response has no choices
-        Expected: LLMResponseError
+        Edge Case: Every attempt is rate limited
+        Expected: MAX_ATTEMPTS requests, then LLMRateLimitError
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = {"choices": []}
-            mock_post.return_value = mock_response
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            
-            with pytest.raises(LLMResponseError):
-                adapter.chat([{"role": "user", "content": "Hello"}])
+        mock_post.return_value = _response(429)
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        with pytest.raises(LLMRateLimitError):
+            adapter.chat(_HELLO)
+        
+        assert mock_post.call_count == OpenRouterAdapter.MAX_ATTEMPTS
+        delays = [c.args[0] for c in self.sleep.call_args_list]
+        assert len(delays) == OpenRouterAdapter.MAX_ATTEMPTS - 1
+        assert all(
+            0 <= d <= min(2 ** i, OpenRouterAdapter.MAX_BACKOFF) for i, d in enumerate(delays)
+        )
     
-    def test_empty_content_raises_error(self):
+    def test_backoff_uses_full_jitter_under_cap(self, mock_post):
         """
-        Edge Case: Response content is empty
-        Expected: LLMResponseError
+        Boundary: Each delay is drawn from [0, min(2 ** attempt, MAX_BACKOFF)]
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = {
-                "choices": [{"message": {"content": ""}}]
-            }
-            mock_post.return_value = mock_response
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            
-            with pytest.raises(LLMResponseError):
-                adapter.chat([{"role": "user", "content": "Hello"}])
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        with patch(
+            'app.infrastructure.llm_providers.openrouter_adapter.random.uniform',
+            side_effect=lambda low, high: high
+        ) as uniform:
+            delays = [adapter._backoff(attempt) for attempt in range(6)]
+        
+        assert delays == [1, 2, 4, 8, OpenRouterAdapter.MAX_BACKOFF, OpenRouterAdapter.MAX_BACKOFF]
+        assert all(c.args[0] == 0 for c in uniform.call_args_list)
     
-    def test_connection_error_raises_error(self):
+    def test_connection_error_retried_twice(self, mock_post):
         """
-        Edge Case: Network connection fails
-        Expected: LLMConnectionError
+        Boundary: Connection failures are retried MAX_CONNECTION_RETRIES times
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_post.side_effect = requests.exceptions.ConnectionError("Network unreachable")
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            
-            with pytest.raises(LLMConnectionError):
-                adapter.chat([{"role": "user", "content": "Hello"}])
+        mock_post.side_effect = requests.exceptions.ConnectionError("Network unreachable")
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        with pytest.raises(LLMConnectionError):
+            adapter.chat(_HELLO)
+        
+        assert mock_post.call_count == OpenRouterAdapter.MAX_CONNECTION_RETRIES + 1
     
     # ========================================
     # HAPPY PATH TESTS
     # ========================================
     
-    def test_successful_chat_returns_response(self):
+    def test_retry_after_is_honored(self, mock_post):
+        """
+        Happy Path: A 429 with Retry-After is retried after that delay
+        """
+        mock_post.side_effect = [
+            _response(429, headers={"Retry-After": "3"}),
+            _ok_response("Later"),
+        ]
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        response = adapter.chat(_HELLO)
+        
+        assert response == "Later"
+        self.sleep.assert_called_once_with(3.0)
+    
+    def test_successful_chat_returns_response(self, mock_post):
         """
         Happy Path: Successful API call returns response
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = {
-                "choices": [{"message": {"content": "Hello, how can I help?"}}]
-            }
-            mock_post.return_value = mock_response
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            response = adapter.chat([{"role": "user", "content": "Hello"}])
-            
-            assert response == "Hello, how can I help?"
+        mock_post.return_value = _ok_response("Hello, how can I help?")
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        response = adapter.chat(_HELLO)
+        
+        assert response == "Hello, how can I help?"
     
-    def test_generate_calls_chat(self):
+    def test_generate_calls_chat(self, monkeypatch):
         """
-        Happy Path: generate() method uses chat() internally
+        Happy Path: generate() builds the message list and delegates to chat()
         """
-        with patch('app.infrastructure.llm_providers.openrouter_adapter.requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = {
-                "choices": [{"message": {"content": "Generated response"}}]
-            }
-            mock_post.return_value = mock_response
-            
-            from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-            OpenRouterAdapter._instance = None
-            
-            adapter = OpenRouterAdapter(api_key="test-key")
-            response = adapter.generate("Hello")
-            
-            assert response == "Generated response"
+        mock_chat = MagicMock(return_value="Generated response")
+        monkeypatch.setattr(OpenRouterAdapter, "chat", mock_chat)
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        response = adapter.generate("Hello", system_prompt="Be brief")
+        
+        assert response == "Generated response"
+        mock_chat.assert_called_once_with(
+            [{"role": "system", "content": "Be brief"}, {"role": "user", "content": "Hello"}],
+            0.7,
+            None,
+        )
     
     def test_model_name_property(self):
         """
         Test model_name property returns correct value
         """
-        from app.infrastructure.llm_providers.openrouter_adapter import OpenRouterAdapter
-        OpenRouterAdapter._instance = None
-        
         adapter = OpenRouterAdapter(api_key="test-key", model="custom-model")
         
         assert adapter.model_name == "custom-model"
+    
+    def test_clients_carry_default_headers(self):
+        """
+        Test that auth headers are set once on the pooled clients
+        """
+        adapter = OpenRouterAdapter(api_key="test-key")
+        
+        assert adapter._get_session().headers["Authorization"] == "Bearer test-key"
+        assert adapter._get_async_client().headers["Authorization"] == "Bearer test-key"
+        assert adapter._get_session() is adapter._get_session()
+    
+    def test_async_client_uses_http2_when_available(self, monkeypatch):
+        """
+        Test that the async client negotiates HTTP/2 only when h2 is installed
+        """
+        with patch('app.infrastructure.llm_providers.openrouter_adapter.httpx.AsyncClient') as mock_client:
+            for available in (True, False):
+                monkeypatch.setattr(OpenRouterAdapter, "HTTP2", available)
+                OpenRouterAdapter(api_key="test-key")._get_async_client()
+                
+                assert mock_client.call_args.kwargs["http2"] is available
+    
+    def test_get_llm_provider_shares_one_instance(self):
+        """
+        Test that get_llm_provider() builds the adapter once while direct
+        construction yields independent adapters
+        """
+        assert openrouter_adapter.get_llm_provider() is openrouter_adapter.get_llm_provider()
+        assert (
+            openrouter_adapter.OpenRouterAdapter(api_key="a")
+            is not openrouter_adapter.OpenRouterAdapter(api_key="b")
+        )
+    
+    # ========================================
+    # ASYNC TESTS
+    # ========================================
+    
+    def test_achat_returns_response(self):
+        """
+        Happy Path: Async chat parses the httpx response
+        """
+        adapter = OpenRouterAdapter(api_key="test-key")
+        adapter._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200,
+                    json={"choices": [{"message": {"content": "Async answer"}}]}
+                )
+            )
+        )
+        
+        response = asyncio.run(adapter.achat(_HELLO))
+        
+        assert response == "Async answer"
+    
+    def test_achat_rate_limit_raises_error(self):
+        """
+        Edge Case: Async call hits rate limit (429)
+        Expected: LLMRateLimitError
+        """
+        adapter = OpenRouterAdapter(api_key="test-key")
+        adapter._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(429))
+        )
+        
+        with pytest.raises(LLMRateLimitError):
+            asyncio.run(adapter.achat(_HELLO))
+    
+    def test_identical_request_served_from_exact_cache(self, mock_post):
+        """
+        Happy Path: A byte-identical repeat skips the API; changing any
+        request parameter does not
+        """
+        mock_post.return_value = _ok_response("Hi")
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        messages = _HELLO
+        
+        assert adapter.chat(messages) == "Hi"
+        assert adapter.chat(messages) == "Hi"
+        assert mock_post.call_count == 1
+        
+        adapter.chat(messages, temperature=0.0)
+        assert mock_post.call_count == 2
+    
+    def test_exact_cache_entry_expires(self, mock_post):
+        """
+        Boundary: An entry older than EXACT_CACHE_TTL is fetched again
+        """
+        with patch('app.infrastructure.llm_providers.openrouter_adapter.time.monotonic') as clock:
+            mock_post.return_value = _ok_response("Hi")
+            
+            adapter = OpenRouterAdapter(api_key="test-key")
+            messages = _HELLO
+            
+            clock.return_value = 0.0
+            adapter.chat(messages)
+            clock.return_value = OpenRouterAdapter.EXACT_CACHE_TTL + 1
+            adapter.chat(messages)
+            
+            assert mock_post.call_count == 2
+    
+    def test_achat_retries_server_error(self):
+        """
+        Happy Path: Async call recovers from a transient 503
+        """
+        responses = iter([
+            httpx.Response(503),
+            httpx.Response(200, json={"choices": [{"message": {"content": "Recovered"}}]}),
+        ])
+        adapter = OpenRouterAdapter(api_key="test-key")
+        adapter._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: next(responses))
+        )
+        
+        response = asyncio.run(adapter.achat(_HELLO))
+        
+        assert response == "Recovered"
+        assert self.asleep.await_count == 1
+    
+    def test_sync_calls_reuse_one_session(self, mock_post):
+        """
+        Happy Path: Consecutive chat calls share one pooled session
+        """
+        mock_post.return_value = _ok_response("Hi")
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        adapter.chat(_HELLO)
+        session = adapter._session
+        adapter.chat([{"role": "user", "content": "Again"}])
+        
+        assert session is not None
+        assert adapter._session is session
+        assert mock_post.call_count == 2
+    
+    def test_aclose_releases_clients(self):
+        """
+        Happy Path: aclose() closes and drops both HTTP clients
+        """
+        adapter = OpenRouterAdapter(api_key="test-key")
+        adapter._get_session()
+        adapter._get_async_client()
+        
+        asyncio.run(adapter.aclose())
+        
+        assert adapter._session is None
+        assert adapter._async_client is None
+    
+    # ========================================
+    # STREAMING TESTS
+    # ========================================
+    
+    def test_stream_chat_yields_deltas(self, mock_post):
+        """
+        Happy Path: Streaming yields content deltas and stops at [DONE]
+        """
+        mock_response = MagicMock(spec=requests.Response)
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = [
+            ": OPENROUTER PROCESSING",
+            'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": "lo"}}]}',
+            "data: [DONE]",
+        ]
+        mock_post.return_value.__enter__.return_value = mock_response
+        
+        adapter = OpenRouterAdapter(api_key="test-key")
+        fragments = list(adapter.stream_chat(_HELLO))
+        
+        assert fragments == ["Hel", "lo"]
+        assert orjson.loads(mock_post.call_args.kwargs["data"])["stream"] is True
+    
+    def test_astream_chat_yields_deltas(self):
+        """
+        Happy Path: Async streaming parses SSE lines from the httpx client
+        """
+        body = (
+            b": OPENROUTER PROCESSING\n\n"
+            b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+            b'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+            b"data: [DONE]\n\n"
+        )
+        adapter = OpenRouterAdapter(api_key="test-key")
+        adapter._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+        )
+        
+        async def collect():
+            return [f async for f in adapter.astream_chat(_HELLO)]
+        
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+    
+    def test_astream_chat_rate_limit_raises_error(self):
+        """
+        Edge Case: Async stream rejected with 429
+        Expected: LLMRateLimitError before any fragment
+        """
+        adapter = OpenRouterAdapter(api_key="test-key")
+        adapter._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(429))
+        )
+        
+        async def collect():
+            return [f async for f in adapter.astream_chat(_HELLO)]
+        
+        with pytest.raises(LLMRateLimitError):
+            asyncio.run(collect())
@@ -0,0 +1,209 @@
+"""
+Document Loader Factory Tests
+
+Tests for:
+- Default PDF loader registration
+- Extension lookup and unsupported types
+- Registering new loaders
+- Loader instances are shared per extension
+- Extraction cache wrapping
+"""
+from typing import Dict, List
+
+import pytest
+
+from app.domain.interfaces.document_loader import IDocumentLoader
+
+from app.infrastructure.document_loaders import (
+    DocumentLoaderFactory,
+    PDFLoader,
+    CachedDocumentLoader,
+)
+
+
+class _TextLoader(IDocumentLoader):
+    """Minimal loader used to exercise registration."""
+    
+    def load(self, file_bytes: bytes, filename: str = "document.txt") -> List[Dict]:
+        return [{"page": 1, "text": file_bytes.decode()}]
+    
+    @property
+    def supported_extensions(self) -> List[str]:
+        return [".txt"]
+
+
+class TestDocumentLoaderFactory:
+    """Test suite for the document loader factory."""
+    
+    @pytest.fixture(autouse=True)
+    def _no_document_cache(self, monkeypatch):
+        """Run without the on-disk extraction cache unless a test enables it."""
+        monkeypatch.delenv("DOCUMENT_CACHE_PATH", raising=False)
+    
+    def setup_method(self):
+        """Start each test without cached loader instances."""
+        DocumentLoaderFactory.reset_instances()
+    
+    def teardown_method(self):
+        """Remove loaders registered by tests."""
+        DocumentLoaderFactory._loaders.pop(".txt", None)
+        DocumentLoaderFactory.reset_instances()
+    
+    # ========================================
+    # HAPPY PATH TESTS
+    # ========================================
+    
+    def test_pdf_supported_by_default(self):
+        """
+        Happy Path: PDF loader available without any registration call
+        """
+        assert ".pdf" in DocumentLoaderFactory.get_supported_extensions()
+        assert isinstance(DocumentLoaderFactory.get_loader("report.pdf"), PDFLoader)
+    
+    def test_extension_is_case_insensitive(self):
+        """
+        Happy Path: Upper-case extension resolves to the same loader
+        """
+        assert DocumentLoaderFactory.is_supported("REPORT.PDF")
+    
+    def test_loader_instance_is_reused(self):
+        """
+        Happy Path: Repeated lookups return the same loader object
+        """
+        first = DocumentLoaderFactory.get_loader("a.pdf")
+        second = DocumentLoaderFactory.get_loader("b.pdf")
+        
+        assert first is second
+    
+    def test_register_new_loader(self):
+        """
+        Happy Path: Registered loader is served for its extension
+        """
+        DocumentLoaderFactory.register(".txt", _TextLoader)
+        
+        assert isinstance(DocumentLoaderFactory.get_loader("notes.txt"), _TextLoader)
+    
+    # ========================================
+    # EDGE CASE TESTS
+    # ========================================
+    
+    def test_unsupported_extension_raises_error(self):
+        """
+        Edge Case: Unknown file type
+        Expected: ValueError listing supported types
+        """
+        with pytest.raises(ValueError, match="Unsupported file type"):
+            DocumentLoaderFactory.get_loader("notes.docx")
+    
+    def test_filename_without_extension(self):
+        """
+        Edge Case: No extension at all
+        Expected: Not supported
+        """
+        assert not DocumentLoaderFactory.is_supported("README")
+    
+    def test_register_rejects_non_loader(self):
+        """
+        Edge Case: Class not implementing IDocumentLoader
+        Expected: TypeError
+        """
+        with pytest.raises(TypeError):
+            DocumentLoaderFactory.register(".txt", dict)
+    
+    def test_extension_uses_last_suffix(self):
+        """
+        Edge Case: Dotted file names and directories
+        Expected: Only the final suffix counts
+        """
+        assert DocumentLoaderFactory._get_extension("annual.report.v2.PDF") == ".pdf"
+        assert DocumentLoaderFactory._get_extension("uploads.d/README") == ""
+    
+    def test_loader_wrapped_when_cache_configured(self, monkeypatch, tmp_path):
+        """
+        Happy Path: DOCUMENT_CACHE_PATH wraps loaders in the extraction cache
+        """
+        monkeypatch.setenv("DOCUMENT_CACHE_PATH", str(tmp_path / "documents.sqlite3"))
+        
+        loader = DocumentLoaderFactory.get_loader("report.pdf")
+        
+        assert isinstance(loader, CachedDocumentLoader)
+        assert loader.supported_extensions == [".pdf"]
+
+
+class _CountingLoader(_TextLoader):
+    """Text loader that counts how often it actually parses."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def load(self, file_bytes: bytes, filename: str = "document.txt") -> List[Dict]:
+        self.calls += 1
+        return super().load(file_bytes, filename)
+
+
+class TestCachedDocumentLoader:
+    """Test suite for the extraction cache decorator."""
+    
+    def test_identical_bytes_parsed_once(self, tmp_path):
+        """
+        Happy Path: Re-loading the same bytes is served from the cache
+        """
+        inner = _CountingLoader()
+        loader = CachedDocumentLoader(inner, str(tmp_path / "documents.sqlite3"))
+        
+        first = loader.load(b"hello world", filename="a.txt")
+        second = loader.load(b"hello world", filename="b.txt")
+        
+        assert first == second == [{"page": 1, "text": "hello world"}]
+        assert inner.calls == 1
+    
+    def test_cache_survives_reopen(self, tmp_path):
+        """
+        Happy Path: A new decorator over the same file reuses old entries
+        """
+        path = str(tmp_path / "documents.sqlite3")
+        CachedDocumentLoader(_CountingLoader(), path).load(b"persisted")
+        
+        inner = _CountingLoader()
+        pages = CachedDocumentLoader(inner, path).load(b"persisted")
+        
+        assert pages == [{"page": 1, "text": "persisted"}]
+        assert inner.calls == 0
+    
+    def test_different_bytes_miss(self, tmp_path):
+        """
+        Edge Case: Different content is parsed separately
+        """
+        inner = _CountingLoader()
+        loader = CachedDocumentLoader(inner, str(tmp_path / "documents.sqlite3"))
+        
+        loader.load(b"one")
+        loader.load(b"two")
+        
+        assert inner.calls == 2
+    
+    def test_iter_pages_streams_and_caches(self, tmp_path):
+        """
+        Happy Path: Streaming a miss stores the pages for the next load
+        """
+        inner = _CountingLoader()
+        loader = CachedDocumentLoader(inner, str(tmp_path / "documents.sqlite3"))
+        
+        streamed = list(loader.iter_pages(b"streamed", filename="a.txt"))
+        
+        assert streamed == loader.load(b"streamed") == [{"page": 1, "text": "streamed"}]
+        assert inner.calls == 1
+    
+    def test_errors_are_not_cached(self, tmp_path):
+        """
+        Edge Case: A failing load is retried on the next call
+        """
+        inner = _CountingLoader()
+        loader = CachedDocumentLoader(inner, str(tmp_path / "documents.sqlite3"))
+        
+        with pytest.raises(UnicodeDecodeError):
+            loader.load(b"\xff\xfe")
+        with pytest.raises(UnicodeDecodeError):
+            loader.load(b"\xff\xfe")
+        
+        assert inner.calls == 2
@@ -8,175 +8,226 @@ Tests for:
 - Valid PDF processing
 """
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
-from pypdf.errors import PdfReadError
+import pypdfium2 as pdfium
 
 from app.infrastructure.document_loaders.pdf_loader import PDFLoader
 from app.core.exceptions import EmptyDocumentError, CorruptedDocumentError
 
 
+PDF_DOCUMENT = 'app.infrastructure.document_loaders.pdf_loader.pdfium.PdfDocument'
+
+# Real PDFium document class, captured before tests patch it, used as a mock spec
+_PdfDocument = pdfium.PdfDocument
+
+
+def _fake_page(text):
+    """Plain stand-in for a PDFium page exposing only what the loader calls."""
+    textpage = SimpleNamespace(get_text_range=lambda: text, close=lambda: None)
+    return SimpleNamespace(get_textpage=lambda: textpage, close=lambda: None)
+
+
+def _mock_pdf(texts):
+    """Mock PDFium document whose pages yield the given texts."""
+    pages = [_fake_page(text) for text in texts]
+    
+    pdf = MagicMock(spec=_PdfDocument)
+    pdf.__len__.return_value = len(pages)
+    pdf.__getitem__.side_effect = lambda idx: pages[idx]
+    return pdf
+
+
+@pytest.fixture(scope="module")
+def loader():
+    """One PDFLoader for the module; it keeps no per-document state."""
+    return PDFLoader()
+
+
 class TestPDFLoader:
     """Test suite for PDF document loader."""
     
-    def setup_method(self):
-        """Setup test fixtures."""
-        self.loader = PDFLoader()
+    @pytest.fixture
+    def mock_document(self, monkeypatch):
+        """
+        Stand-in for pdfium.PdfDocument; tests set its return value (e.g.
+        _mock_pdf(texts)) or side effect.
+        """
+        mock = MagicMock()
+        monkeypatch.setattr(PDF_DOCUMENT, mock)
+        return mock
     
     # ========================================
     # EDGE CASE TESTS
     # ========================================
     
-    def test_empty_file_raises_error(self, empty_bytes):
+    def test_empty_file_raises_error(self, loader, empty_bytes):
         """
         Edge Case: Empty file (0 bytes)
         Expected: EmptyDocumentError
         """
-        with pytest.raises(EmptyDocumentError) as exc_info:
-            self.loader.load(empty_bytes, filename="empty.pdf")
-        
-        assert "empty.pdf" in str(exc_info.value.message)
+        with pytest.raises(EmptyDocumentError, match=r"empty\.pdf"):
+            loader.load(empty_bytes, filename="empty.pdf")
     
-    def test_none_bytes_raises_error(self):
+    def test_none_bytes_raises_error(self, loader):
         """
         Edge Case: None instead of bytes
         Expected: EmptyDocumentError
         """
         with pytest.raises(EmptyDocumentError):
-            self.loader.load(None, filename="none.pdf")
+            loader.load(None, filename="none.pdf")
     
-    def test_non_pdf_content_raises_error(self, non_pdf_bytes):
+    def test_non_pdf_content_raises_error(self, loader, non_pdf_bytes):
         """
         Edge Case: Non-PDF file content (text file renamed to .pdf)
         Expected: CorruptedDocumentError
         """
+        with pytest.raises(CorruptedDocumentError, match=r"(?i)corrupted"):
+            loader.load(non_pdf_bytes, filename="fake.pdf")
+    
+    def test_missing_signature_rejected_before_parsing(self, loader, mock_document):
+        """
+        Edge Case: Random bytes without a %PDF- header
+        Expected: CorruptedDocumentError without opening the document
+        """
         with pytest.raises(CorruptedDocumentError) as exc_info:
-            self.loader.load(non_pdf_bytes, filename="fake.pdf")
+            loader.load(b"PK\x03\x04 not a pdf", filename="archive.pdf")
         
-        assert "corrupted" in str(exc_info.value.message).lower()
+        assert "%PDF-" in str(exc_info.value.details)
+        mock_document.assert_not_called()
     
-    def test_password_protected_pdf(self):
+    def test_password_protected_pdf(self, loader, mock_document):
         """
         Edge Case: Password-protected PDF
         Expected: CorruptedDocumentError with password message
         
-        Note: This test mocks the PdfReader behavior
+        Note: This test mocks the PDFium load error
         """
-        with patch('app.infrastructure.document_loaders.pdf_loader.PdfReader') as mock_reader:
-            mock_instance = MagicMock()
-            mock_instance.is_encrypted = True
-            mock_reader.return_value = mock_instance
-            
-            with pytest.raises(CorruptedDocumentError) as exc_info:
-                self.loader.load(b"fake pdf content", filename="protected.pdf")
-            
-            assert "password" in str(exc_info.value.details).lower()
+        mock_document.side_effect = pdfium.PdfiumError(
+            "Failed to load document (PDFium: Incorrect password error).",
+            err_code=pdfium.raw.FPDF_ERR_PASSWORD
+        )
+        
+        with pytest.raises(CorruptedDocumentError) as exc_info:
+            loader.load(b"%PDF-1.4 fake pdf content", filename="protected.pdf")
+        
+        assert "password" in str(exc_info.value.details).lower()
     
-    def test_image_only_pdf_raises_error(self):
+    def test_image_only_pdf_raises_error(self, loader, mock_document):
         """
         Edge Case: PDF with only images (no extractable text)
         Expected: EmptyDocumentError
         
         Note: This test mocks pages with no text
         """
-        with patch('app.infrastructure.document_loaders.pdf_loader.PdfReader') as mock_reader:
-            mock_instance = MagicMock()
-            mock_instance.is_encrypted = False
-            
-            # Create mock page that returns empty text
-            mock_page = MagicMock()
-            mock_page.extract_text.return_value = ""
-            mock_instance.pages = [mock_page]
-            
-            mock_reader.return_value = mock_instance
-            
-            with pytest.raises(EmptyDocumentError):
-                self.loader.load(b"fake pdf content", filename="image_only.pdf")
+        mock_document.return_value = _mock_pdf([""])
+        
+        with pytest.raises(EmptyDocumentError):
+            loader.load(b"%PDF-1.4 fake pdf content", filename="image_only.pdf")
     
-    def test_corrupted_pdf_structure(self):
+    def test_corrupted_pdf_structure(self, loader, mock_document):
         """
         Edge Case: PDF with corrupted internal structure
         Expected: CorruptedDocumentError
         """
-        with patch('app.infrastructure.document_loaders.pdf_loader.PdfReader') as mock_reader:
-            mock_reader.side_effect = PdfReadError("Invalid PDF structure")
-            
-            with pytest.raises(CorruptedDocumentError):
-                self.loader.load(b"corrupted content", filename="corrupted.pdf")
+        mock_document.side_effect = pdfium.PdfiumError(
+            "Failed to load document (PDFium: Data format error).",
+            err_code=pdfium.raw.FPDF_ERR_FORMAT
+        )
+        
+        with pytest.raises(CorruptedDocumentError):
+            loader.load(b"%PDF-1.4 corrupted content", filename="corrupted.pdf")
     
     # ========================================
     # HAPPY PATH TESTS
     # ========================================
     
-    def test_valid_pdf_returns_pages(self):
+    def test_valid_pdf_returns_pages(self, loader, mock_document):
         """
         Happy Path: Valid PDF with extractable text
         Expected: List of page dicts with text
         """
-        with patch('app.infrastructure.document_loaders.pdf_loader.PdfReader') as mock_reader:
-            mock_instance = MagicMock()
-            mock_instance.is_encrypted = False
-            
-            # Create mock pages with text
-            mock_page1 = MagicMock()
-            mock_page1.extract_text.return_value = "Page 1 content"
-            mock_page2 = MagicMock()
-            mock_page2.extract_text.return_value = "Page 2 content"
-            mock_instance.pages = [mock_page1, mock_page2]
-            
-            mock_reader.return_value = mock_instance
+        mock_document.return_value = _mock_pdf(["Page 1 content", "Page 2 content"])
+        
+        pages = loader.load(b"%PDF-1.4 valid pdf content", filename="valid.pdf")
+        
+        assert len(pages) == 2
+        assert pages[0]["page"] == 1
+        assert pages[0]["text"] == "Page 1 content"
+        assert pages[1]["page"] == 2
+    
+    def test_large_pdf_extracted_in_parallel_in_page_order(self, loader, mock_document):
+        """
+        Happy Path: Large PDFs are split into page ranges across workers
+        and merged back in page order
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with patch.object(PDFLoader, "PARALLEL_MIN_PAGES", 50), \
+             patch('app.infrastructure.document_loaders.pdf_loader.os.cpu_count', return_value=4), \
+             patch('app.infrastructure.document_loaders.pdf_loader.ProcessPoolExecutor',
+                   side_effect=lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)) as mock_pool:
+            mock_document.return_value = _mock_pdf([f"Page {i + 1} content" for i in range(120)])
             
-            pages = self.loader.load(b"valid pdf content", filename="valid.pdf")
+            pages = loader.load(b"%PDF-1.4 large pdf content", filename="large.pdf")
             
-            assert len(pages) == 2
-            assert pages[0]["page"] == 1
-            assert pages[0]["text"] == "Page 1 content"
-            assert pages[1]["page"] == 2
+            assert mock_pool.call_args.kwargs["max_workers"] == 2
+            assert [p["page"] for p in pages] == list(range(1, 121))
+            assert pages[119]["text"] == "Page 120 content"
     
-    def test_supported_extensions(self):
+    def test_supported_extensions(self, loader):
         """Test that PDF extension is supported."""
-        assert ".pdf" in self.loader.supported_extensions
+        assert ".pdf" in loader.supported_extensions
     
     # ========================================
     # BOUNDARY TESTS
     # ========================================
     
-    def test_single_page_pdf(self):
+    def test_single_page_pdf(self, loader, mock_document):
         """
         Boundary: PDF with exactly 1 page
         """
-        with patch('app.infrastructure.document_loaders.pdf_loader.PdfReader') as mock_reader:
-            mock_instance = MagicMock()
-            mock_instance.is_encrypted = False
-            
-            mock_page = MagicMock()
-            mock_page.extract_text.return_value = "Single page content"
-            mock_instance.pages = [mock_page]
-            
-            mock_reader.return_value = mock_instance
-            
-            pages = self.loader.load(b"single page pdf", filename="single.pdf")
-            
-            assert len(pages) == 1
+        mock_document.return_value = _mock_pdf(["Single page content"])
+        
+        pages = loader.load(b"%PDF-1.4 single page pdf", filename="single.pdf")
+        
+        assert len(pages) == 1
     
-    def test_page_with_only_whitespace_skipped(self):
+    def test_page_with_only_whitespace_skipped(self, loader, mock_document):
         """
         Edge Case: Page with only whitespace is skipped
         """
-        with patch('app.infrastructure.document_loaders.pdf_loader.PdfReader') as mock_reader:
-            mock_instance = MagicMock()
-            mock_instance.is_encrypted = False
-            
-            # Page 1 has content, Page 2 has only whitespace
-            mock_page1 = MagicMock()
-            mock_page1.extract_text.return_value = "Real content"
-            mock_page2 = MagicMock()
-            mock_page2.extract_text.return_value = "   \n\t  "
-            mock_instance.pages = [mock_page1, mock_page2]
-            
-            mock_reader.return_value = mock_instance
-            
-            pages = self.loader.load(b"mixed pdf", filename="mixed.pdf")
-            
-            # Only page 1 should be included
-            assert len(pages) == 1
-            assert pages[0]["text"] == "Real content"
+        # Page 1 has content, Page 2 has only whitespace
+        mock_document.return_value = _mock_pdf(["Real content", "   \n\t  "])
+        
+        pages = loader.load(b"%PDF-1.4 mixed pdf", filename="mixed.pdf")
+        
+        # Only page 1 should be included
+        assert len(pages) == 1
+        assert pages[0]["text"] == "Real content"
+    
+    def test_document_closed_after_load(self, loader, mock_document):
+        """
+        Happy Path: The PDFium document is closed once extraction finishes
+        """
+        pdf = _mock_pdf(["Some content"])
+        mock_document.return_value = pdf
+        
+        loader.load(b"%PDF-1.4 valid pdf content", filename="valid.pdf")
+        
+        pdf.close.assert_called_once()
+    
+    def test_iter_pages_streams_lazily(self, loader, mock_document):
+        """
+        Happy Path: iter_pages extracts a page only when it is requested
+        """
+        pdf = _mock_pdf(["First page", "Second page"])
+        mock_document.return_value = pdf
+        
+        pages = loader.iter_pages(b"%PDF-1.4 valid pdf content", filename="valid.pdf")
+        first = next(pages)
+        
+        assert first == {"page": 1, "text": "First page"}
+        assert pdf.__getitem__.call_count == 1
+        assert [p["page"] for p in pages] == [2]
+        pdf.close.assert_called_once()
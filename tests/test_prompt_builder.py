@@ -0,0 +1,209 @@
+"""
+Prompt Builder Tests
+
+Tests for:
+- build_rag_messages fast path matches RAGPromptBuilder output
+- System prompt rendering is cached per rule set
+- Anthropic cache_control content blocks
+- Builder message structure
+"""
+from app.domain.builders import (
+    RAGPromptBuilder,
+    SummarizationPromptBuilder,
+    PROVIDER_ANTHROPIC,
+    build_rag_messages,
+    provider_for_model,
+)
+
+
+def _flatten(messages):
+    """Concatenate content blocks back into plain strings."""
+    return [
+        (m["role"], m["content"] if isinstance(m["content"], str)
+         else "".join(block["text"] for block in m["content"]))
+        for m in messages
+    ]
+
+
+class TestBuildRagMessages:
+    """Test suite for the stateless default RAG prompt."""
+    
+    def test_matches_default_builder(self):
+        """
+        Happy Path: Fast path produces the same messages as the builder
+        """
+        expected = (RAGPromptBuilder()
+            .add_context("Some retrieved text", "Retrieved Documents")
+            .set_query("What is this?")
+            .build_messages())
+        
+        actual = build_rag_messages("Some retrieved text", "What is this?", "Retrieved Documents")
+        
+        assert actual == expected
+    
+    def test_chunks_match_joined_context(self):
+        """
+        Happy Path: Passing chunks equals passing the pre-joined string
+        """
+        chunks = ["First chunk", "Second chunk", "Third chunk"]
+        
+        assert build_rag_messages(chunks, "Q?") == build_rag_messages("\n\n".join(chunks), "Q?")
+        assert build_rag_messages(iter(chunks), "Q?") == (RAGPromptBuilder()
+            .add_context(chunks)
+            .set_query("Q?")
+            .build_messages())
+    
+    def test_anthropic_blocks_match_plain_text(self):
+        """
+        Happy Path: Anthropic format carries the same text with cache breakpoints
+        """
+        plain = build_rag_messages(["a", "b"], "Q?", "Docs")
+        blocks = build_rag_messages(["a", "b"], "Q?", "Docs", PROVIDER_ANTHROPIC)
+        
+        assert _flatten(blocks) == _flatten(plain)
+        assert blocks[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" in blocks[1]["content"][0]
+        assert "cache_control" not in blocks[1]["content"][-1]
+        assert "Q?" in blocks[1]["content"][-1]["text"]
+    
+    def test_provider_for_model(self):
+        """
+        Test that only Anthropic models get the block format
+        """
+        assert provider_for_model("anthropic/claude-3.5-sonnet") == PROVIDER_ANTHROPIC
+        assert provider_for_model("mistralai/mistral-7b-instruct") == "openai"
+    
+    def test_system_message_is_shared(self):
+        """
+        Test that the system message is built once and reused
+        """
+        first = build_rag_messages("a", "b")
+        second = build_rag_messages("c", "d")
+        
+        assert first[0] is second[0]
+        assert first[1]["content"] != second[1]["content"]
+
+
+class TestRAGPromptBuilder:
+    """Test suite for the RAG prompt builder."""
+    
+    def test_system_prompt_reused_across_builders(self):
+        """
+        Happy Path: Identical rules render to the same cached string
+        """
+        first = RAGPromptBuilder().build_system_prompt()
+        second = RAGPromptBuilder().build_system_prompt()
+        
+        assert first is second
+        assert first.startswith("Rules you MUST follow:\n- You are a document-grounded assistant.")
+    
+    def test_default_rules_reuse_shared_system_message(self):
+        """
+        Happy Path: Unmodified builders share the precomputed system message
+        """
+        first = RAGPromptBuilder().add_context("a").set_query("b").build_messages()
+        second = RAGPromptBuilder().add_context("c").set_query("d").build_messages()
+        custom = RAGPromptBuilder().add_constraint("Be brief.").set_query("d").build_messages()
+        
+        assert first[0] is second[0]
+        assert custom[0] is not first[0]
+        assert "- Be brief." in custom[0]["content"]
+    
+    def test_custom_rules_change_system_prompt(self):
+        """
+        Edge Case: Extra instruction after a cached render
+        Expected: New prompt includes it
+        """
+        builder = RAGPromptBuilder()
+        builder.build_system_prompt()
+        builder.add_system_instruction("Answer in French.")
+        
+        assert "- Answer in French." in builder.build_system_prompt()
+    
+    def test_examples_rendered_in_user_prompt(self):
+        """
+        Happy Path: Few-shot examples appear in order before the question
+        """
+        prompt = (RAGPromptBuilder()
+            .add_context("ctx")
+            .add_example("Q1", "A1")
+            .add_example("Q2", "A2")
+            .set_query("Q?")
+            .build_user_prompt())
+        
+        assert prompt == (
+            "Context:\nctx\n\n\n\nExamples:\nQ: Q1\nA: A1\nQ: Q2\nA: A2"
+            "\n\n\nQuestion:\nQ?\n\n\nAnswer:"
+        )
+    
+    def test_many_context_sections_keep_order(self):
+        """
+        Edge Case: Large top_k with many examples
+        Expected: Every section and example rendered once, in order
+        """
+        builder = RAGPromptBuilder()
+        for i in range(20):
+            builder.add_context(f"chunk {i}", f"Doc {i}")
+            builder.add_example(f"q{i}", f"a{i}")
+        
+        prompt = builder.set_query("Q?").build_user_prompt()
+        
+        positions = [prompt.index(f"Doc {i}:\nchunk {i}") for i in range(20)]
+        assert positions == sorted(positions)
+        assert prompt.count("\nQ: ") == 20
+        assert prompt.index("Q: q19\nA: a19") < prompt.index("Question:\nQ?")
+    
+    def test_build_reuses_rendered_prompts(self):
+        """
+        Happy Path: build() messages match build_messages()
+        """
+        builder = RAGPromptBuilder().add_context("ctx").set_query("Q?")
+        
+        result = builder.build()
+        
+        assert result["messages"] == builder.build_messages()
+        assert result["messages"][1]["content"] == result["user_prompt"]
+    
+    def test_reset_keeps_default_rules(self):
+        """
+        Edge Case: Builder reused across requests via reset()
+        Expected: Same system prompt as a fresh builder
+        """
+        builder = RAGPromptBuilder().add_system_instruction("Extra rule.")
+        builder.reset()
+        
+        assert builder.build_system_prompt() == RAGPromptBuilder().build_system_prompt()
+    
+    def test_anthropic_context_sections_are_cached(self):
+        """
+        Happy Path: Breakpoint after the last context section, query uncached
+        """
+        builder = (RAGPromptBuilder()
+            .add_context("one", "A")
+            .add_context("two", "B")
+            .set_query("Q?"))
+        
+        plain = builder.build_messages()
+        blocks = builder.build_messages(PROVIDER_ANTHROPIC)
+        user_blocks = blocks[1]["content"]
+        
+        assert _flatten(blocks) == _flatten(plain)
+        assert len(user_blocks) == 3
+        assert "cache_control" not in user_blocks[0]
+        assert user_blocks[1]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in user_blocks[2]
+
+
+class TestSummarizationPromptBuilder:
+    """Test suite for the summarization prompt builder."""
+    
+    def test_system_prompt_rendering(self):
+        """
+        Happy Path: Instructions and constraints render in order, cached
+        """
+        builder = SummarizationPromptBuilder().set_max_length(50)
+        prompt = builder.build_system_prompt()
+        
+        assert prompt.startswith("Instructions:\n- You are a summarization assistant.")
+        assert prompt.endswith("\nConstraints:\n- Keep summary under 50 words")
+        assert builder.build_system_prompt() is prompt
@@ -0,0 +1,252 @@
+"""
+Semantic Response Cache Tests
+
+Tests for:
+- Hits on similar questions over identical context
+- Misses on different context or dissimilar questions
+- LRU eviction and TTL expiry
+- Centroid merging and .npz persistence
+- Exact-match hits that skip embedding
+"""
+import math
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+from app.application.response_cache import SemanticResponseCache
+
+
+def _unit(*components):
+    """384-dim unit vector with the given leading components."""
+    vec = [0.0] * 384
+    vec[:len(components)] = components
+    norm = sum(c * c for c in components) ** 0.5
+    return [c / norm for c in vec]
+
+
+class TestSemanticResponseCache:
+    """Test suite for the semantic answer cache."""
+    
+    def _make_cache(self, vectors, max_entries=8, ttl=None):
+        """Build a cache whose embedder maps questions to fixed vectors."""
+        embedder = MagicMock()
+        embedder.dimension = 384
+        embedder.embed_text.side_effect = lambda text: vectors[text]
+        return SemanticResponseCache(embedder, max_entries=max_entries, ttl=ttl)
+    
+    def test_empty_cache_misses(self):
+        """
+        Edge Case: Lookup on an empty cache
+        Expected: No answer, but a usable key
+        """
+        cache = self._make_cache({"q": _unit(1.0)})
+        
+        answer, key = cache.lookup("q", ["ctx"])
+        
+        assert answer is None
+        assert key.context_hash == SemanticResponseCache.context_hash(["ctx"])
+    
+    def test_paraphrase_over_same_context_hits(self):
+        """
+        Happy Path: A near-identical question over the same chunks hits
+        """
+        cache = self._make_cache({"what is rag": _unit(1.0), "what's rag": _unit(1.0, 0.2)})
+        
+        _, key = cache.lookup("what is rag", ["ctx"])
+        cache.store(key, "RAG answer")
+        answer, _ = cache.lookup("what's rag", ["ctx"])
+        
+        assert answer == "RAG answer"
+    
+    def test_different_context_misses(self):
+        """
+        Edge Case: Same question but different retrieved chunks
+        Expected: No answer
+        """
+        cache = self._make_cache({"q": _unit(1.0)})
+        
+        _, key = cache.lookup("q", ["ctx a"])
+        cache.store(key, "answer a")
+        answer, _ = cache.lookup("q", ["ctx b"])
+        
+        assert answer is None
+    
+    def test_dissimilar_question_misses(self):
+        """
+        Boundary: Similarity below the threshold does not hit
+        """
+        cache = self._make_cache({"a": _unit(1.0), "b": _unit(1.0, 1.0)})
+        
+        _, key = cache.lookup("a", ["ctx"])
+        cache.store(key, "answer a")
+        answer, _ = cache.lookup("b", ["ctx"])
+        
+        assert answer is None
+    
+    def test_evicts_least_recently_used(self):
+        """
+        Boundary: A full cache evicts the entry used longest ago
+        """
+        cache = self._make_cache({"a": _unit(1.0), "b": _unit(0.0, 1.0), "c": _unit(0.0, 0.0, 1.0)}, max_entries=2)
+        
+        for q in ("a", "b"):
+            _, key = cache.lookup(q, ["ctx"])
+            cache.store(key, q.upper())
+        cache.lookup("a", ["ctx"])
+        _, key = cache.lookup("c", ["ctx"])
+        cache.store(key, "C")
+        
+        assert len(cache) == 2
+        assert cache.lookup("a", ["ctx"])[0] == "A"
+        assert cache.lookup("b", ["ctx"])[0] is None
+        assert cache.lookup("c", ["ctx"])[0] == "C"
+    
+    def test_expired_entry_misses_and_is_reused(self):
+        """
+        Boundary: An answer older than the TTL no longer hits, and its
+        slot is reused before any live entry is evicted
+        """
+        vectors = {"a": _unit(1.0), "b": _unit(0.0, 1.0), "c": _unit(0.0, 0.0, 1.0)}
+        cache = self._make_cache(vectors, max_entries=2, ttl=60)
+        
+        with patch("app.application.response_cache.time.time", return_value=1000.0):
+            _, key = cache.lookup("a", ["ctx"])
+            cache.store(key, "A")
+        with patch("app.application.response_cache.time.time", return_value=1050.0):
+            _, key = cache.lookup("b", ["ctx"])
+            cache.store(key, "B")
+            # "a" becomes the most recently used entry
+            assert cache.lookup("a", ["ctx"])[0] == "A"
+        
+        with patch("app.application.response_cache.time.time", return_value=1070.0):
+            assert cache.lookup("a", ["ctx"])[0] is None
+            _, key = cache.lookup("c", ["ctx"])
+            cache.store(key, "C")
+            
+            assert cache.lookup("b", ["ctx"])[0] == "B"
+            assert cache.lookup("c", ["ctx"])[0] == "C"
+    
+    def test_matching_store_merges_into_centroid(self):
+        """
+        Happy Path: Storing a paraphrase of a cached question updates the
+        cluster centroid instead of adding a row
+        """
+        cache = self._make_cache({"a": _unit(1.0), "a2": _unit(1.0, 0.3)})
+        
+        _, key = cache.lookup("a", ["ctx"])
+        cache.store(key, "first")
+        _, key = cache.lookup("a2", ["ctx"])
+        cache.store(key, "second")
+        
+        assert len(cache) == 1
+        assert cache.lookup("a", ["ctx"])[0] == "first"
+        assert abs(float((cache._vectors[0] ** 2).sum()) - 1.0) < 1e-5
+    
+    def test_exact_repeat_hits_without_embedding(self):
+        """
+        Happy Path: A verbatim repeat (up to case and whitespace) is
+        answered from the exact-match index without embedding
+        """
+        cache = self._make_cache({"what is rag": _unit(1.0)})
+        
+        _, key = cache.lookup("what is rag", ["ctx"])
+        cache.store(key, "RAG answer")
+        cache._embedder.embed_text.reset_mock()
+        answer, _ = cache.lookup("  What is  RAG ", ["ctx"])
+        
+        assert answer == "RAG answer"
+        cache._embedder.embed_text.assert_not_called()
+    
+    def test_exact_hit_skips_embed_callback(self):
+        """
+        Happy Path: A caller-supplied embed function runs only on an
+        exact-index miss
+        """
+        cache = self._make_cache({})
+        embed = MagicMock(return_value=_unit(1.0))
+        
+        _, key = cache.lookup("what is rag", ["ctx"], embed=embed)
+        cache.store(key, "RAG answer")
+        answer, _ = cache.lookup("what is rag", ["ctx"], embed=embed)
+        
+        assert answer == "RAG answer"
+        embed.assert_called_once_with("what is rag")
+        cache._embedder.embed_text.assert_not_called()
+    
+    def test_exact_repeat_hits_after_centroid_drift(self):
+        """
+        Edge Case: Merged paraphrases move the centroid below the
+        threshold for the original question
+        Expected: The original question still hits exactly
+        """
+        # Each paraphrase is within the threshold of the running centroid
+        angles = {"a": 0, "b": 29, "c": 43, "d": 53}
+        vectors = {q: _unit(math.cos(math.radians(d)), math.sin(math.radians(d))) for q, d in angles.items()}
+        cache = self._make_cache(vectors)
+        
+        for q in angles:
+            _, key = cache.lookup(q, ["ctx"])
+            cache.store(key, "answer")
+        
+        assert float(cache._vectors[0] @ _unit(1.0)) < SemanticResponseCache.THRESHOLD
+        assert cache.lookup("a", ["ctx"])[0] == "answer"
+    
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """
+        Happy Path: A saved cache answers the same lookups after loading
+        """
+        vectors = {"a": _unit(1.0), "b": _unit(0.0, 1.0)}
+        cache = self._make_cache(vectors)
+        for q in ("a", "b"):
+            _, key = cache.lookup(q, ["ctx"])
+            cache.store(key, q.upper())
+        path = str(tmp_path / "responses.npz")
+        cache.save(path)
+        
+        restored = self._make_cache(vectors)
+        restored.load(path)
+        
+        assert len(restored) == 2
+        assert restored.lookup("a", ["ctx"])[0] == "A"
+        assert restored.lookup("b", ["ctx"])[0] == "B"
+    
+    def test_saved_answers_are_not_padded(self, tmp_path):
+        """
+        Boundary: One long answer does not pad the others on disk, and
+        non-ASCII answers round-trip
+        """
+        vectors = {"a": _unit(1.0), "b": _unit(0.0, 1.0)}
+        answers = {"a": "x" * 10_000, "b": "naïve café ✓"}
+        cache = self._make_cache(vectors)
+        for q in ("a", "b"):
+            _, key = cache.lookup(q, ["ctx"])
+            cache.store(key, answers[q])
+        path = str(tmp_path / "responses.npz")
+        cache.save(path)
+        
+        with np.load(path) as data:
+            assert "answers" not in data.files
+            assert data["answer_bytes"].nbytes == sum(len(a.encode()) for a in answers.values())
+        
+        restored = self._make_cache(vectors)
+        restored.load(path)
+        
+        assert restored.lookup("a", ["ctx"])[0] == answers["a"]
+        assert restored.lookup("b", ["ctx"])[0] == answers["b"]
+    
+    def test_load_keeps_most_recent_when_over_capacity(self, tmp_path):
+        """
+        Boundary: Loading more entries than max_entries keeps the newest
+        """
+        vectors = {"a": _unit(1.0), "b": _unit(0.0, 1.0)}
+        cache = self._make_cache(vectors)
+        for q in ("a", "b"):
+            _, key = cache.lookup(q, ["ctx"])
+            cache.store(key, q.upper())
+        path = str(tmp_path / "responses.npz")
+        cache.save(path)
+        
+        restored = self._make_cache(vectors, max_entries=1)
+        restored.load(path)
+        
+        assert len(restored) == 1
+        assert restored.lookup("b", ["ctx"])[0] == "B"
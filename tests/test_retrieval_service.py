@@ -0,0 +1,132 @@
+"""
+Retrieval Service Tests
+
+Tests for:
+- Query embedding cache (exact match after normalization)
+- LRU eviction
+- Cached vectors are read-only
+- Wildcard queries bypass the embedder
+- Blank queries are rejected before embedding
+"""
+import pytest
+
+from app.application.retrieval_service import RetrievalService
+from app.core.exceptions import EmptyQueryError
+
+
+class TestRetrievalService:
+    """Test suite for the retrieval facade."""
+    
+    def test_repeated_query_embeds_once(self, mock_embedder, mock_vector_store):
+        """
+        Happy Path: Equivalent queries reuse the cached embedding
+        """
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        service.retrieve("What is the leave policy?")
+        service.retrieve("  what is the   LEAVE policy?  ")
+        
+        mock_embedder.embed_text.assert_called_once()
+        assert mock_vector_store.search.call_count == 2
+    
+    def test_cached_embedding_is_read_only(self, mock_embedder, mock_vector_store):
+        """
+        Edge Case: A caller writing into a cached query vector
+        Expected: ValueError instead of a silently corrupted cache entry
+        """
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        vector = service.embed_query("What is the leave policy?")
+        
+        with pytest.raises(ValueError):
+            vector[0] = 1.0
+        assert service.embed_query("what is the leave policy?") is vector
+    
+    def test_cache_evicts_least_recently_used(self, mock_embedder, mock_vector_store):
+        """
+        Boundary: Oldest entry is evicted once the cache is full
+        """
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        service.QUERY_CACHE_SIZE = 2
+        
+        service.retrieve("first")
+        service.retrieve("second")
+        service.retrieve("third")
+        service.retrieve("first")
+        
+        assert mock_embedder.embed_text.call_count == 4
+    
+    def test_wildcard_skips_embedding(self, mock_embedder, mock_vector_store):
+        """
+        Edge Case: Wildcard query never calls the embedder
+        """
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        result = service.retrieve("*", tag="HR")
+        
+        mock_embedder.embed_text.assert_not_called()
+        assert result["result_count"] == 1
+    
+    def test_blank_query_rejected_before_embedding(self, mock_embedder, mock_vector_store):
+        """
+        Edge Case: Empty or whitespace-only query
+        Expected: EmptyQueryError, with no embedding or search
+        """
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        for query in ("", "   ", "\n\t"):
+            with pytest.raises(EmptyQueryError):
+                service.retrieve(query)
+        
+        mock_embedder.embed_text.assert_not_called()
+        mock_vector_store.search.assert_not_called()
+    
+    def test_get_context_joins_contents(self, mock_embedder, mock_vector_store):
+        """
+        Happy Path: Context is the result contents separated by blank lines
+        """
+        mock_vector_store.search.return_value = [
+            {"content": "First", "tag": None, "page": 1, "chunk_id": 0},
+            {"content": "Second", "tag": None, "page": 1, "chunk_id": 1},
+        ]
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        assert service.get_context("question") == "First\n\nSecond"
+    
+    def test_get_context_without_results(self, mock_embedder, mock_vector_store):
+        """
+        Edge Case: No matching documents
+        Expected: Placeholder context
+        """
+        mock_vector_store.search.return_value = []
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        assert service.get_context("question") == "No relevant context found."
+    
+    def test_get_context_chunks_keeps_order(self, mock_embedder, mock_vector_store):
+        """
+        Happy Path: Chunks are returned unjoined, in result order
+        """
+        mock_vector_store.search.return_value = [
+            {"content": "First", "tag": None, "page": 1, "chunk_id": 0},
+            {"content": "Second", "tag": None, "page": 1, "chunk_id": 1},
+        ]
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        assert service.get_context_chunks("question") == ["First", "Second"]
+    
+    def test_canonical_chunks_follow_document_order(self, mock_embedder, mock_vector_store):
+        """
+        Happy Path: canonical=True orders chunks by page and numeric chunk id,
+        regardless of relevance order
+        """
+        mock_vector_store.search.return_value = [
+            {"content": "Page 2", "tag": None, "page": 2, "chunk_id": "2"},
+            {"content": "Chunk 10", "tag": None, "page": 1, "chunk_id": "10"},
+            {"content": "Chunk 9", "tag": None, "page": 1, "chunk_id": "9"},
+        ]
+        service = RetrievalService(embedder=mock_embedder, vector_store=mock_vector_store)
+        
+        assert service.get_context_chunks("question", canonical=True) == [
+            "Chunk 9", "Chunk 10", "Page 2"
+        ]
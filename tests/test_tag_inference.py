@@ -0,0 +1,23 @@
+"""
+Tag Inference Tests
+
+Tests for:
+- Keyword-based tag inference
+"""
+from app.services.tag_inference import infer_tag_from_text
+
+
+class TestTagInference:
+    """Test suite for tag inference."""
+    
+    def test_infers_known_tags(self):
+        """Happy Path: Keywords map to tags."""
+        assert infer_tag_from_text("What is the HR policy?") == "HR"
+        assert infer_tag_from_text("Show the accounts summary") == "FINANCE"
+        assert infer_tag_from_text("Any legal issues?") == "LEGAL"
+        assert infer_tag_from_text("Hello there") is None
+    
+    def test_keyword_after_long_prefix_is_found(self):
+        """Edge Case: Keyword far into a long message is still matched."""
+        assert infer_tag_from_text("x " * 500 + "legal") == "LEGAL"
+
@@ -0,0 +1,357 @@
+"""
+Vector Store Tests
+
+Tests for:
+- Bulk insert of records in a single statement (COPY for large batches)
+- Connections are returned to the pool
+- Empty record list
+- Rollback on query failure
+- Multi-batch inserts committed in one transaction
+- Per-tag partitions created on ingest and dropped on delete
+"""
+import weakref
+import pytest
+import numpy as np
+import psycopg2
+from pgvector import Vector
+from unittest.mock import patch
+
+from app.infrastructure.persistence.postgres_vector_store import PostgresVectorStore
+from app.core.exceptions import DatabaseQueryError
+
+
+MODULE = "app.infrastructure.persistence.postgres_vector_store"
+
+
+def _record(i):
+    return {
+        "text": f"chunk {i}",
+        "embedding": [0.1] * 384,
+        "metadata": {"tag": "HR", "page": 1, "chunk_id": i},
+    }
+
+
+class TestPostgresVectorStoreAdd:
+    """Test suite for PostgresVectorStore.add."""
+    
+    def test_add_uses_single_execute_values_call(self, mock_db_connection, monkeypatch):
+        """
+        Happy Path: All records are sent through one execute_values call
+        """
+        monkeypatch.setattr(PostgresVectorStore, "_partitioned", False)
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection") as mock_release, \
+             patch(f"{MODULE}.register_vector"), \
+             patch(f"{MODULE}.execute_values") as mock_execute_values:
+            PostgresVectorStore().add([_record(i) for i in range(3)])
+        
+        mock_execute_values.assert_called_once()
+        rows = mock_execute_values.call_args[0][2]
+        assert len(rows) == 3
+        text, embedding, tag, page, chunk_id = rows[2]
+        assert (text, tag, page, chunk_id) == ("chunk 2", "HR", 1, 2)
+        assert embedding == "[" + ",".join(["0.100000001"] * 384) + "]"
+        assert "%s::vector" in mock_execute_values.call_args.kwargs["template"]
+        mock_db_connection.commit.assert_called_once()
+        mock_release.assert_called_once_with(mock_db_connection)
+    
+    def test_large_add_streams_with_copy(self, mock_db_connection, monkeypatch):
+        """
+        Boundary: Batches over COPY_THRESHOLD are streamed with COPY,
+        with text fields escaped for the COPY text format
+        """
+        monkeypatch.setattr(PostgresVectorStore, "COPY_THRESHOLD", 2)
+        records = [_record(i) for i in range(3)]
+        records[0]["text"] = "tab\there\nnewline"
+        records[1]["metadata"]["page"] = None
+        cursor = mock_db_connection.cursor.return_value
+        copied = []
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(buffer.read())
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.execute_values") as mock_execute_values:
+            PostgresVectorStore().add(records)
+        
+        mock_execute_values.assert_not_called()
+        lines = copied[0].splitlines()
+        assert len(lines) == 3
+        assert lines[0].split("\t")[0] == "tab\\there\\nnewline"
+        assert lines[1].split("\t")[3] == "\\N"
+        mock_db_connection.commit.assert_called_once()
+    
+    def test_add_empty_records_skips_database(self, mock_db_connection):
+        """
+        Edge Case: Empty record list
+        Expected: No connection opened
+        """
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection) as mock_get:
+            PostgresVectorStore().add([])
+        
+        mock_get.assert_not_called()
+    
+    def test_add_failure_rolls_back(self, mock_db_connection):
+        """
+        Edge Case: Insert fails
+        Expected: Rollback and DatabaseQueryError
+        """
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.register_vector"), \
+             patch(f"{MODULE}.execute_values", side_effect=psycopg2.Error("boom")):
+            with pytest.raises(DatabaseQueryError):
+                PostgresVectorStore().add([_record(0)])
+        
+        mock_db_connection.rollback.assert_called_once()
+    
+    def test_add_batches_commits_once_after_last_batch(self, mock_db_connection):
+        """
+        Happy Path: Every batch is inserted in one transaction, committed once
+        """
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.execute_values") as mock_execute_values:
+            stored = PostgresVectorStore().add_batches(
+                iter([[_record(0), _record(1)], [], [_record(2)]])
+            )
+        
+        assert stored == 3
+        assert mock_execute_values.call_count == 2
+        mock_db_connection.commit.assert_called_once()
+    
+    def test_add_batches_failure_rolls_back_earlier_batches(self, mock_db_connection):
+        """
+        Edge Case: A later batch fails after earlier ones were inserted
+        Expected: Nothing committed, one rollback, DatabaseQueryError
+        """
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.execute_values", side_effect=[None, psycopg2.Error("boom")]):
+            with pytest.raises(DatabaseQueryError):
+                PostgresVectorStore().add_batches(iter([[_record(0)], [_record(1)]]))
+        
+        mock_db_connection.commit.assert_not_called()
+        mock_db_connection.rollback.assert_called_once()
+
+
+class TestVectorLiterals:
+    """Test suite for the pgvector literal serializer."""
+    
+    def test_literals_round_trip_float32(self):
+        """
+        Boundary: Serialized values parse back to the identical float32s
+        """
+        from app.infrastructure.persistence.postgres_vector_store import _vector_literals
+        
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((3, 16)).astype(np.float32)
+        
+        literals = _vector_literals(matrix)
+        parsed = np.array(
+            [[float(v) for v in lit[1:-1].split(",")] for lit in literals],
+            dtype=np.float32
+        )
+        
+        assert np.array_equal(parsed, matrix)
+
+
+class TestPostgresVectorStoreSearch:
+    """Test suite for PostgresVectorStore.search."""
+    
+    def test_wildcard_search_is_limited(self, mock_db_connection):
+        """
+        Edge Case: Wildcard search without tag
+        Expected: Prepared listing is capped at top_k
+        """
+        PostgresVectorStore._prepared_connections = weakref.WeakSet()
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"):
+            PostgresVectorStore().search(query_embedding=None, top_k=7)
+        
+        cursor = mock_db_connection.cursor.return_value
+        sql, params = cursor.execute.call_args[0]
+        assert sql.startswith("EXECUTE list_all")
+        assert params == (7,)
+    
+    def test_wildcard_listing_orders_chunk_id_numerically(self):
+        """
+        Boundary: chunk_id is stored as VARCHAR
+        Expected: Listings sort it as an integer, so chunk 10 follows chunk 9
+        """
+        for name in ("list_by_tag", "list_all"):
+            statement = PostgresVectorStore.PREPARED_STATEMENTS[name]
+            assert "ORDER BY page_number, chunk_id::int" in statement
+    
+    def test_semantic_search_prepares_once_per_connection(self, mock_db_connection):
+        """
+        Test that PREPARE runs on first use of a connection only
+        """
+        PostgresVectorStore._prepared_connections = weakref.WeakSet()
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.register_vector"):
+            store = PostgresVectorStore()
+            store.search(query_embedding=[0.1] * 384, tag="HR", top_k=3)
+            store.search(query_embedding=[0.1] * 384, top_k=3)
+        
+        cursor = mock_db_connection.cursor.return_value
+        statements = [c[0][0] for c in cursor.execute.call_args_list]
+        assert sum("PREPARE" in s for s in statements) == len(PostgresVectorStore.PREPARED_STATEMENTS)
+        assert sum(s.startswith("SET hnsw.ef_search") for s in statements) == 1
+        assert any(s.startswith("EXECUTE search_by_tag") for s in statements)
+        assert any(s.startswith("EXECUTE search_all") for s in statements)
+    
+    def test_semantic_search_reranks_candidates(self, mock_db_connection):
+        """
+        Happy Path: Over-fetched ANN candidates are re-ranked by exact cosine
+        """
+        PostgresVectorStore._prepared_connections = weakref.WeakSet()
+        query = np.array([1.0, 0.0], dtype=np.float32)
+        cursor = mock_db_connection.cursor.return_value
+        cursor.fetchall.return_value = [
+            # Registered vector columns are decoded into pgvector Vectors
+            ("far", "HR", 1, 0, Vector([0.0, 1.0])),
+            ("best", "HR", 1, 1, Vector([1.0, 0.0])),
+            ("near", "HR", 2, 0, Vector([0.8, 0.6])),
+        ]
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.register_vector"):
+            results = PostgresVectorStore().search(query_embedding=query, tag="HR", top_k=2)
+        
+        sql, params = cursor.execute.call_args[0]
+        assert sql.startswith("EXECUTE search_by_tag")
+        assert params[2] == 2 * PostgresVectorStore.RERANK_FACTOR
+        assert [r["content"] for r in results] == ["best", "near"]
+        assert "embedding" not in results[0]
+    
+    def test_rerank_accepts_pgvector_values(self):
+        """
+        Happy Path: Embeddings decoded by the registered pgvector adapter
+        (Vector objects, not arrays) are re-ranked correctly
+        """
+        rows = [
+            ("far", "HR", 1, 0, Vector([0.0, 1.0])),
+            ("best", "HR", 1, 1, Vector([1.0, 0.0])),
+        ]
+        
+        ranked = PostgresVectorStore._rerank(rows, np.array([1.0, 0.0], dtype=np.float32), 1)
+        
+        assert [r[0] for r in ranked] == ["best"]
+
+
+class TestPostgresVectorStorePartitions:
+    """Test suite for per-tag partitions (add and delete_by_tag)."""
+    
+    def test_add_creates_missing_tag_partition(self, mock_db_connection, monkeypatch):
+        """
+        Happy Path: First ingest of a tag creates its partition in its own
+        committed transaction, before the insert transaction starts
+        """
+        monkeypatch.setattr(PostgresVectorStore, "_partitioned", True)
+        cursor = mock_db_connection.cursor.return_value
+        cursor.fetchone.return_value = (None,)
+        events = []
+        mock_db_connection.commit.side_effect = lambda: events.append("commit")
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.execute_values", side_effect=lambda *a, **kw: events.append("insert")):
+            PostgresVectorStore().add([_record(0), _record(1)])
+        
+        statements = [c[0] for c in cursor.execute.call_args_list]
+        creates = [s for s in statements if "PARTITION OF" in repr(s[0])]
+        assert len(creates) == 1
+        assert creates[0][1] == ("HR",)
+        assert any("lock_timeout" in repr(s[0]) for s in statements)
+        assert events == ["commit", "insert", "commit"]
+    
+    def test_partition_create_failure_falls_back_to_default(self, mock_db_connection, monkeypatch):
+        """
+        Edge Case: The CREATE times out waiting for its lock
+        Expected: Rolled back and logged; rows are still inserted
+        """
+        monkeypatch.setattr(PostgresVectorStore, "_partitioned", True)
+        cursor = mock_db_connection.cursor.return_value
+        cursor.fetchone.return_value = (None,)
+        
+        def execute(statement, params=None):
+            if "PARTITION OF" in repr(statement):
+                raise psycopg2.Error("lock timeout")
+        
+        cursor.execute.side_effect = execute
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"), \
+             patch(f"{MODULE}.execute_values") as mock_execute_values:
+            PostgresVectorStore().add([_record(0)])
+        
+        mock_db_connection.rollback.assert_called_once()
+        mock_execute_values.assert_called_once()
+        mock_db_connection.commit.assert_called_once()
+    
+    def test_delete_drops_tag_partition(self, mock_db_connection, monkeypatch):
+        """
+        Happy Path: Deleting a partitioned tag drops its partition and
+        reports the rows it held
+        """
+        monkeypatch.setattr(PostgresVectorStore, "_partitioned", True)
+        cursor = mock_db_connection.cursor.return_value
+        cursor.fetchone.side_effect = [("document_chunks_x",), (7,)]
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"):
+            deleted = PostgresVectorStore().delete_by_tag("HR")
+        
+        statements = [repr(c[0][0]) for c in cursor.execute.call_args_list]
+        assert deleted == 7
+        assert any("DROP TABLE" in s for s in statements)
+        # The DROP commits on its own, then the default-partition DELETE does
+        assert mock_db_connection.commit.call_count == 2
+    
+    def test_delete_deletes_rows_when_drop_times_out(self, mock_db_connection, monkeypatch):
+        """
+        Edge Case: The DROP cannot get its lock within lock_timeout
+        Expected: Rolled back, then the tag's rows are deleted instead
+        """
+        monkeypatch.setattr(PostgresVectorStore, "_partitioned", True)
+        cursor = mock_db_connection.cursor.return_value
+        cursor.fetchone.side_effect = [("document_chunks_x",), (7,)]
+        cursor.rowcount = 7
+        
+        def execute(statement, params=None):
+            if "DROP TABLE" in repr(statement):
+                raise psycopg2.Error("lock timeout")
+        
+        cursor.execute.side_effect = execute
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"):
+            deleted = PostgresVectorStore().delete_by_tag("HR")
+        
+        statements = [repr(c[0][0]) for c in cursor.execute.call_args_list]
+        assert deleted == 7
+        assert "DELETE FROM document_chunks" in statements[-1]
+        mock_db_connection.rollback.assert_called_once()
+        mock_db_connection.commit.assert_called_once()
+    
+    def test_delete_falls_back_to_row_delete(self, mock_db_connection, monkeypatch):
+        """
+        Edge Case: Unpartitioned table
+        Expected: Plain DELETE, no DROP TABLE
+        """
+        monkeypatch.setattr(PostgresVectorStore, "_partitioned", False)
+        cursor = mock_db_connection.cursor.return_value
+        cursor.rowcount = 5
+        
+        with patch(f"{MODULE}.acquire_connection", return_value=mock_db_connection), \
+             patch(f"{MODULE}.release_connection"):
+            deleted = PostgresVectorStore().delete_by_tag("HR")
+        
+        statements = [repr(c[0][0]) for c in cursor.execute.call_args_list]
+        assert deleted == 5
+        assert not any("DROP TABLE" in s for s in statements)